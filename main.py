@@ -1,4 +1,4 @@
-from monopoly import Monopoly
+from monopoly import Monopoly, Journal, HeuristicPolicy, saveGame, openGame
 from monopoly import LANG_LIST, DEFAULT_LANG, MAP_LIST, DEFAULT_MAP
 
 from argparse import ArgumentParser
@@ -10,7 +10,6 @@ DEFAULT_PLAYER_COUNT = 4
 TODO:
     - maisons / hotels (à finir)
     - échange
-    - enregistrer partie
     - finir traductions
     - finir cartes caisse de communauté
     - créer une classe Menu
@@ -19,6 +18,9 @@ TODO:
 
 def askPlayerNames(game: Monopoly):
     for pl in game.players:
+        if pl.policy is not None:
+            continue
+
         name = input(game.lang("nameOf", player = pl) + ": ").strip()
 
         pl.name = name or None
@@ -32,18 +34,54 @@ def main():
     parser.add_argument("--player-count", "-p", type=int, dest="pc", metavar="Player Count", default=DEFAULT_PLAYER_COUNT, help="the number of player")
     parser.add_argument("--no-name", "-n", action="store_true", dest="nn", help="if specified, don't ask player name (use default names, ex: Player 1)")
     parser.add_argument("--debug", "-d", action="store_true", help="debug mode")
+    parser.add_argument("--load", metavar="FILE", help="resume the game saved in FILE")
+    parser.add_argument("--save", metavar="FILE", help="save the game in FILE when quitting (CTRL + C)")
+    parser.add_argument("--journal", metavar="FILE", help="record the events of a new game in FILE")
+    parser.add_argument("--board", action="store_true", help="show the board above the text (ANSI terminal)")
+    parser.add_argument("--bots", type=int, nargs="+", default=[], metavar="PLAYER", help="the players (1 to N) played by the computer")
 
     args = parser.parse_args()
 
+    game = None
+
+    journal = Journal(open(args.journal, "wb")) if args.journal and not args.load else None
+
+    bot = HeuristicPolicy()
+
+    def policies(playerCount: int):
+        return [bot if i + 1 in args.bots else None for i in range(playerCount)]
+
     try:
-        game = Monopoly(playerCount=args.pc, lang=args.lang, map=args.map, debug=args.debug)
+        if args.load:
+            game = openGame(args.load, debug=args.debug)
 
-        if not args.nn:
-            askPlayerNames(game)
+            for p, policy in zip(game.players, policies(game.playerCount)):
+                p.policy = policy
+        else:
+            game = Monopoly(playerCount=args.pc, lang=args.lang, map=args.map, debug=args.debug, journal=journal,
+                            policy=policies(args.pc))
 
-        game.run()
+            if not args.nn:
+                askPlayerNames(game)
+
+        if args.board:
+            try:
+                game.renderer.showBoard()
+            except ValueError as e:  # Terminal too small, play with the text only
+                print(f"{e}, the board is hidden")
+
+        game.run(game.turn)  # Resumes the turn in progress of a loaded game
     except KeyboardInterrupt:
+        if game and args.save:
+            saveGame(game, args.save)
+
         print("\r\n\nBye !")
+    finally:
+        if game:
+            game.renderer.hideBoard()
+
+        if journal is not None:
+            journal.close()
 
 if __name__ == "__main__":
     main()
@@ -1,9 +1,25 @@
-from .dice      import Dice, DiceGroup, DicePair
+from .dice      import Dice, DiceGroup, DicePair, DiceTape
 from .player    import Player, DebugPlayer
-from .map       import Map, MAP_LIST, DEFAULT_MAP
+from .map       import Map, Board, MAP_LIST, DEFAULT_MAP
 from .renderer  import Renderer, DiceRenderer
+from .board     import BoardView
+from .headless  import HeadlessRenderer, GameResult, defaultDecision, reserveDecision, playDecision, STRATEGIES
 from .monopoly  import Monopoly
 from .lang      import loadLang, LANG_LIST, DEFAULT_LANG
 from .cardStack import CardStack
-from .space     import OwnableSpace, Space, Space_Chance, Space_CommunityChest, Space_Company, Space_FreeParking, Space_Go, Space_GoJail, Space_Jail, Space_Railroad, Space_Tax, Space_Terrain
-from .chance    import CHANCE_CARDS, COMMUNITY_CHEST_CARDS
+from .space     import SpaceDefinition, OwnableSpace, Space, Space_Chance, Space_CommunityChest, Space_Company, Space_FreeParking, Space_Go, Space_GoJail, Space_Jail, Space_Railroad, Space_Tax, Space_Terrain
+from .chance    import Card, CHANCE_CARDS, COMMUNITY_CHEST_CARDS, CHANCE_CARD_MOVES, COMMUNITY_CHEST_CARD_MOVES
+from .rng       import GameRandom, RandomStream
+from .rent      import RentEngine, RentTable
+from .state     import GameState
+from .save      import dumpGame, loadGame, saveGame, openGame, Checkpointer, applyCheckpoint
+from .journal   import Journal, Replayer, describe
+from .undo      import UndoLog, Delta
+from .simulate  import Report
+from .policy    import Policy, DecisionRequest, FunctionPolicy, HeuristicPolicy, PassivePolicy, RandomPolicy, strategyPolicy, playGames
+from .markov    import LandingModel, landingModel, landingProbabilities
+from .analytics import PropertyAnalytics, propertyAnalytics
+from .mcts      import MCTSPolicy
+from .server    import GameServer, serve
+from .sync      import SyncSource, SyncClient
+from .store     import GameStore
@@ -0,0 +1,86 @@
+import json
+
+from argparse import ArgumentParser
+
+from .monopoly import Monopoly
+from .map      import MAP_LIST, DEFAULT_MAP
+from .headless import STRATEGIES, DEFAULT_STRATEGY, MAX_ROUNDS
+from .simulate import simulate, DEFAULT_GAME_COUNT
+from .bundle   import buildBundle, cacheDirectory, BUNDLE_FILE
+from .lang     import LANG_LIST, DEFAULT_LANG
+from .server   import serve, DEFAULT_HOST, DEFAULT_PORT, DECISION_TIMEOUT
+from .store    import GameStore
+
+
+def simulateCommand(args):
+    report = simulate(args.games, playerCount=args.pc, map=args.map, strategies=args.strategies, seed=args.seed,
+                      maxRounds=args.max_rounds, jobs=args.jobs, chunkSize=args.chunk, rents=not args.no_rents)
+
+    if args.json:
+        print(json.dumps(report.toDict(), indent=4))
+    else:
+        game = Monopoly(playerCount=args.pc, map=args.map, headless=True)
+
+        print(report.format([s.name for s in game.map.spaces]))
+
+
+def bundleCommand(args):
+    bundle = buildBundle()
+
+    print(f"Asset bundle v{bundle.version} built ({len(bundle.maps)} maps, {len(bundle.langs)} languages) "
+          f"in {cacheDirectory() / BUNDLE_FILE}")
+
+
+def serveCommand(args):
+    serve(host=args.host, port=args.port, playerCount=args.pc, bots=args.bots, lang=args.lang, map=args.map,
+          seed=args.seed, maxRounds=args.max_rounds, timeout=args.timeout,
+          store=GameStore(args.store) if args.store else None)
+
+
+def main():
+    parser = ArgumentParser("python -m monopoly", description="Monopoly tools")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sim = commands.add_parser("simulate", help="play many headless games over all the cores and report statistics")
+
+    sim.add_argument("--games", "-g", type=int, default=DEFAULT_GAME_COUNT, help="the number of games")
+    sim.add_argument("--map", "-m", choices=MAP_LIST, default=DEFAULT_MAP, help="the map of the games")
+    sim.add_argument("--player-count", "-p", type=int, dest="pc", default=4, help="the number of player")
+    sim.add_argument("--strategies", "-s", nargs="+", choices=STRATEGIES, default=[DEFAULT_STRATEGY],
+                     help="the strategy of each player (repeated over the players)")
+    sim.add_argument("--seed", type=int, help="the seed of the simulation (random by default)")
+    sim.add_argument("--max-rounds", type=int, default=MAX_ROUNDS, help="stop the games after this many rounds")
+    sim.add_argument("--jobs", "-j", type=int, help="the number of processes (one per core by default)")
+    sim.add_argument("--chunk", type=int, help="the number of games per task sent to a process")
+    sim.add_argument("--no-rents", action="store_true", help="don't track the rent earned per property (faster)")
+    sim.add_argument("--json", action="store_true", help="print the report as JSON")
+
+    sim.set_defaults(func=simulateCommand)
+
+    srv = commands.add_parser("serve", help="host games for players connected over TCP (telnet / nc)")
+
+    srv.add_argument("--host", default=DEFAULT_HOST, help="the address to listen on (localhost by default)")
+    srv.add_argument("--port", type=int, default=DEFAULT_PORT, help="the port to listen on")
+    srv.add_argument("--player-count", "-p", type=int, dest="pc", default=4, help="the number of player per game")
+    srv.add_argument("--bots", "-b", type=int, default=0, help="the number of players of each game played by the computer")
+    srv.add_argument("--lang", "-l", choices=LANG_LIST, default=DEFAULT_LANG, help="the language of the games")
+    srv.add_argument("--map", "-m", choices=MAP_LIST, default=DEFAULT_MAP, help="the map of the games")
+    srv.add_argument("--seed", type=int, help="the seed of the games (random by default)")
+    srv.add_argument("--max-rounds", type=int, default=MAX_ROUNDS, help="stop the games after this many rounds")
+    srv.add_argument("--timeout", type=float, default=DECISION_TIMEOUT, help="seconds before a bot plays for a silent player")
+    srv.add_argument("--store", metavar="FILE", help="keep the games in this SQLite database (resumed on restart)")
+
+    srv.set_defaults(func=serveCommand)
+
+    bundle = commands.add_parser("bundle", help="rebuild the compiled asset bundle")
+
+    bundle.set_defaults(func=bundleCommand)
+
+    args = parser.parse_args()
+
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Property analytics: expected rent, payback time and marginal return of the
+buildings of every property, computed at once from the rent table of the board
+and the landing rates of the Markov model (see `monopoly.markov`).
+
+Every result is a `(SPACE_COUNT, STAGE_COUNT)` array: one row per position, one
+column per development stage of the property (see `TERRAIN_STAGES`), NaN where a stage
+doesn't apply. The analytics are cached per board, player count, dices and jail
+choice. The rent multipliers of the cards aren't counted.
+"""
+
+from functools import lru_cache
+
+from .markov import landingModel, DICE_FACES
+from .space  import SPACE_COUNT, RAILROAD_COUNT, COMPANY_COUNT, MAX_HOUSE_COUNT
+
+from typing import Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # The analytics are NumPy only
+    np = None
+
+
+# Development stages of a terrain: alone, whole group owned, then the buildings
+TERRAIN_STAGES = ("alone", "group", *(f"{n} house{'s' if n > 1 else ''}" for n in range(1, MAX_HOUSE_COUNT + 1)), "hotel")
+
+STAGE_COUNT = len(TERRAIN_STAGES)
+
+# The stage of a railroad / company is the number of them owned, minus one
+OWNED_STAGES = tuple(f"{n} owned" for n in range(1, STAGE_COUNT + 1))
+
+GROUP_STAGE = 1  # First stage where houses can be built on
+
+
+class PropertyAnalytics:
+    def __init__(self, board: "Board", playerCount: int, dices: Sequence[Tuple[int, int]] = DICE_FACES,
+                 payJail: bool = False):
+        if np is None:
+            raise ImportError("The property analytics require NumPy")
+
+        self.board = board
+        self.playerCount = playerCount
+
+        table = board.rentTable
+        model = landingModel(board, dices, payJail)
+
+        terrain, railroad, company = table.isTerrain, table.isRailroad, table.isCompany
+
+        self.ownable = terrain | railroad | company
+        self.positions = np.flatnonzero(self.ownable)
+
+        # Buildings of each stage of a terrain (a hotel replaces the 4 houses but costs one more house price)
+        buildings = np.array([0, 0, *range(1, MAX_HOUSE_COUNT + 1), MAX_HOUSE_COUNT + 1])
+
+        # Stages that apply to each position
+        self.valid = np.zeros((SPACE_COUNT, STAGE_COUNT), dtype=bool)
+        self.valid[terrain] = True
+        self.valid[railroad, :RAILROAD_COUNT] = True
+        self.valid[company, :COMPANY_COUNT] = True
+
+        # Rent paid by a player landing on the property
+        rents = np.zeros((SPACE_COUNT, STAGE_COUNT))
+        rents[terrain, 0] = table.rentMatrix[terrain, 0]
+        rents[terrain, GROUP_STAGE] = table.rentMatrix[terrain, 0]  # The group only allows to build
+        rents[terrain, GROUP_STAGE + 1:] = table.rentMatrix[terrain, 1:]
+        rents[railroad, :RAILROAD_COUNT] = table.railroadRents[1:]
+        rents[company, :COMPANY_COUNT] = model.meanScore * table.companyMultipliers[1:]
+
+        # Money invested in the property at each stage
+        costs = np.broadcast_to(table.prices[:, None], (SPACE_COUNT, STAGE_COUNT)).astype(float)
+        costs = np.where(terrain[:, None], costs + buildings[None, :] * table.housePrices[:, None], costs)
+
+        self.landingsPerTurn = np.array(model.turnLandingRates)
+
+        self.rents = np.where(self.valid, rents, np.nan)
+        self.costs = np.where(self.valid, costs, np.nan)
+
+        # Expected rent earned during one turn of one opponent, and during a whole round (all the opponents)
+        self.rentPerTurn = self.rents * self.landingsPerTurn[:, None]
+        self.rentPerRound = self.rentPerTurn * (playerCount - 1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Rounds before the rents pay the investment back
+            self.payback = np.where(self.rentPerRound > 0, self.costs / self.rentPerRound, np.inf)
+            self.payback = np.where(self.valid, self.payback, np.nan)
+
+            # Return of each building: extra rent per round over its price, and the rounds to pay it back
+            gain = np.full((SPACE_COUNT, STAGE_COUNT), np.nan)
+            gain[:, GROUP_STAGE + 1:] = np.diff(self.rentPerRound[:, GROUP_STAGE:], axis=1)
+
+            price = np.full((SPACE_COUNT, STAGE_COUNT), np.nan)
+            price[:, GROUP_STAGE + 1:] = np.diff(self.costs[:, GROUP_STAGE:], axis=1)
+
+            self.marginalRoi = np.where(terrain[:, None], gain / price, np.nan)
+            self.marginalPayback = np.where(terrain[:, None], price / gain, np.nan)
+
+        for a in (self.valid, self.rents, self.costs, self.landingsPerTurn, self.rentPerTurn, self.rentPerRound,
+                  self.payback, self.marginalRoi, self.marginalPayback):
+            a.flags.writeable = False  # Shared through the cache
+
+    def bestBuildings(self):
+        """Terrain building stages from the best to the worst marginal ROI, as (pos, stage) pairs"""
+
+        roi = np.where(np.isnan(self.marginalRoi), -np.inf, self.marginalRoi)
+
+        order = np.argsort(-roi, axis=None)
+
+        return [divmod(int(i), STAGE_COUNT) for i in order if np.isfinite(roi.flat[i])]
+
+    def summary(self, pos: int):
+        valid = self.valid[pos]
+
+        stages = TERRAIN_STAGES if self.board.rentTable.types[pos] == "terrain" else OWNED_STAGES
+
+        return {
+            "landingsPerTurn": float(self.landingsPerTurn[pos]),
+            "stages": [stages[i] for i in np.flatnonzero(valid)],
+            "rent": self.rents[pos, valid].tolist(),
+            "rentPerTurn": self.rentPerTurn[pos, valid].tolist(),
+            "rentPerRound": self.rentPerRound[pos, valid].tolist(),
+            "cost": self.costs[pos, valid].tolist(),
+            "payback": self.payback[pos, valid].tolist(),
+            "marginalRoi": self.marginalRoi[pos, valid].tolist(),
+        }
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} {self.playerCount} players>"
+
+
+@lru_cache(maxsize=None)
+def _propertyAnalytics(board: "Board", playerCount: int, dices: Tuple[Tuple[int, int], ...], payJail: bool):
+    return PropertyAnalytics(board, playerCount, dices, payJail)
+
+
+def propertyAnalytics(playerCount: int = 4, board: Optional["Board"] = None,
+                      dices: Sequence[Tuple[int, int]] = DICE_FACES, payJail: bool = False):
+    """Cached analytics of a board (the shared default board if none is given)"""
+
+    if board is None:
+        from .map import Board
+
+        board = Board.get()
+
+    return _propertyAnalytics(board, playerCount, tuple(tuple(d) for d in dices), payJail)
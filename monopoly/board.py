@@ -0,0 +1,197 @@
+"""
+Full board view for ANSI terminals.
+
+The 40 spaces are drawn around an 11 x 11 grid (Go in the bottom right corner),
+with the players in the middle. The board stays at the top of the screen and the
+text of the game scrolls below it (scroll region).
+
+Each cell remembers the state it was drawn with (owner, buildings, mortgage,
+tokens): `BoardView.draw` only redraws the cells whose state changed since the
+last draw, with cursor addressing, so a frame of a fast game costs a few escape
+sequences instead of the whole board.
+"""
+
+from shutil import get_terminal_size
+
+from .renderer import ESC, CSI, RESET, BOLD, DIM
+from .space    import OwnableSpace, SPACE_COUNT, HOTEL_LEVEL
+from .state    import NONE
+
+from typing import Optional, List, Dict, Tuple, Any
+
+
+GRID_SIZE = 11
+CELL_WIDTH = 7  # Including the column between the cells
+CELL_HEIGHT = 3  # Name, owner and buildings, tokens
+
+BOARD_WIDTH = GRID_SIZE * CELL_WIDTH
+BOARD_HEIGHT = GRID_SIZE * CELL_HEIGHT
+
+MIN_TEXT_ROWS = 4  # Rows left to the text below the board
+
+SAVE_CURSOR = ESC + "7"
+RESTORE_CURSOR = ESC + "8"
+CLEAR_SCREEN = CSI + "2J"
+
+
+def moveTo(row: int, col: int):
+    return f"{CSI}{row + 1};{col + 1}H"
+
+
+def fit(text: str, width: int):
+    return text[:width].ljust(width)
+
+
+def cellPosition(pos: int):
+    """(row, column) of a space in the grid, clockwise from Go in the bottom right corner"""
+
+    last = GRID_SIZE - 1
+
+    side, i = divmod(pos, last)
+
+    if side == 0:
+        return last, last - i
+    if side == 1:
+        return last - i, 0
+    if side == 2:
+        return 0, i
+
+    return i, last
+
+
+class BoardView:
+    def __init__(self, renderer: "Renderer", rows: Optional[int] = None, columns: Optional[int] = None):
+        self.renderer = renderer
+        self.game = renderer.game
+
+        size = get_terminal_size() if rows is None or columns is None else None
+
+        self.rows = rows or size.lines
+        self.columns = columns or size.columns
+
+        if self.rows < BOARD_HEIGHT + MIN_TEXT_ROWS:
+            raise ValueError(f"The board view requires a terminal of {BOARD_HEIGHT + MIN_TEXT_ROWS} rows ({self.rows})")
+
+        if self.columns < BOARD_WIDTH:
+            raise ValueError(f"The board view requires a terminal of {BOARD_WIDTH} columns ({self.columns})")
+
+        # State each cell was drawn with (None: to draw), and the lines of the middle
+        self.cells: List[Optional[Tuple[Any, ...]]] = [None] * SPACE_COUNT
+        self.lines: Dict[int, str] = {}
+
+    def open(self):
+        """Clear the screen and keep the rows below the board for the text"""
+
+        self.reset()
+
+        return CLEAR_SCREEN + f"{CSI}{BOARD_HEIGHT + 2};{self.rows}r" + moveTo(BOARD_HEIGHT + 1, 0)
+
+    def close(self):
+        return f"{CSI}r" + moveTo(self.rows - 1, 0)
+
+    def reset(self):
+        """Redraw the whole board on the next draw"""
+
+        self.cells = [None] * SPACE_COUNT
+        self.lines.clear()
+
+    def draw(self):
+        """Escape sequences redrawing what changed since the last draw (empty if nothing did)"""
+
+        tokens: Dict[int, List["Player"]] = {}
+
+        for p in self.game.players:
+            if not p.dead:
+                tokens.setdefault(p.pos, []).append(p)
+
+        out: List[str] = []
+
+        for space in self.game.map.spaces:
+            here = tokens.get(space.pos, ())
+
+            key = self.cellKey(space, here)
+
+            if key != self.cells[space.pos]:
+                self.cells[space.pos] = key
+
+                self.drawCell(space, here, out)
+
+        self.drawPlayers(out)
+
+        if not out:
+            return ""
+
+        return SAVE_CURSOR + "".join(out) + RESTORE_CURSOR
+
+    def cellKey(self, space: "Space", here: List["Player"]):
+        if isinstance(space, OwnableSpace):
+            owner = space.owner
+
+            state = (NONE if owner is None else owner.id, space.level if space.type == "terrain" else 0, space.mortgage)
+        else:
+            state = ()
+
+        return state, tuple((p.id, p.inJail) for p in here)
+
+    def drawCell(self, space: "Space", here: List["Player"], out: List[str]):
+        row, col = cellPosition(space.pos)
+
+        y, x = row * CELL_HEIGHT, col * CELL_WIDTH
+        width = CELL_WIDTH - 1
+
+        color = self.renderer.spaceColor(space)
+
+        name = fit(space.name, width)
+
+        out.append(moveTo(y, x) + (color + name + RESET if color else name))
+
+        if isinstance(space, OwnableSpace):
+            owner = space.owner
+
+            if owner is None:
+                status = DIM + fit(f"M{space.price}", width) + RESET
+            else:
+                if space.mortgage:
+                    buildings = "mtg"
+                elif space.type == "terrain" and space.level == HOTEL_LEVEL:
+                    buildings = "H"
+                elif space.type == "terrain":
+                    buildings = "^" * space.level
+                else:
+                    buildings = ""
+
+                mark = str(owner.id + 1)
+
+                status = BOLD + mark + RESET + " " + (DIM if space.mortgage else "") + fit(buildings, width - 2) + RESET
+        elif space.pos == self.game.map.jailPos:
+            jailed = "".join(str(p.id + 1) for p in here if p.inJail)
+
+            status = ("#" + BOLD + fit(jailed, width - 1) + RESET) if jailed else fit("", width)
+        else:
+            status = fit("", width)
+
+        out.append(moveTo(y + 1, x) + status)
+
+        visitors = "".join(str(p.id + 1) for p in here if not p.inJail)
+
+        out.append(moveTo(y + 2, x) + BOLD + fit(visitors, width) + RESET)
+
+    def drawPlayers(self, out: List[str]):
+        """Money and state of the players in the middle of the board"""
+
+        width = BOARD_WIDTH - 2 * CELL_WIDTH - 2
+
+        for i, p in enumerate(self.game.players):
+            state = "x" if p.dead else "#" if p.inJail else " "
+
+            line = fit(f"{p.id + 1} {state} {p!r:<20} {self.game.lang['money']}: M{p.money}", width)
+
+            if self.lines.get(i) == line:
+                continue
+
+            self.lines[i] = line
+
+            out.append(moveTo(CELL_HEIGHT + 1 + i, CELL_WIDTH + 1) + (DIM + line + RESET if p.dead else line))
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} {self.game.playerCount} players, {self.rows} rows>"
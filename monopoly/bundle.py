@@ -0,0 +1,181 @@
+"""
+Compiled asset bundle.
+
+The text files of `monopoly/assets` stay the source of truth: they are parsed
+once into an `AssetBundle` (board layout, terrain table, maps and merged
+language catalogs) which is cached in memory for the whole process, and on disk
+in the user cache directory (`MONOPOLY_CACHE_DIR`, else `$XDG_CACHE_HOME/monopoly`
+or `~/.cache/monopoly`, `%LOCALAPPDATA%\monopoly` on Windows), never in the
+package. The disk cache is rebuilt whenever the bundle version or one of the
+source files changes.
+
+Call `buildBundle()` to (re)build the cache ahead of time.
+"""
+
+import json
+import os
+import pickle
+
+from importlib.resources import files
+from pathlib import Path
+
+from typing import Dict, List, Tuple, Any, Optional
+
+
+BUNDLE_VERSION = 1
+
+DEFAULT_LANG = "english"
+
+ASSETS = files(__package__) / "assets"
+
+BUNDLE_FILE = f"bundle-v{BUNDLE_VERSION}.pickle"
+
+
+def cacheDirectory():
+    if path := os.environ.get("MONOPOLY_CACHE_DIR"):
+        return Path(path)
+
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+
+    return Path(base) / "monopoly"
+
+
+class AssetBundle:
+    def __init__(self, signature: Tuple[Any, ...]):
+        self.version = BUNDLE_VERSION
+        self.signature = signature
+
+        # [(type, (args...)), ...] one item per space
+        self.board: List[Tuple[str, Tuple[int, ...]]] = []
+
+        # {"gid:id": (color, price, rent0, ..., rent5, housePrice)}
+        self.terrains: Dict[str, Tuple[Any, ...]] = {}
+
+        self.maps: Dict[str, Dict[str, Any]] = {}
+
+        # Catalogs already merged over the default language
+        self.langs: Dict[str, Dict[str, Any]] = {}
+
+
+def _sourceFiles():
+    yield ASSETS / "map" / "map"
+    yield ASSETS / "map" / "terrains"
+
+    for directory in (ASSETS / "map", ASSETS / "lang"):
+        yield from sorted((f for f in directory.iterdir() if f.name.endswith(".json")), key=lambda f: f.name)
+
+
+def _signature():
+    try:
+        return tuple((f.name, os.stat(f).st_size, os.stat(f).st_mtime_ns) for f in _sourceFiles())
+    except TypeError:  # Resources not on the file system (e.g. zip import)
+        return None
+
+
+def _lines(text: str):
+    for l in text.split("\n"):
+        l = l.strip()
+
+        if l and not l.startswith("#"):
+            yield l
+
+
+def _parseBoardLine(line: str):
+    type, *args = line.split(" ")
+
+    return type, tuple(int(a) for arg in args for a in arg.split(":"))
+
+
+def _parseTerrainLine(line: str):
+    id, color, *values = line.split()
+
+    return id, (color, *map(int, values))
+
+
+def compileBundle(signature: Optional[Tuple[Any, ...]] = None):
+    bundle = AssetBundle(signature)
+
+    bundle.board = [_parseBoardLine(l) for l in _lines((ASSETS / "map" / "map").read_text())]
+
+    bundle.terrains = dict(_parseTerrainLine(l) for l in _lines((ASSETS / "map" / "terrains").read_text()))
+
+    for f in (ASSETS / "map").iterdir():
+        if f.name.endswith(".json"):
+            bundle.maps[f.name[:-5]] = json.loads(f.read_text(encoding="utf8"))
+
+    langs = {
+        f.name[:-5]: json.loads(f.read_text(encoding="utf8"))
+        for f in (ASSETS / "lang").iterdir() if f.name.endswith(".json")
+    }
+
+    for name, data in langs.items():
+        bundle.langs[name] = {**langs.get(DEFAULT_LANG, {}), **data}
+
+    return bundle
+
+
+def _readBundle(signature: Tuple[Any, ...]):
+    try:
+        with (cacheDirectory() / BUNDLE_FILE).open("rb") as f:
+            bundle = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+
+    if getattr(bundle, "version", None) != BUNDLE_VERSION or bundle.signature != signature:
+        return None
+
+    return bundle
+
+
+def writeBundle(bundle: AssetBundle):
+    directory = cacheDirectory()
+
+    directory.mkdir(parents=True, exist_ok=True)
+
+    path = directory / BUNDLE_FILE
+    tmp = directory / (BUNDLE_FILE + f".{os.getpid()}.tmp")
+
+    with tmp.open("wb") as f:
+        pickle.dump(bundle, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    os.replace(tmp, path)
+
+
+_bundle: Optional[AssetBundle] = None
+
+
+def loadBundle():
+    global _bundle
+
+    if _bundle is not None:
+        return _bundle
+
+    signature = _signature()
+
+    bundle = _readBundle(signature) if signature is not None else None
+
+    if bundle is None:
+        bundle = compileBundle(signature)
+
+        if signature is not None:
+            try:
+                writeBundle(bundle)
+            except OSError:  # No writable cache directory, keep the in-memory bundle
+                pass
+
+    _bundle = bundle
+
+    return bundle
+
+
+def buildBundle():
+    global _bundle
+
+    _bundle = compileBundle(_signature())
+
+    writeBundle(_bundle)
+
+    return _bundle
@@ -1,22 +1,76 @@
-from typing import Iterable, Any
+from typing import Iterable, Any, Optional
 
-from random import shuffle
+from array import array
+
+import random as _random
 
 
 class CardStack:
-    def __init__(self, cards: Iterable[Any]):
-        self.cards = [*cards]
+    """Card stack stored as `[cursor, card0, card1, ...]` at `offset` in a game state (or in its own array)"""
+
+    def __init__(self, cards: Iterable[int], rng: Any = None, state: Optional["GameState"] = None, offset: int = 0):
+        cards = [*cards]
+
+        if state is None:
+            self.data, self.offset = array("i", [0] * (len(cards) + 1)), 0
+
+            self._write = self.data.__setitem__
+        else:
+            self.data, self.offset = state.data, offset
+
+            self._write = state.write  # Logged like the other state writes
+
+        self.count = len(cards)
+
+        self.cards = cards
         self.cursor = 0
+
+        self.rng = rng or _random
+
+    @property
+    def cards(self):
+        return self.data[self.offset + 1:self.offset + 1 + self.count].tolist()
+
+    @cards.setter
+    def cards(self, cards: Iterable[int]):
+        for i, card in enumerate(cards, self.offset + 1):
+            self._write(i, card)
+
+    @property
+    def cursor(self):
+        return self.data[self.offset]
+
+    @cursor.setter
+    def cursor(self, cursor: int):
+        self._write(self.offset, cursor)
     
     def mix(self):
-        shuffle(self.cards)
+        cards = self.cards
+
+        self.rng.shuffle(cards)
+
+        self.cards = cards
         self.cursor = 0
 
+    def mixRemaining(self, rng: Any = None):
+        """Shuffle the cards not drawn yet (their order is hidden), the drawn ones stay in place"""
+
+        cards = self.cards
+        cursor = self.cursor
+
+        remaining = cards[cursor:]
+
+        (rng or self.rng).shuffle(remaining)
+
+        cards[cursor:] = remaining
+
+        self.cards = cards
+
     def draw(self):
-        card = self.cards[self.cursor]
+        cursor = self.data[self.offset]
 
-        self.cursor += 1
+        card = self.data[self.offset + 1 + cursor]
 
-        self.cursor %= len(self.cards) - 1
+        self._write(self.offset, (cursor + 1) % self.count)
 
         return card
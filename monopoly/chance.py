@@ -1,37 +1,62 @@
+from typing import Optional, Callable, NamedTuple, Tuple, Any
+
+
+class Card(NamedTuple):
+    """
+    A Chance / Community Chest card: its move, resolved with one lookup in the move tables of the board (see
+    `Board.compileCardMove` and `Player.applyCard`), and its other effect (applied before the move).
+
+    Moves:
+        ("go",)                 go to the Go space
+        ("jail",)               go to jail (without passing Go)
+        ("terrain", gid, id)    go to a terrain
+        ("railroad", id)        go to a railroad
+        ("nearest", type)       go to the next space of the given type
+        ("back", n)             move back of n spaces
+    """
+
+    move: Optional[Tuple[Any, ...]] = None
+    effect: Optional[Callable[["Player"], Any]] = None
+
+
 CHANCE_CARDS = [
-    lambda player: player.gotoTerrain(8, 2),
-    lambda player: player.goto(0),
-    lambda player: player.gotoTerrain(5, 3),
-    lambda player: player.gotoTerrain(3, 1),
-    lambda player: (player.multiplyRent(2), player.gotoNearest("railroad")),
-    lambda player: (player.multiplyRent(2), player.gotoNearest("railroad")),
-    lambda player: (player.multiplyRent(10), player.gotoNearest("company")),
-    lambda player: player.give(50),
-    lambda player: player.giveCard("get_out_jail"),
-    lambda player: player.moveBack(3),
-    lambda player: player.goJail(),
-    lambda player: player.pay(25 * player.countHouses() + 100 * player.countHotels()),
-    lambda player: player.pay(15),
-    lambda player: player.gotoRailroad(1),
-    lambda player: player.pay(player.game.playerCount * 50),
-    lambda player: player.give(150),
+    Card(("terrain", 8, 2)),
+    Card(("go",)),
+    Card(("terrain", 5, 3)),
+    Card(("terrain", 3, 1)),
+    Card(("nearest", "railroad"), lambda player: player.multiplyRent(2)),
+    Card(("nearest", "railroad"), lambda player: player.multiplyRent(2)),
+    Card(("nearest", "company"), lambda player: player.multiplyRent(10)),
+    Card(effect=lambda player: player.give(50)),
+    Card(effect=lambda player: player.giveCard("get_out_jail")),
+    Card(("back", 3)),
+    Card(("jail",)),
+    Card(effect=lambda player: player.pay(25 * player.countHouses() + 100 * player.countHotels())),
+    Card(effect=lambda player: player.pay(15)),
+    Card(("railroad", 1)),
+    Card(effect=lambda player: player.pay(player.game.playerCount * 50)),
+    Card(effect=lambda player: player.give(150)),
 ]
 
 COMMUNITY_CHEST_CARDS = [
-    lambda player: player.goto(0),
-    lambda player: player.give(200),
-    lambda player: player.pay(50),
-    lambda player: player.give(50),
-    lambda player: player.giveCard("get_out_jail"),
-    lambda player: player.goJail(),
-    lambda player: player.give(100),
-    lambda player: player.give(20),
-    lambda player: player.give(player.game.playerCount * 10),
-    lambda player: player.give(100),
-    lambda player: player.pay(100),
-    lambda player: player.pay(50),
-    lambda player: player.give(25),
-    lambda player: player.pay(40 * player.countHouses() + 115 * player.countHotels()),
-    lambda player: player.give(10),
-    lambda player: player.give(100),
+    Card(("go",)),
+    Card(effect=lambda player: player.give(200)),
+    Card(effect=lambda player: player.pay(50)),
+    Card(effect=lambda player: player.give(50)),
+    Card(effect=lambda player: player.giveCard("get_out_jail")),
+    Card(("jail",)),
+    Card(effect=lambda player: player.give(100)),
+    Card(effect=lambda player: player.give(20)),
+    Card(effect=lambda player: player.give(player.game.playerCount * 10)),
+    Card(effect=lambda player: player.give(100)),
+    Card(effect=lambda player: player.pay(100)),
+    Card(effect=lambda player: player.pay(50)),
+    Card(effect=lambda player: player.give(25)),
+    Card(effect=lambda player: player.pay(40 * player.countHouses() + 115 * player.countHotels())),
+    Card(effect=lambda player: player.give(10)),
+    Card(effect=lambda player: player.give(100)),
 ]
+
+# Movements of the cards, compiled into the move tables of the board
+CHANCE_CARD_MOVES = [card.move for card in CHANCE_CARDS]
+COMMUNITY_CHEST_CARD_MOVES = [card.move for card in COMMUNITY_CHEST_CARDS]
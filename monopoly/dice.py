@@ -1,20 +1,30 @@
-from random import randint, random
+import random as _random
+
 from time import sleep
 
-from typing import Optional
+from typing import Optional, Any
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the tape falls back to the random module
+    np = None
 
 
 MIN_POWER = 0.05
 MAX_ITER = 4
 
+TAPE_SIZE = 4096
+
 
 class Dice:
-    def __init__(self, a: int = 6, b: int = 1):
+    def __init__(self, a: int = 6, b: int = 1, rng: Any = None):
         self.power = 0
 
+        self.rng = rng or _random
+
         self.min, self.max = min(a, b), max(a, b)
 
-        self.value = randint(self.min, self.max)
+        self.value = self.rng.randint(self.min, self.max)
 
         self.rolling = False
 
@@ -27,13 +37,18 @@ class Dice:
 
         self.rolling = True
     
-        self.value += randint(0, self.max)
+        self.value += self.rng.randint(0, self.max)
 
         self.value %= self.max - self.min
 
         self.value += self.min
 
         return self
+
+    def quickRoll(self):
+        self.value = self.rng.randint(self.min, self.max)
+
+        return self
         
     def __iter__(self):
         return self
@@ -62,7 +77,7 @@ class Dice:
 
             tmp_value += self.power + self.power ** 2
 
-            self.power = self.power - (self.power ** 2 * (random() / 2))
+            self.power = self.power - (self.power ** 2 * (self.rng.random() / 2))
             
             i += 1
 
@@ -117,6 +132,12 @@ class DiceGroup:
                     continue
 
                 yield i, v, p
+
+    def quickRoll(self):
+        for d in self.dices:
+            d.quickRoll()
+
+        return self
     
     def __iter__(self):
         return iter(self.dices)
@@ -125,12 +146,12 @@ class DiceGroup:
         return self.dices.__getitem__(index)
 
 class DicePair(DiceGroup):
-    def __init__(self, dice1: Optional[Dice] = None, dice2: Optional[Dice] = None):
+    def __init__(self, dice1: Optional[Dice] = None, dice2: Optional[Dice] = None, rng: Any = None):
         if dice1 is None:
-            dice1 = Dice()
+            dice1 = Dice(rng=rng)
         
         if dice2 is None:
-            dice2 = Dice()
+            dice2 = Dice(rng=rng)
         
         super().__init__(dice1, dice2)
 
@@ -139,6 +160,87 @@ class DicePair(DiceGroup):
         return self.dices[0].value == self.dices[1].value
 
 
+class DiceTape:
+    def __init__(self, dices: DiceGroup, size: int = TAPE_SIZE, rng: Optional["RandomStream"] = None):
+        self.dices = dices
+        self.size = size
+        self.rng = rng
+
+        self.values = []
+        self.sums = []
+        self.doubles = []
+
+        self.cursor = size
+
+        # State of the random stream before the current block was drawn, enough to rebuild it
+        self.refillState = None
+
+    def refill(self):
+        if self.rng is not None:
+            self.refillState = self.rng.getState()
+
+        if self.rng is not None:
+            columns = [self.rng.integers(d.min, d.max, self.size) for d in self.dices]
+        elif np is not None:
+            columns = [np.random.randint(d.min, d.max + 1, self.size) for d in self.dices]
+        else:
+            columns = [[_random.randint(d.min, d.max) for _ in range(self.size)] for d in self.dices]
+
+        if np is not None:
+            values = np.stack(columns, axis=1)
+
+            self.sums = values.sum(axis=1).tolist()
+            self.doubles = (values.min(axis=1) == values.max(axis=1)).tolist()
+            self.values = values.tolist()
+        else:
+            self.values = [list(v) for v in zip(*columns)]
+            self.sums = [sum(v) for v in self.values]
+            self.doubles = [min(v) == max(v) for v in self.values]
+
+        self.cursor = 0
+
+    def roll(self):
+        if self.cursor >= self.size:
+            self.refill()
+
+        i = self.cursor
+
+        self.cursor += 1
+
+        for d, v in zip(self.dices.dices, self.values[i]):
+            d.value = v
+
+        return self.sums[i], self.doubles[i]
+
+    def getState(self):
+        """(random state before the current block, cursor in the block)"""
+
+        if self.refillState is None or self.cursor >= self.size:
+            # Nothing left to read in the block: the next roll refills from the current state
+            return self.rng.getState() if self.rng is not None else None, self.size
+
+        return self.refillState, self.cursor
+
+    def setState(self, state):
+        refillState, cursor = state
+
+        if cursor >= self.size:
+            if refillState is not None:
+                self.rng.setState(refillState)
+
+            self.refillState = None
+            self.cursor = self.size
+
+            return
+
+        if refillState != self.refillState:
+            self.rng.setState(refillState)
+
+            self.refill()
+
+        self.cursor = cursor
+
+
 if __name__ == "__main__":
     dices = DicePair()
 
@@ -0,0 +1,155 @@
+from .renderer  import Renderer
+from .player    import Player
+from .space     import OwnableSpace
+
+from typing import Optional, List, Tuple, Any, Callable
+
+
+Action = Tuple[str, List[Any]]
+Decision = Callable[[Player, List[Action]], Action]
+
+MAX_ROUNDS = 1000
+
+MONEY_RESERVE = 150
+
+
+def reserveDecision(reserve: int) -> Decision:
+    """Buy, build and lift mortgages while keeping `reserve` money, then play"""
+
+    def decision(player: Player, actions: List[Action]):
+        # sourcery skip: use-next
+        for action in actions:
+            name, args = action
+
+            if name == "buy" and player.money - player.space.price >= reserve:
+                return action
+
+            if name == "buyHousesOrHotels" and player.money - args[0].housePrice >= reserve:
+                return action
+
+            if name == "removeMortgage" and player.money - args[0].removeMortgagePrice >= 2 * reserve:
+                return action
+
+        return playDecision(player, actions)
+
+    return decision
+
+
+def playDecision(player: Player, actions: List[Action]):
+    """Never buy anything, only get out of jail, roll the dices and finish the turn"""
+
+    for name in ("jailCard", "rollDicesJail", "payJail", "rollDices", "finish"):
+        for action in actions:
+            if action[0] == name:
+                return action
+
+    return actions[0]
+
+
+defaultDecision = reserveDecision(MONEY_RESERVE)
+
+STRATEGIES = {
+    "default": defaultDecision,
+    "aggressive": reserveDecision(0),
+    "cautious": reserveDecision(4 * MONEY_RESERVE),
+    "passive": playDecision,
+}
+
+DEFAULT_STRATEGY = "default"
+
+
+class GameResult:
+    def __init__(self, game: "Monopoly"):
+        self.playerCount: int = game.playerCount
+        self.map: str = game.map.name
+
+        self.winner: Optional[int] = game.winner.id if game.winner else None
+        self.rounds: int = game.roundCount
+        self.turns: int = game.turnCount
+
+        self.money: List[int] = [p.money for p in game.players]
+        self.deathRounds: List[Optional[int]] = [p.deathRound for p in game.players]
+
+    @property
+    def finished(self):
+        return self.winner is not None
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} winner={self.winner} rounds={self.rounds}>"
+
+
+class HeadlessRenderer(Renderer):
+    animateDices = False
+
+    def __init__(self, game: "Monopoly", decision: Optional[Decision] = None):
+        super().__init__(game)
+
+        self.decision: Decision = decision or defaultDecision
+
+    # -------- IO --------
+
+    def writeOut(self, s: str):
+        pass
+
+    write = writeOut
+
+    def writeLnOut(self, s: str = ""):
+        pass
+
+    writeLn = writeLnOut
+
+    def flushOut(self):
+        pass
+
+    flush = flushOut
+
+    def flushFrame(self):
+        pass
+
+    def writeFlush(self, s: str):
+        pass
+
+    def writeLnFlush(self, s: str = ""):
+        pass
+
+    def getch(self):
+        raise RuntimeError("No input available in headless mode")
+
+    # -------- render --------
+
+    def renderPlayer(self, player: Player, score: Optional[int] = None, double: Optional[bool] = None):
+        pass
+
+    def playerMessage(self, _player: Player, _message: str, **kwargs):
+        pass
+
+    def playerPlayAgain(self, player: Player):
+        pass
+
+    def playerDrawChanceCard(self, player: Player, card: int):
+        pass
+
+    def playerDrawCommunityChestCard(self, player: Player, card: int):
+        pass
+
+    def startPlayerTurn(self, player: Player):
+        pass
+
+    def endPlayerTurn(self, player: Player):
+        pass
+
+    def playerWin(self, player: Player):
+        pass
+
+    # -------- decisions --------
+
+    def askPlayerBuy(self, player: Player, space: OwnableSpace):
+        return True  # The decision was taken when "buy" was chosen in the menu
+
+    def askPlayerQuestion(self, player: Player, question: str, yn: bool = True):
+        raise RuntimeError("Free questions can't be answered in headless mode")
+
+    def playerMenu(self, player: Player, canRollDices: bool, do_render: bool, has_played: bool):
+        action, args = self.decision(player, player.getLegalActions(canRollDices, has_played))
+
+        return action, list(args)
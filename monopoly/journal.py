@@ -0,0 +1,249 @@
+"""
+Append-only game journal.
+
+Every state transition of a game is appended as a fixed-size binary record
+`(type, player, a, b)`. The `Replayer` rebuilds the `GameState` of a game from
+its records alone, without Player / Space objects nor rendering.
+"""
+
+import struct
+
+from .state import GameState, NONE
+
+from typing import Optional, BinaryIO, Iterator, Iterable, Tuple
+
+
+RECORD = struct.Struct("<Bbhi")  # type, player, a, b
+
+FLUSH_SIZE = 1 << 16  # Pending bytes appended to the file at once, at most
+
+#                      player      a               b
+EVENT_START = 1      # count     chance cards    community chest new game (first record)
+EVENT_DECK = 2       # deck      index           card            initial card stack order
+EVENT_TURN = 3       # player    round           turn            start of a turn
+EVENT_ROUND = 4      # -         round           -               end of a round (new round count)
+EVENT_DICE = 5       # player    dice 1          dice 2
+EVENT_MOVE = 6       # player    position        -
+EVENT_CASH = 7       # player    -               amount          money given (or paid if negative)
+EVENT_CARD = 8       # player    deck            card            card drawn
+EVENT_OWNER = 9      # player    position        -               new owner (player -1 for the bank)
+EVENT_BUY = 10       # player    position        price
+EVENT_RENT = 11      # player    position        paid            rent received by the owner
+EVENT_MORTGAGE = 12  # player    position        mortgaged
+EVENT_BUILD = 13     # player    position        level
+EVENT_JAIL = 14      # player    in jail         jail turn count
+EVENT_JAIL_CARD = 15 # player    card count      -
+EVENT_BANKRUPT = 16  # player    round           -
+EVENT_WIN = 17       # player    -               -
+EVENT_MULTIPLIER = 18 # player   multiplier      -               rent multiplier of a card (until the end of the move)
+
+EVENT_NAMES = {v: k[6:].lower() for k, v in globals().items() if k.startswith("EVENT_") and isinstance(v, int)}
+
+DECK_CHANCE = 0
+DECK_COMMUNITY_CHEST = 1
+
+
+class Journal:
+    """
+    Records of a game, in memory. With a file, the records are appended to it at the end of every turn (see
+    `Monopoly.roundSteps`) or once `flushSize` bytes are pending, and only the pending ones stay in memory.
+    """
+
+    def __init__(self, file: Optional[BinaryIO] = None, flushSize: int = FLUSH_SIZE):
+        self.buffer = bytearray()
+        self.file = file
+        self.flushSize = flushSize
+
+        self._pack = RECORD.pack
+
+    def emit(self, type: int, player: int, a: int = 0, b: int = 0):
+        self.buffer += self._pack(type, player, a, b)
+
+        if self.file is not None and len(self.buffer) >= self.flushSize:
+            self.flush()
+
+    def start(self, game: "Monopoly"):
+        self.emit(EVENT_START, game.playerCount, game.chanceCardStack.count, game.communityChestCardStack.count)
+
+        for deck, stack in ((DECK_CHANCE, game.chanceCardStack), (DECK_COMMUNITY_CHEST, game.communityChestCardStack)):
+            for i, card in enumerate(stack.cards):
+                self.emit(EVENT_DECK, deck, i, card)
+
+        for p in game.players:
+            self.emit(EVENT_CASH, p.id, 0, p.money)
+
+    def flush(self):
+        """Append the pending records to the file (if any)"""
+
+        if self.file is not None and self.buffer:
+            self.file.write(self.buffer)
+            self.file.flush()
+
+            self.buffer.clear()
+
+    def close(self):
+        self.flush()
+
+        if self.file is not None:
+            self.file.close()
+
+    def tobytes(self):
+        return bytes(self.buffer)
+
+    def __len__(self):
+        return len(self.buffer) // RECORD.size
+
+    def __iter__(self) -> Iterator[Tuple[int, int, int, int]]:
+        return RECORD.iter_unpack(self.buffer)
+
+
+def readJournal(path: str):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def describe(raw: bytes):
+    """Human readable events (for audits / debugging)"""
+
+    for type, player, a, b in RECORD.iter_unpack(raw):
+        yield EVENT_NAMES.get(type, type), player, a, b
+
+
+class Replayer:
+    """Rebuild a GameState from journal records"""
+
+    def __init__(self, raw: bytes = b""):
+        if len(raw) % RECORD.size:
+            raise ValueError("Truncated journal")
+
+        # journal is imported by the spaces, so the board and its constants aren't available yet
+        from .map   import Board
+        from .space import TERRAIN_COUNT_BY_GROUPS, HOTEL_LEVEL
+
+        self.raw = raw
+        self.board = Board.get()
+
+        self.groupSizes = TERRAIN_COUNT_BY_GROUPS
+        self.hotelLevel = HOTEL_LEVEL
+
+    def replay(self, state: Optional[GameState] = None):
+        if len(self.raw) < RECORD.size:
+            raise ValueError("Journal doesn't start with a new game")
+
+        type, count, chanceCount, communityChestCount = RECORD.unpack_from(self.raw)
+
+        if type != EVENT_START:
+            raise ValueError("Journal doesn't start with a new game")
+
+        if state is None:
+            state = GameState(count, (chanceCount, communityChestCount))
+        elif state.playerCount != count:
+            raise ValueError(f"Journal of a {count} players game")
+
+        return self.apply(RECORD.iter_unpack(memoryview(self.raw)[RECORD.size:]), state)
+
+    def apply(self, records: Iterable[Tuple[int, int, int, int]], state: GameState):
+        """Apply records (not starting a new game) to a state"""
+
+        data = state.data
+        offsets = state.offsets
+        playerCount = state.playerCount
+
+        pos, money, dead, rentMultiplier = offsets["pos"], offsets["money"], offsets["dead"], offsets["rentMultiplier"]
+        inJail, jailTurnCount, jailCards = offsets["inJail"], offsets["jailTurnCount"], offsets["jailCards"]
+        deathRound, railroadCount, companyCount = offsets["deathRound"], offsets["railroadCount"], offsets["companyCount"]
+        houseCount, hotelCount = offsets["houseCount"], offsets["hotelCount"]
+        mortgageCount, monopolies = offsets["mortgageCount"], offsets["monopolies"]
+        owner, level, mortgage = offsets["owner"], offsets["level"], offsets["mortgage"]
+        roundCount, turnCount, winner = offsets["roundCount"], offsets["turnCount"], offsets["winner"]
+
+        decks = (state.chanceStart, state.communityChestStart)
+        deckSizes = (state.communityChestStart - state.chanceStart - 1, state.size - state.communityChestStart - 1)
+
+        definitions = self.board.definitions
+        groupSizes = self.groupSizes
+        hotelLevel = self.hotelLevel
+
+        # Same aggregates as Player._countSpace / Player.countLevel
+        def countLevel(player: int, value: int, n: int):
+            if value == hotelLevel:
+                data[hotelCount + player] += n
+            else:
+                data[houseCount + player] += value * n
+
+        def countSpace(player: int, space: int, n: int):
+            d = definitions[space]
+
+            if d.type == "terrain":
+                gid = d.group_id
+                i = state.groupStart + gid * playerCount + player
+
+                data[i] += n
+
+                if data[i] == groupSizes[gid]:
+                    data[monopolies + player] |= 1 << gid
+                else:
+                    data[monopolies + player] &= ~(1 << gid)
+
+                countLevel(player, data[level + space], n)
+            elif d.type == "railroad":
+                data[railroadCount + player] += n
+            elif d.type == "company":
+                data[companyCount + player] += n
+
+            if data[mortgage + space]:
+                data[mortgageCount + player] += n
+
+        for type, player, a, b in records:
+            if type == EVENT_CASH:
+                data[money + player] += b
+            elif type == EVENT_MOVE:
+                data[pos + player] = a
+            elif type == EVENT_CARD:
+                # Same cursor walk as CardStack.draw
+                data[decks[a]] = (data[decks[a]] + 1) % deckSizes[a]
+            elif type == EVENT_TURN:
+                data[roundCount] = a
+                data[turnCount] = b  # Turns played before this one
+            elif type == EVENT_ROUND:
+                data[roundCount] = a
+                data[turnCount] += 1  # The last turn of the round is over
+            elif type == EVENT_OWNER:
+                old = data[owner + a]
+
+                if old != NONE:
+                    countSpace(old, a, -1)
+
+                data[owner + a] = player
+
+                if player != NONE:
+                    countSpace(player, a, 1)
+            elif type == EVENT_MORTGAGE:
+                if data[mortgage + a] != b and data[owner + a] != NONE:
+                    data[mortgageCount + data[owner + a]] += 1 if b else -1
+
+                data[mortgage + a] = b
+            elif type == EVENT_BUILD:
+                if data[owner + a] != NONE:
+                    countLevel(data[owner + a], data[level + a], -1)
+                    countLevel(data[owner + a], b, 1)
+
+                data[level + a] = b
+            elif type == EVENT_JAIL:
+                data[inJail + player] = a
+                data[jailTurnCount + player] = b
+            elif type == EVENT_JAIL_CARD:
+                data[jailCards + player] = a
+            elif type == EVENT_MULTIPLIER:
+                data[rentMultiplier + player] = a
+            elif type == EVENT_BANKRUPT:
+                data[dead + player] = 1
+                data[deathRound + player] = a
+            elif type == EVENT_WIN:
+                data[winner] = player
+                data[turnCount] += 1  # The winning turn is over
+            elif type == EVENT_DECK:
+                data[decks[player] + 1 + a] = b
+            # EVENT_DICE, EVENT_BUY and EVENT_RENT are informative, their effects have their own events
+
+        return state
@@ -1,60 +1,145 @@
-import json
+from string import Formatter
 
-from typing import Dict
+from typing import Dict, Any
 
 from .renderer import RENDER, CSI
+from .bundle   import loadBundle, DEFAULT_LANG
 
+LANG_LIST = ["french", "english"]
 
-DEFAULT_LANG = "english"
+_FORMATTER = Formatter()
 
-LANG_LIST = ["french", "english"]
+
+def _escape(s: str):
+    return s.replace("{", "{{").replace("}", "}}")
+
+
+class Template:
+    """
+    A message compiled once: the `render` fields (render codes) are substituted ahead of time, the other fields are
+    formatted with `str.format_map`, and the trailing reset is known ahead of time when the text has render codes.
+    """
+
+    __slots__ = ("source", "text", "dynamic", "reset", "render")
+
+    def __init__(self, source: str):
+        self.source = source
+
+        parts = []
+
+        self.dynamic = False
+        self.render = False  # A `render` field that couldn't be resolved ahead of time (formatted with RENDER)
+
+        static = ""  # Resolved text (literals and render codes)
+
+        for literal, field, spec, conversion in _FORMATTER.parse(source):
+            parts.append(_escape(literal))
+            static += literal
+
+            if field is None:
+                continue
+
+            root = field.split(".", 1)[0].split("[", 1)[0]
+
+            if root == "render":
+                try:
+                    value = _FORMATTER.get_field(field, (), {"render": RENDER})[0]
+                    value = _FORMATTER.format_field(_FORMATTER.convert_field(value, conversion), spec or "")
+                except (AttributeError, KeyError, IndexError, TypeError, ValueError):
+                    self.render = True
+                else:
+                    parts.append(_escape(value))
+                    static += value
+
+                    continue
+
+            self.dynamic = True
+
+            parts.append("{" + field + (f"!{conversion}" if conversion else "") + (f":{spec}" if spec else "") + "}")
+
+        self.reset = CSI in static
+
+        if self.dynamic:
+            self.text = "".join(parts)
+        else:
+            self.text = static + RENDER.reset if self.reset else static
+
+    def __call__(self, kwargs: Dict[str, Any]):
+        if not self.dynamic:
+            return self.text
+
+        res = self.text.format_map({**kwargs, "render": RENDER} if self.render else kwargs)
+
+        if self.reset or CSI in res:
+            res += RENDER.reset
+
+        return res
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} {self.source!r}>"
 
 
 class Lang:
-    def __init__(self, name: int, data: Dict[str, str]):
+    def __init__(self, name: str, data: Dict[str, Any]):
         self._name = name
         self._data = data
-    
+
+        # Compiled templates and nested catalogs, by item
+        self._templates: Dict[str, Template] = {}
+        self._sections: Dict[str, "Lang"] = {}
+
+    def _section(self, item: str):
+        section = self._sections.get(item)
+
+        if section is None:
+            section = self._sections[item] = Lang(f"{self._name}.'{item}'", self._data[item])
+
+        return section
+
     def __getitem__(self, item: str):
         # sourcery skip: assign-if-exp, reintroduce-else
         data = self._data.get(item, f"{self!r}.{item!r}")
 
         if isinstance(data, dict):
-            return Lang(f"{self._name}.'{item}'", data)
-        
+            return self._section(item)
+
         return data
-    
+
     def __call__(self, _item: str, **kwargs):
+        template = self._templates.get(_item)
+
+        if template is not None:
+            return template(kwargs)
+
         if _item not in self._data:
             return f"{self!r}.{_item!r}{kwargs!r}"
 
-        data = self._data.get(_item)
+        data = self._data[_item]
 
         if isinstance(data, dict):
-            return Lang(f"{self._name}.'{_item}'", data)
+            return self._section(_item)
 
-        res = data.format(**{**kwargs, "render": RENDER})
-
-        if CSI in res:
-            res += RENDER.reset
+        template = self._templates[_item] = Template(data)
 
-        return res
+        return template(kwargs)
 
     def __repr__(self):
         return f"<{self.__module__}.{self.__class__.__name__} {self._name}>"
 
-def _loadLang(name: str):  # sourcery skip: instance-method-first-arg-name, raise-from-previous-error
-    try:
-        with open(f"monopoly/assets/lang/{name}.json", "r", encoding="utf8") as f:
-            return Lang(name, json.load(f))
-    except FileNotFoundError:
-        raise FileNotFoundError(f"Map file '{name}' not found")
 
-def loadLang(name: str):
-    lang = _loadLang(DEFAULT_LANG)
+# Langs are read only, every game of a process shares them (and their compiled templates)
+_LANGS: Dict[str, Lang] = {}
+
 
-    lang._data.update(_loadLang(name)._data)
+def loadLang(name: str):  # sourcery skip: raise-from-previous-error
+    lang = _LANGS.get(name)
 
-    lang._name = name
+    if lang is not None:
+        return lang
+
+    try:
+        lang = _LANGS[name] = Lang(name, loadBundle().langs[name])
+    except KeyError:
+        raise FileNotFoundError(f"Lang file '{name}' not found")
 
     return lang
@@ -4,90 +4,162 @@ from .space import (
     Space_Tax,
     Space_Terrain, Space_Railroad, Space_Company,
     Space_Chance, Space_CommunityChest,
+    SpaceDefinition,
 
     TERRAIN_COUNT_BY_GROUPS, RAILROAD_COUNT, COMPANY_COUNT, SPACE_COUNT
 )
+from .chance import CHANCE_CARD_MOVES, COMMUNITY_CHEST_CARD_MOVES
+from .bundle import loadBundle
+from .rent   import RentTable
 # from .monopoly import Monopoly
 
-import json
-
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple, Optional
 
 DEFAULT_MAP = "USA"
 
 MAP_LIST = ["France", "USA"]
 
 
-with open("monopoly/assets/map/map", "r") as f:
-    mapData = [s.strip() for s in f.read().split("\n") if s.strip() != "" and not s.strip().startswith("#")]
-
+mapData = loadBundle().board
 
-def loadSpace(map: "Map", s: str, pos: int):  # sourcery skip: avoid-builtin-shadow, extract-duplicate-method, inline-immediately-returned-variable
-    type, *args = s.split(" ")
 
+def defineSpace(type: str, args: Tuple[int, ...], pos: int):  # sourcery skip: avoid-builtin-shadow, extract-duplicate-method, inline-immediately-returned-variable
     if type == "go":
-        return Space_Go(map, pos)
+        return Space_Go.define(pos)
 
     if type == "jail":
-        return Space_Jail(map, pos)
+        return Space_Jail.define(pos)
 
     if type == "free_parking":
-        return Space_FreeParking(map, pos)
+        return Space_FreeParking.define(pos)
 
     if type == "go_jail":
-        return Space_GoJail(map, pos)
+        return Space_GoJail.define(pos)
 
     if type == "tax":
         if not args:
             raise ValueError()  ## TODO
 
-        id = args[0]
-
-        id = int(id) - 1  ## TODO check
+        id = args[0] - 1  ## TODO check
 
-        return Space_Tax(map, id, pos)
+        return Space_Tax.define(pos, id)
 
     if type == "terrain":
         if not args:
             raise ValueError()  ## TODO
         
-        gid, id = args[0].split(":")  ## TODO check
-
-        gid, id = int(gid) - 1, int(id) - 1  ## TODO check
+        gid, id = args[0] - 1, args[1] - 1  ## TODO check
     
-        return Space_Terrain(map, gid, id, pos)
+        return Space_Terrain.define(pos, gid, id)
 
     if type == "railroad":
         if not args:
             raise ValueError()  ## TODO
     
-        id = args[0]
-
-        id = int(id) - 1  ## TODO check
+        id = args[0] - 1  ## TODO check
     
-        return Space_Railroad(map, id, pos)
+        return Space_Railroad.define(pos, id)
 
     if type == "company":
         if not args:
             raise ValueError()  ## TODO
     
-        id = args[0]
-
-        id = int(id) - 1  ## TODO check
+        id = args[0] - 1  ## TODO check
     
-        return Space_Company(map, id, pos)
+        return Space_Company.define(pos, id)
 
     if type == "chance":
-        return Space_Chance(map, pos)
+        return Space_Chance.define(pos)
 
     if type == "community_chest":
-        return Space_CommunityChest(map, pos)
+        return Space_CommunityChest.define(pos)
 
     raise ValueError(f"'{type}' space type not found !")
 
 
-def loadSpaces(map: "Map"):
-    return [loadSpace(map, s, i) for i, s in enumerate(mapData)]
+def defineSpaces():
+    return tuple(defineSpace(type, args, i) for i, (type, args) in enumerate(mapData))
+
+
+class Board:
+    """
+    Static board definition: space definitions and the position tables derived from
+    them. It is immutable and built once, every game shares the same instance.
+    """
+
+    _board: Optional["Board"] = None
+
+    def __init__(self, definitions: Tuple[SpaceDefinition, ...]):
+        self.definitions = definitions
+
+        positionsByType: Dict[str, List[int]] = {}
+
+        for d in self.definitions:
+            positionsByType.setdefault(d.type, []).append(d.pos)
+
+        self.positionsByType: Dict[str, Tuple[int, ...]] = {
+            type: tuple(positions) for type, positions in positionsByType.items()
+        }
+
+        self.terrainPositions: Dict[Tuple[int, int], int] = {
+            (d.group_id, d.id): d.pos for d in self.definitions if d.type == "terrain"
+        }
+
+        self.railroadPositions: Dict[int, int] = {d.id: d.pos for d in self.definitions if d.type == "railroad"}
+        self.companyPositions: Dict[int, int] = {d.id: d.pos for d in self.definitions if d.type == "company"}
+
+        self.buildMoveTables()
+
+        self.rentTable = RentTable(self.definitions)
+
+    @classmethod
+    def get(cls):
+        if cls._board is None:
+            cls._board = cls(defineSpaces())
+
+        return cls._board
+
+    def buildMoveTables(self):
+        # nextOfType[type][pos] is the position of the first space of this type after pos
+        self.nextOfType: Dict[str, Tuple[int, ...]] = {}
+
+        for type, positions in self.positionsByType.items():
+            self.nextOfType[type] = tuple(
+                next((p for p in positions if p > pos), positions[0]) for pos in range(SPACE_COUNT)
+            )
+
+        self.jailPos: int = self.positionsByType["jail"][0]
+
+        # chanceMoves[card][pos] (and communityChestMoves) is the (destination, passGo) pair of the move of the card
+        # drawn from pos, None for a card that doesn't move
+        self.chanceMoves = tuple(self.compileCardMove(m) for m in CHANCE_CARD_MOVES)
+        self.communityChestMoves = tuple(self.compileCardMove(m) for m in COMMUNITY_CHEST_CARD_MOVES)
+
+    def compileCardMove(self, move: Optional[Tuple[Any, ...]]):
+        # sourcery skip: switch
+        if move is None:
+            return None
+
+        kind, *args = move
+
+        if kind == "back":
+            return tuple(((pos - args[0]) % SPACE_COUNT, pos - args[0] < 0) for pos in range(SPACE_COUNT))
+
+        if kind == "jail":
+            return ((self.jailPos, False),) * SPACE_COUNT
+
+        if kind == "nearest":
+            destinations = self.nextOfType[args[0]]
+        elif kind == "go":
+            destinations = [self.positionsByType["go"][0]] * SPACE_COUNT
+        elif kind == "terrain":
+            destinations = [self.terrainPositions[(args[0] - 1, args[1] - 1)]] * SPACE_COUNT
+        elif kind == "railroad":
+            destinations = [self.railroadPositions[args[0] - 1]] * SPACE_COUNT
+        else:
+            raise ValueError(f"'{kind}' card move not found !")
+
+        return tuple((dest, dest < pos) for pos, dest in enumerate(destinations))
 
 
 class Map:
@@ -98,56 +170,94 @@ class Map:
 
         self.terrains = data.get("terrains", {})
 
-        self.spaces = loadSpaces(self)
-    
+        self.board = Board.get()
+
+        self.spaces: List[Space] = [d.cls(self, d) for d in self.board.definitions]
+
+        self.buildIndexes()
+
+    def buildIndexes(self):
+        board, spaces = self.board, self.spaces
+
+        self.positionsByType = board.positionsByType
+        self.nextOfType = board.nextOfType
+        self.jailPos = board.jailPos
+        self.chanceMoves = board.chanceMoves
+        self.communityChestMoves = board.communityChestMoves
+
+        self.spacesByType: Dict[str, List[Space]] = {
+            type: [spaces[p] for p in positions] for type, positions in board.positionsByType.items()
+        }
+
+        self.terrainIndex: Dict[Tuple[int, int], Space_Terrain] = {
+            key: spaces[p] for key, p in board.terrainPositions.items()
+        }
+
+        self.groupTerrains: List[List[Space_Terrain]] = [
+            [self.terrainIndex.get((gid, id)) for id in range(count)] for gid, count in enumerate(TERRAIN_COUNT_BY_GROUPS)
+        ]
+
+        self.railroads: List[Space_Railroad] = [
+            spaces[board.railroadPositions[id]] if id in board.railroadPositions else None for id in range(RAILROAD_COUNT)
+        ]
+        self.companies: List[Space_Company] = [
+            spaces[board.companyPositions[id]] if id in board.companyPositions else None for id in range(COMPANY_COUNT)
+        ]
+
+        self.specialProperties: List[Space] = self.railroads + self.companies
+
+    def getNearest(self, pos: int, type: str):
+        table = self.nextOfType.get(type)
+
+        return self.spaces[table[pos % SPACE_COUNT]] if table else None
+
     def getSpace(self, pos: int):
         return self.spaces[pos % SPACE_COUNT]
 
+    def getSpacesOfType(self, type: str):
+        return self.spacesByType.get(type, [])
+
+    def getPositionsOfType(self, type: str):
+        return self.positionsByType.get(type, ())
+
     def getGroupColor(self, gid: int):
-        return self._getTerrain(gid, 0).color
+        return self.groupTerrains[gid][0].color
     
     def getGroupTerrains(self, gid: int):
-        return [*(self._getTerrain(gid, id) for id in range(TERRAIN_COUNT_BY_GROUPS[gid]))]
+        return self.groupTerrains[gid]
 
     def _getTerrain(self, gid: int, id: int):
-        for s in self.spaces:
-            if isinstance(s, Space_Terrain) and s.group_id == gid and s.id == id:
-                return s
+        return self.terrainIndex.get((gid, id))
 
     def getTerrain(self, gid: int, id: int):
         return self._getTerrain(gid - 1, id - 1)
 
     def _getRailroad(self, id: int):
-        for s in self.spaces:
-            if isinstance(s, Space_Railroad) and s.id == id:
-                return s
+        return self.railroads[id] if 0 <= id < RAILROAD_COUNT else None
 
     def getRailroad(self, id: int):
         return self._getRailroad(id - 1)
 
     def _getCompany(self, id: int):
-        for s in self.spaces:
-            if isinstance(s, Space_Company) and s.id == id:
-                return s
+        return self.companies[id] if 0 <= id < COMPANY_COUNT else None
 
     def getCompany(self, id: int):
         return self._getCompany(id - 1)
     
     def getRailroads(self):
-        return [*(self._getRailroad(r) for r in range(RAILROAD_COUNT))]
+        return self.railroads
     
     def getCompanies(self):
-        return [*(self._getCompany(c) for c in range(COMPANY_COUNT))]
+        return self.companies
     
     def getSpecialProperties(self):
-        return self.getRailroads() + self.getCompanies()
+        return self.specialProperties
 
     @classmethod
     def load(cls, game: "Monopoly", name: str):  # sourcery skip: raise-from-previous-error
         try:
-            with open(f"monopoly/assets/map/{name}.json", "r", encoding="utf8") as f:
-                data = json.load(f)
-        except FileNotFoundError:
+            data = loadBundle().maps[name]
+        except KeyError:
             raise FileNotFoundError(f"Map file '{name}' not found")
 
         return cls(game, name, data)
@@ -0,0 +1,278 @@
+"""
+Landing probabilities of the board, solved as a Markov chain.
+
+A state is where a player stands before a roll: a position with the count of
+doubles already rolled this turn, or a jail state (failed jail rolls so far).
+The transitions follow the game rules: the two dices of `DicePair`, the spaces
+resolved after each move (`Space_GoJail`, the card moves of `CHANCE_CARD_MOVES`
+/ `COMMUNITY_CHEST_CARD_MOVES`), the three doubles rule of
+`Player.menuRollDices` and the jail choices of the headless bots. The stationary
+distribution gives how often each space is landed on.
+
+Models are cached per board, dices and jail choice: only the first query solves.
+"""
+
+from functools import lru_cache
+
+from .space import SPACE_COUNT
+
+from typing import Optional, List, Dict, Tuple, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the chain is then solved by power iteration
+    np = None
+
+
+DICE_FACES = ((1, 6), (1, 6))  # (min, max) of each dice of a DicePair
+
+MAX_DOUBLES = 3  # The third double of a turn sends to jail
+MAX_JAIL_ROLLS = 3  # Failed rolls before having to pay
+
+JAILED = -1  # Resolution outcome: in jail
+
+
+def diceOutcomes(dices: Sequence[Tuple[int, int]] = DICE_FACES):
+    """{(score, double): probability} of a roll of two dices"""
+
+    (min1, max1), (min2, max2) = dices
+
+    count = (max1 - min1 + 1) * (max2 - min2 + 1)
+
+    outcomes: Dict[Tuple[int, bool], float] = {}
+
+    for a in range(min1, max1 + 1):
+        for b in range(min2, max2 + 1):
+            key = (a + b, a == b)
+
+            outcomes[key] = outcomes.get(key, 0.) + 1 / count
+
+    return outcomes
+
+
+class LandingModel:
+    def __init__(self, board: "Board", dices: Sequence[Tuple[int, int]] = DICE_FACES, payJail: bool = False):
+        self.board = board
+        self.dices = tuple(dices)
+        self.payJail = payJail
+
+        self.jailPos: int = board.jailPos
+        self.goJailPositions = set(board.positionsByType.get("go_jail", ()))
+
+        # States: (pos, doubles) for doubles in 0..MAX_DOUBLES-1, then the jail states by failed roll count
+        self.stateCount = SPACE_COUNT * MAX_DOUBLES + MAX_JAIL_ROLLS + 1
+
+        self._resolved: Dict[int, Tuple[Dict[int, float], List[float]]] = {}
+
+        self.matrix = None  # Dense transition matrix (NumPy only)
+
+        self.transitions, self.visits = self.buildChain()
+
+        self.stationary = self.solve()
+
+        # Expected landings on each space per roll
+        self.landingRates = [sum(self.stationary[s] * self.visits[s][pos] for s in range(self.stateCount))
+                             for pos in range(SPACE_COUNT)]
+
+        total = sum(self.landingRates)
+
+        # Share of the landings of each space
+        self.landings = [rate / total for rate in self.landingRates]
+
+        self.jailShare: float = sum(self.stationary[self.jailState(k)] for k in range(MAX_JAIL_ROLLS + 1))
+
+        # Share of the rolls that start a turn (no double rolled yet, or in jail)
+        self.turnShare: float = sum(self.stationary[self.freeState(pos, 0)] for pos in range(SPACE_COUNT)) + self.jailShare
+
+        # Expected landings on each space during a turn
+        self.turnLandingRates = [rate / self.turnShare for rate in self.landingRates]
+
+        self.meanScore: float = sum(score * p for (score, _), p in diceOutcomes(self.dices).items())
+
+    @staticmethod
+    def freeState(pos: int, doubles: int):
+        return doubles * SPACE_COUNT + pos
+
+    @staticmethod
+    def jailState(rolls: int):
+        return MAX_DOUBLES * SPACE_COUNT + rolls
+
+    def resolve(self, pos: int):
+        """
+        Spaces resolved after landing on `pos` (as `Player.play` does): ({final position or JAILED: probability},
+        expected visits of each space)
+        """
+
+        if pos in self._resolved:
+            return self._resolved[pos]
+
+        board = self.board
+
+        visits = [0.] * SPACE_COUNT
+        visits[pos] = 1.
+
+        finals: Dict[int, float] = {}
+
+        type = board.definitions[pos].type
+
+        moves = board.chanceMoves if type == "chance" else board.communityChestMoves if type == "community_chest" else None
+
+        if pos in self.goJailPositions:
+            finals[JAILED] = 1.
+            visits[self.jailPos] += 1.  # The jail is resolved once the player is moved there
+        elif moves is None:
+            finals[pos] = 1.
+        else:
+            p = 1 / len(moves)
+
+            for move in moves:
+                if move is None:
+                    finals[pos] = finals.get(pos, 0.) + p
+                    continue
+
+                dest, _ = move[pos]
+
+                if dest == self.jailPos:  # Only the jail cards move there
+                    finals[JAILED] = finals.get(JAILED, 0.) + p
+                    visits[dest] += p
+                    continue
+
+                subFinals, subVisits = self.resolve(dest)
+
+                for f, q in subFinals.items():
+                    finals[f] = finals.get(f, 0.) + p * q
+
+                for i, v in enumerate(subVisits):
+                    visits[i] += p * v
+
+        self._resolved[pos] = finals, visits
+
+        return finals, visits
+
+    def buildChain(self):
+        outcomes = diceOutcomes(self.dices)
+
+        transitions: List[Dict[int, float]] = [{} for _ in range(self.stateCount)]
+        visits = [[0.] * SPACE_COUNT for _ in range(self.stateCount)]
+
+        def move(state: int, start: int, score: int, p: float, nextDoubles: Optional[int], jailAfter: bool = False):
+            # nextDoubles is the doubles count of the next roll if the player plays again, None if the turn ends
+            finals, landed = self.resolve((start + score) % SPACE_COUNT)
+
+            for i, v in enumerate(landed):
+                visits[state][i] += p * v
+
+            for final, q in finals.items():
+                if final == JAILED or jailAfter:
+                    target = self.jailState(0)
+                elif nextDoubles is None:
+                    target = self.freeState(final, 0)
+                else:
+                    target = self.freeState(final, nextDoubles)
+
+                transitions[state][target] = transitions[state].get(target, 0.) + p * q
+
+        def jump(state: int, target: int, p: float):
+            transitions[state][target] = transitions[state].get(target, 0.) + p
+
+        for doubles in range(MAX_DOUBLES):
+            for pos in range(SPACE_COUNT):
+                state = self.freeState(pos, doubles)
+
+                for (score, double), p in outcomes.items():
+                    if double and doubles + 1 == MAX_DOUBLES:
+                        # The move is played, then the player goes to jail
+                        move(state, pos, score, p, None, jailAfter=True)
+                    else:
+                        move(state, pos, score, p, doubles + 1 if double else None)
+
+        for rolls in range(MAX_JAIL_ROLLS + 1):
+            state = self.jailState(rolls)
+
+            for (score, double), p in outcomes.items():
+                if self.payJail or rolls == MAX_JAIL_ROLLS:
+                    # Pay (or use a card), roll and play again on a double
+                    move(state, self.jailPos, score, p, 1 if double else None)
+                elif double:
+                    # Out of jail with the double, but no replay
+                    move(state, self.jailPos, score, p, None)
+                else:
+                    jump(state, self.jailState(rolls + 1), p)
+
+        return transitions, visits
+
+    def solve(self):
+        n = self.stateCount
+
+        if np is not None:
+            matrix = np.zeros((n, n))
+
+            for s, row in enumerate(self.transitions):
+                for t, p in row.items():
+                    matrix[s, t] = p
+
+            # pi (P - I) = 0 with sum(pi) = 1
+            a = matrix.T - np.eye(n)
+            a[-1] = 1.
+
+            b = np.zeros(n)
+            b[-1] = 1.
+
+            self.matrix = matrix
+
+            return np.linalg.solve(a, b).tolist()
+
+        pi = [1 / n] * n
+
+        for _ in range(10000):
+            nxt = [0.] * n
+
+            for s, row in enumerate(self.transitions):
+                for t, p in row.items():
+                    nxt[t] += pi[s] * p
+
+            delta = max(abs(a - b) for a, b in zip(pi, nxt))
+
+            pi = nxt
+
+            if delta < 1e-15:
+                break
+
+        return pi
+
+    def probability(self, pos: int):
+        """Share of the landings on a space"""
+
+        return self.landings[pos]
+
+    def ranking(self):
+        """Positions from the most to the least landed on"""
+
+        return sorted(range(SPACE_COUNT), key=lambda pos: -self.landings[pos])
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} {self.stateCount} states>"
+
+
+@lru_cache(maxsize=None)
+def _landingModel(board: "Board", dices: Tuple[Tuple[int, int], ...], payJail: bool):
+    return LandingModel(board, dices, payJail)
+
+
+def landingModel(board: Optional["Board"] = None, dices: Sequence[Tuple[int, int]] = DICE_FACES,
+                 payJail: bool = False):
+    """Solved (and cached) model of a board, the shared default board if none is given"""
+
+    if board is None:
+        from .map import Board
+
+        board = Board.get()
+
+    return _landingModel(board, tuple(tuple(d) for d in dices), payJail)
+
+
+def landingProbabilities(board: Optional["Board"] = None, dices: Sequence[Tuple[int, int]] = DICE_FACES,
+                         payJail: bool = False):
+    """Share of the landings on each space of the board"""
+
+    return landingModel(board, dices, payJail).landings
@@ -0,0 +1,293 @@
+"""
+Monte Carlo tree search player.
+
+`MCTSPolicy` searches the decisions of its player within a time and / or
+playout budget. The playouts run in a headless sandbox game: the state of the
+real game is copied into it with one buffer copy (`GameState.restore`), the
+cards not drawn yet are shuffled (their order is hidden to the players), the
+turn in progress is resumed (`Monopoly.steps(resume=...)`) and the sandbox
+plays on with its own dice tape and the rollout decision function for
+`horizon` rounds, or to the end of the game.
+
+The tree is open loop: a node is a sequence of decisions of the player
+(whatever the dices rolled in between).
+
+The values of the actions are close (a decision moves the net worth share of a
+player by a few thousandths) next to the noise of the dices, so the actions of a
+decision are compared on common random numbers: the n-th playout of each action
+rolls the same dices and draws from the same card shuffles (scenario n). The
+UCT scores use the values of the children rescaled to their range, and the
+rollout decision is only overridden by an action that did better on the same
+scenarios. Each decision searches a new tree: the subtree of the previous
+decision was played in other scenarios.
+"""
+
+import math
+import random as _random
+import time
+
+from .policy   import Policy, DecisionRequest
+from .headless import Action, Decision, defaultDecision
+from .space    import Space
+from .rng      import GameRandom
+from .dice     import DiceTape
+
+from typing import Optional, List, Dict, Tuple, Any
+
+
+ActionKey = Tuple[Any, ...]
+
+DEFAULT_TIME_LIMIT = 0.5  # Seconds per decision
+DEFAULT_HORIZON = 20  # Rounds played by a playout before the position is evaluated
+
+EXPLORATION = 1.4
+
+SANDBOX_TAPE_SIZE = 256  # Rolls drawn at once by the sandbox, refilled at the start of every playout
+
+
+def actionKey(action: Action) -> ActionKey:
+    """Game independent key of an action (spaces by position)"""
+
+    name, args = action
+
+    return (name, *(a.pos if isinstance(a, Space) else a for a in args))
+
+
+def findAction(actions: List[Action], key: ActionKey):
+    return next((a for a in actions if actionKey(a) == key), None)
+
+
+def netWorth(player: "Player"):
+    """Money plus the value of the properties and buildings (mortgaged properties count for their mortgage price)"""
+
+    worth = player.money
+
+    for s in player.ownedSpaces:
+        worth += s.mortgagePrice if s.mortgage else s.price
+
+        if s.type == "terrain":
+            worth += s.level * s.housePrice
+
+    return worth
+
+
+def evaluate(game: "Monopoly", player: "Player"):
+    """Value of a position for a player, between 0 (bankrupt) and 1 (winner)"""
+
+    if game.winner is not None:
+        return 1. if game.winner is player else 0.
+
+    if player.dead:
+        return 0.
+
+    worths = [max(netWorth(p), 0) for p in game.players if not p.dead]
+
+    return netWorth(player) / sum(worths) if sum(worths) > 0 else 1 / len(worths)
+
+
+class Node:
+    __slots__ = ("visits", "value", "values", "children")
+
+    def __init__(self):
+        self.visits = 0
+        self.value = 0.
+
+        # Value of each playout (of each scenario, for the actions of a decision)
+        self.values: List[float] = []
+
+        self.children: Dict[ActionKey, "Node"] = {}
+
+    def select(self, keys: List[ActionKey], exploration: float, rng: _random.Random):
+        """UCT choice among the legal `keys` (the unvisited ones first)"""
+
+        unvisited = [k for k in keys if k not in self.children or not self.children[k].visits]
+
+        if unvisited:
+            return rng.choice(unvisited)
+
+        log = math.log(self.visits)
+
+        means = {k: self.children[k].value / self.children[k].visits for k in keys}
+
+        low = min(means.values())
+        spread = max(means.values()) - low or 1.
+
+        def score(k: ActionKey):
+            return (means[k] - low) / spread + exploration * math.sqrt(log / self.children[k].visits)
+
+        return max(keys, key=score)
+
+    def child(self, key: ActionKey):
+        if key not in self.children:
+            self.children[key] = Node()
+
+        return self.children[key]
+
+    def best(self, keys: List[ActionKey], default: Optional[ActionKey] = None):
+        """Most visited legal key, or `default` unless that key did better than it on the same scenarios"""
+
+        key = max(keys, key=lambda k: self.children[k].visits if k in self.children else -1)
+
+        if default is None or key == default:
+            return key
+
+        child, base = self.children.get(key), self.children.get(default)
+
+        if base is None or not base.visits:
+            return default
+
+        n = min(child.visits, base.visits)
+
+        return key if sum(child.values[:n]) > sum(base.values[:n]) else default
+
+
+class MCTSPolicy(Policy):
+    def __init__(self, timeLimit: Optional[float] = DEFAULT_TIME_LIMIT, playouts: Optional[int] = None,
+                 horizon: int = DEFAULT_HORIZON, rollout: Decision = defaultDecision, exploration: float = EXPLORATION,
+                 seed: Optional[int] = None):
+        assert timeLimit is not None or playouts is not None, "A time limit or a playout count is required"
+
+        self.timeLimit = timeLimit
+        self.playouts = playouts
+        self.horizon = horizon
+        self.rollout = rollout
+        self.exploration = exploration
+
+        self.seed = seed
+        self.random = _random.Random(seed)
+
+        self.sandbox: Optional["Monopoly"] = None
+
+        # Random states of the sandbox for the n-th playout of an action (see `scenario`)
+        self.scenarioSeed = self.random.getrandbits(64)
+        self.scenarios: List[Any] = []
+
+        # Stats of the last decision
+        self.lastPlayouts = 0
+        self.lastTime = 0.
+
+    def getSandbox(self, game: "Monopoly"):
+        from .monopoly import Monopoly
+
+        sandbox = self.sandbox
+
+        if sandbox is None or sandbox.playerCount != game.playerCount or sandbox.map.name != game.map.name:
+            sandbox = self.sandbox = Monopoly(playerCount=game.playerCount, map=game.map.name, lang=game.lang._name,
+                                              headless=True, decision=self.rollout, seed=self.seed)
+
+            sandbox.diceTape = DiceTape(sandbox.dices, SANDBOX_TAPE_SIZE, rng=sandbox.random.dices)
+
+        return sandbox
+
+    def scenario(self, sandbox: "Monopoly", n: int):
+        """Set the random streams of the sandbox to those of scenario `n` (the same for every action)"""
+
+        while len(self.scenarios) <= n:
+            self.scenarios.append(GameRandom(self.scenarioSeed, len(self.scenarios)).getState())
+
+        state = self.scenarios[n]
+
+        sandbox.random.setState(state)
+
+        if sandbox.diceTape is not None:
+            sandbox.diceTape.setState((state[0], sandbox.diceTape.size))  # The next roll refills from the stream
+
+    def decide(self, player: "Player", actions: List[Action]):
+        # Called outside of a stepped game (`Player.menu`): the turn state is deduced from the legal actions (they are
+        # the same for both values of an undeducible flag), the search only chooses among them
+        names = {name for name, _ in actions}
+
+        canRollDices = "rollDices" in names
+        hasPlayed = "buy" in names or "finish" in names
+
+        return self.decideRequest(DecisionRequest(player.game, player, canRollDices, True, hasPlayed, None, actions))
+
+    def decideRequest(self, request: DecisionRequest):
+        actions = request.actions
+
+        if len(actions) == 1:
+            return actions[0]
+
+        game, player = request.game, request.player
+
+        root = Node()
+
+        vars = dict(request.vars) if request.vars is not None else {
+            "play_again": request.canRollDices, "double_count": 0, "do_render": False, "has_played": request.hasPlayed
+        }
+
+        sandbox = self.getSandbox(game)
+
+        start = time.perf_counter()
+        deadline = start + self.timeLimit if self.timeLimit is not None else math.inf
+
+        playouts = 0
+
+        while (self.playouts is None or playouts < self.playouts) and time.perf_counter() < deadline:
+            self.playout(game, sandbox, player.id, vars, root)
+
+            playouts += 1
+
+        self.lastPlayouts = playouts
+        self.lastTime = time.perf_counter() - start
+
+        # The search only overrides the rollout decision with an action that did better
+        key = root.best([actionKey(a) for a in actions], actionKey(self.rollout(player, actions)))
+
+        return findAction(actions, key)
+
+    def playout(self, game: "Monopoly", sandbox: "Monopoly", playerId: int, vars: Dict[str, Any], root: Node):
+        sandbox.state.restore(game.state)
+        sandbox.resync()
+
+        player = sandbox.players[playerId]
+
+        steps = sandbox.steps(game.roundCount + self.horizon, resume=(player, dict(vars)))
+
+        path = [root]
+        node: Optional[Node] = root
+
+        try:
+            request = next(steps)
+
+            while True:
+                actions = request.actions
+
+                if request.player is player and node is not None and len(actions) > 1:
+                    keys = [actionKey(a) for a in actions]
+
+                    key = node.select(keys, self.exploration, self.random)
+
+                    action = findAction(actions, key)
+
+                    expanded = key not in node.children
+
+                    node = node.child(key)
+                    path.append(node)
+
+                    if len(path) == 2:  # Nothing random happened yet, the action is played in its next scenario
+                        self.scenario(sandbox, node.visits)
+
+                        # The order of the cards not drawn yet is hidden: each scenario draws from its own shuffle
+                        sandbox.chanceCardStack.mixRemaining()
+                        sandbox.communityChestCardStack.mixRemaining()
+
+                    if expanded:  # One new node per playout, the rollout decisions play on
+                        node = None
+                else:
+                    action = self.rollout(request.player, actions)
+
+                request = steps.send(action)
+        except StopIteration:
+            pass
+
+        value = evaluate(sandbox, player)
+
+        for n in path:
+            n.visits += 1
+            n.value += value
+            n.values.append(value)
+
+    @property
+    def playoutsPerSecond(self):
+        return self.lastPlayouts / self.lastTime if self.lastTime else 0.
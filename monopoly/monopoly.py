@@ -1,44 +1,127 @@
-from .player    import Player, DebugPlayer
-from .dice      import DicePair
+from .player    import Player, DebugPlayer, ownedSpaceKey
+from .dice      import DicePair, DiceTape
 from .renderer  import Renderer
 from .map       import Map
 from .space     import OwnableSpace, Space_Terrain
 from .lang      import loadLang
 from .chance    import CHANCE_CARDS, COMMUNITY_CHEST_CARDS
 from .cardStack import CardStack
+from .rng       import GameRandom
+from .rent      import RentEngine
+from .state     import GameState, NONE
+from .headless  import HeadlessRenderer, GameResult, Decision, MAX_ROUNDS
+from .journal   import Journal, EVENT_DICE, EVENT_TURN, EVENT_ROUND, EVENT_WIN
+from .policy    import Policy, DecisionRequest
 
-from typing import Optional
+from typing import Optional, List, Sequence, Union, Generator, Any, Dict, Tuple, Callable
+
+
+Steps = Generator[DecisionRequest, Any, Any]
+
+# A turn in progress: its player and turn variables (None once the turn is over, before the next one starts)
+Resume = Tuple[Player, Optional[Dict[str, Any]]]
 
 
 class Monopoly:
-    def __init__(self, *, playerCount: int = 4, lang: str = "english", map: str = "USA", debug: bool = False):
+    def __init__(self, *, playerCount: int = 4, lang: str = "english", map: str = "USA", debug: bool = False,
+                 headless: bool = False, decision: Optional[Decision] = None,
+                 seed: Optional[int] = None, stream: int = 0, journal: Optional[Journal] = None,
+                 policy: Union[Policy, Sequence[Optional[Policy]], None] = None,
+                 renderer: Optional[Callable[["Monopoly"], Renderer]] = None):
         self.debug = debug
+        self.headless = headless
+
+        # Every state transition is emitted to the journal (if any)
+        self.journal = journal
 
         self.debugPlayer: Optional[Player] = None
 
         self.playerCount = playerCount
 
+        self.random = GameRandom(seed, stream)
+
+        self.state = GameState(playerCount, (len(CHANCE_CARDS), len(COMMUNITY_CHEST_CARDS)))
+
+        self.players: List[Player] = []
+
         self.lang = loadLang(lang)
 
-        self.renderer = Renderer(self)
+        if renderer is not None:  # Renderer factory, e.g. with the streams of a network connection
+            self.renderer = renderer(self)
+        elif self.headless:
+            self.renderer = HeadlessRenderer(self, decision)
+        else:
+            self.renderer = Renderer(self)
 
         self.map = Map.load(self, map)
 
-        self.players = [Player(self, i) for i in range(playerCount)]
+        self.players.extend(Player(self, i) for i in range(playerCount))
+
+        # One policy for everyone, or one per player (None for a human player)
+        policies = policy if isinstance(policy, (list, tuple)) else [policy] * playerCount
+
+        for p, pol in zip(self.players, policies):
+            p.policy = pol
+
+        self.rentEngine = RentEngine(self)
     
         self.running = False
 
-        self.dices = DicePair()
+        # Turn in progress (its player and variables, or the player of the turn just over), to save or resume it
+        self.turn: Optional[Resume] = None
+
+        self.dices = DicePair(rng=self.random.dices)
+
+        # Rolls are read from a tape when there is no dice animation (the animation sleeps)
+        self.diceTape: Optional[DiceTape] = None if self.renderer.animateDices else DiceTape(self.dices, rng=self.random.dices)
 
-        self.chanceCardStack = CardStack(range(len(CHANCE_CARDS)))
-        self.communityChestCardStack = CardStack(range(len(COMMUNITY_CHEST_CARDS)))
+        self.chanceCardStack = CardStack(range(len(CHANCE_CARDS)), self.random.cards,
+                                         self.state, self.state.chanceStart)
+        self.communityChestCardStack = CardStack(range(len(COMMUNITY_CHEST_CARDS)), self.random.cards,
+                                                 self.state, self.state.communityChestStart)
 
         self.chanceCardStack.mix()
         self.communityChestCardStack.mix()
 
+        if self.journal is not None:
+            self.journal.start(self)
+
         if self.debug:
             self.debugPlayer = DebugPlayer(self)
     
+    @property
+    def roundCount(self):
+        return self.state.data[self.state.offsets["roundCount"]]
+
+    @roundCount.setter
+    def roundCount(self, count: int):
+        self.state.write(self.state.offsets["roundCount"], count)
+
+    @property
+    def turnCount(self):
+        return self.state.data[self.state.offsets["turnCount"]]
+
+    @turnCount.setter
+    def turnCount(self, count: int):
+        self.state.write(self.state.offsets["turnCount"], count)
+
+    @property
+    def winner(self) -> Optional[Player]:
+        id = self.state.data[self.state.offsets["winner"]]
+
+        return None if id == NONE else self.players[id]
+
+    @winner.setter
+    def winner(self, player: Optional[Player]):
+        self.state.write(self.state.offsets["winner"], NONE if player is None else player.id)
+
+    def resync(self):
+        """Rebuild the Python-side views (owned space lists) after the state buffer was overwritten"""
+
+        for p in self.players:
+            p.ownedSpaces = sorted((s for s in self.map.spaces if isinstance(s, OwnableSpace) and s.owner is p),
+                                   key=ownedSpaceKey)
+
     def drawChanceCard(self):
         return self.chanceCardStack.draw()
 
@@ -46,9 +129,26 @@ class Monopoly:
         return self.communityChestCardStack.draw()
 
     def rollDices(self, player: Player):
+        score, double = self._rollDices(player)
+
+        if self.journal is not None:
+            self.journal.emit(EVENT_DICE, player.id, *(d.value for d in self.dices.dices))
+
+        return score, double
+
+    def _rollDices(self, player: Player):
+        if self.diceTape is not None:
+            score, double = self.diceTape.roll()
+
+            if not self.headless:
+                self.renderer.renderDices(self.dices, player).finish()
+
+            return score, double
+
         dr = self.renderer.renderDices(self.dices, player)
 
-        dr.waitRoll()
+        if player.policy is None:  # Bots don't wait for a key press
+            dr.waitRoll()
 
         for d, v, p in self.dices.roll(0.1):
             dr.render()
@@ -59,22 +159,42 @@ class Monopoly:
 
         return self.dices.sum, self.dices.double
 
-    def turn(self, player: Player):
-        vars = {
-            "play_again": True,
-            "double_count": 0,
-            "do_render": True,
-            "has_played": False
-        }
+    def drive(self, steps: Steps):
+        """Run game steps to the end, answering each decision request with `Player.menu`"""
+
+        try:
+            request = next(steps)
+
+            while True:
+                request = steps.send(request.answer())
+        except StopIteration as e:
+            return e.value
+
+    def turnSteps(self, player: Player, vars: Optional[Dict[str, Any]] = None) -> Steps:
+        if vars is None:
+            vars = {
+                "play_again": True,
+                "double_count": 0,
+                "do_render": True,
+                "has_played": False
+            }
+
+        self.turn = (player, vars)
 
         running = True
 
         while running:
-            action, args = player.menu(vars["play_again"], vars["do_render"], vars["has_played"])
+            action, args = yield DecisionRequest(self, player, vars["play_again"], vars["do_render"], vars["has_played"],
+                                                 vars)
+
+            args = list(args)
 
             vars["do_render"] = True
 
-            running = player.doAction(action, args, vars)
+            running = player.doAction(action, args, vars) and not player.dead
+
+    def turn(self, player: Player):
+        return self.drive(self.turnSteps(player))
 
         # play_again = True
 
@@ -91,16 +211,92 @@ class Monopoly:
         #     if play_again:
         #         self.renderer.playerPlayAgain(player)
 
-    def run(self):
-        self.running = True
+    def checkWinner(self):
+        alive = [p for p in self.players if not p.dead]
+
+        if len(alive) > 1:
+            return False
+
+        self.winner = alive[0] if alive else None
+
+        if self.journal is not None:
+            self.journal.emit(EVENT_WIN, NONE if self.winner is None else self.winner.id)
+
+        if self.winner:
+            self.renderer.playerWin(self.winner)
+
+        self.running = False
+
+        return True
 
-        while self.running:
-            for p in self.players:
-                if p.dead:
-                    continue
+    def roundSteps(self, resume: Optional[Resume] = None) -> Steps:
+        """Play a round, or the end of the round of a turn in progress (or over)"""
+
+        if resume is None:
+            start = 0
+        else:
+            start = resume[0].id if resume[1] is not None else resume[0].id + 1
+
+        for p in self.players[start:]:
+            if p.dead:
+                continue
+
+            if resume is not None and p is resume[0]:
+                yield from self.turnSteps(p, resume[1])
+            else:
+                if self.journal is not None:
+                    self.journal.emit(EVENT_TURN, p.id, self.roundCount, self.turnCount)
 
                 self.renderer.startPlayerTurn(p)
-                
-                self.turn(p)
 
-                self.renderer.writeLnFlush()
+                yield from self.turnSteps(p)
+
+            self.turnCount += 1
+
+            self.turn = (p, None)
+
+            if self.journal is not None:
+                self.journal.flush()
+
+            self.renderer.endPlayerTurn(p)
+
+            if self.checkWinner():
+                return
+
+        self.roundCount += 1
+
+        self.turn = None
+
+        if self.journal is not None:
+            self.journal.emit(EVENT_ROUND, NONE, self.roundCount)
+
+    def playRound(self):
+        return self.drive(self.roundSteps())
+
+    def steps(self, maxRounds: Optional[int] = MAX_ROUNDS, resume: Optional[Resume] = None) -> Steps:
+        """Play the game, yielding a DecisionRequest for each decision and expecting the chosen action back"""
+
+        self.running = True
+
+        if resume is not None:
+            yield from self.roundSteps(resume)
+
+        while self.running and (maxRounds is None or self.roundCount < maxRounds):
+            yield from self.roundSteps()
+
+        self.running = False
+
+        return self.result()
+
+    def result(self):
+        return GameResult(self)
+
+    def run(self, resume: Optional[Resume] = None):
+        """Play until there is a winner (`resume`: the turn in progress of a loaded game, see `Monopoly.turn`)"""
+
+        return self.drive(self.steps(None, resume))
+
+    def simulate(self, maxRounds: int = MAX_ROUNDS):
+        assert self.headless, "simulate() requires a headless game"
+
+        return self.drive(self.steps(maxRounds))
@@ -1,29 +1,92 @@
 # from .monopoly import monopoly
-from .space import TERRAIN_COUNT_BY_GROUPS, Space, OwnableSpace, Space_Terrain, SPACE_COUNT
+from bisect import insort
 
-from typing import Optional, List, Any, Dict
+from .space import TERRAIN_COUNT_BY_GROUPS, Space, OwnableSpace, Space_Terrain, Space_Railroad, Space_Company, SPACE_COUNT, HOTEL_LEVEL, RAILROAD_COUNT
+from .state import GameState, Field, BoolField, PLAYER_FIELDS, NONE
+from .journal import (
+    EVENT_MOVE, EVENT_CASH, EVENT_BUY, EVENT_MORTGAGE, EVENT_BUILD, EVENT_JAIL, EVENT_JAIL_CARD, EVENT_BANKRUPT,
+    EVENT_MULTIPLIER
+)
+
+from typing import Optional, List, Any, Dict, Tuple
+
+
+_FIELD = {f: i for i, f in enumerate(PLAYER_FIELDS)}
+
+
+def ownedSpaceKey(space: Space):
+    # Terrains by position, then the railroads and the companies
+    if space.type == "terrain":
+        return space.pos
+
+    return SPACE_COUNT + space.id + (RAILROAD_COUNT if space.type == "company" else 0)
 
 
 class Player:
-    def __init__(self, game: "Monopoly", id: int, *, name: Optional[str] = None, money: int = 1500, pos: int = 0):
+    """View over the fields of a player in the game state"""
+
+    __slots__ = ("id", "game", "map", "name", "policy", "ownedSpaces", "_state", "_data", "_offsets", "_groups",
+                 "_stride")
+
+    pos = Field(_FIELD["pos"])
+    money = Field(_FIELD["money"])
+    dead = BoolField(_FIELD["dead"])
+    inJail = BoolField(_FIELD["inJail"])
+    jailTurnCount = Field(_FIELD["jailTurnCount"])
+    jailCards = Field(_FIELD["jailCards"])
+    rentMultiplier = Field(_FIELD["rentMultiplier"])
+
+    # Ownership aggregates, maintained by addSpace / removeSpace and the space level / mortgage setters
+    railroadCount = Field(_FIELD["railroadCount"])
+    companyCount = Field(_FIELD["companyCount"])
+    houseCount = Field(_FIELD["houseCount"])
+    hotelCount = Field(_FIELD["hotelCount"])
+    mortgageCount = Field(_FIELD["mortgageCount"])
+    monopolies = Field(_FIELD["monopolies"])  # Bit `gid` set when the whole group is owned
+
+    def __init__(self, game: "Monopoly", id: int, *, name: Optional[str] = None, money: int = 1500, pos: int = 0,
+                 state: Optional[GameState] = None):
         self.id = id
         self.game = game
+
+        state = state or game.state
+        index = id if state is game.state else 0
+
+        self._state = state
+        self._data = state.data
+        self._offsets = state.playerOffsets(index)
+        self._groups = state.groupOffset(index)
+        self._stride = state.playerCount
+
         self.money = money
-        self.dead = False
         self.pos = pos
 
         self.map = self.game.map
 
         self.ownedSpaces: List[Space] = []
 
-        self.rentMultiplier = 1
+        self.name = name
 
-        self.inJail = False
-        self.jailTurnCount = 0
+        # Takes the decisions instead of the renderer menus when set (bots)
+        self.policy: Optional["Policy"] = None
 
-        self.cards = []
+    @property
+    def deathRound(self) -> Optional[int]:
+        value = self._data[self._offsets[_FIELD["deathRound"]]]
 
-        self.name = name
+        return None if value == NONE else value
+
+    @deathRound.setter
+    def deathRound(self, value: Optional[int]):
+        self._state.write(self._offsets[_FIELD["deathRound"]], NONE if value is None else value)
+
+    @property
+    def groupCounts(self):
+        return [self._data[self._groups + gid * self._stride] for gid in range(len(TERRAIN_COUNT_BY_GROUPS))]
+
+    @property
+    def cards(self):
+        return ["get_out_jail"] * self.jailCards
 
     @property
     def renderer(self):
@@ -35,43 +98,103 @@ class Player:
 
     @property
     def ownedGroups(self):
-        return [gid for gid in range(8) if self.hasGroup(gid)]
+        monopolies = self.monopolies
+
+        return [gid for gid in range(len(TERRAIN_COUNT_BY_GROUPS)) if monopolies >> gid & 1]
 
     def message(self, _message: str, **kwargs: object):
         return self.renderer.playerMessage(self, _message, **kwargs)
 
+    def emit(self, type: int, a: int = 0, b: int = 0):
+        journal = self.game.journal
+
+        # The debug player has its own state, it isn't journaled
+        if journal is not None and self.id >= 0:
+            journal.emit(type, self.id, a, b)
+
     def giveSpace(self, space: OwnableSpace):
         assert isinstance(space, OwnableSpace)
 
-        if space not in self.ownedSpaces:
-            self.ownedSpaces.append(space)
+        space.setOwner(self)
+
+    def addSpace(self, space: OwnableSpace):
+        # Called by OwnableSpace.setOwner
+        insort(self.ownedSpaces, space, key=ownedSpaceKey)
+
+        self._countSpace(space, 1)
+
+    def removeSpace(self, space: OwnableSpace):
+        # Called by OwnableSpace.setOwner
+        self.ownedSpaces.remove(space)
+
+        self._countSpace(space, -1)
+
+    def _countSpace(self, space: OwnableSpace, n: int):
+        type = space.type
+
+        if type == "terrain":
+            gid = space.group_id
+            i = self._groups + gid * self._stride
+
+            self._state.write(i, self._data[i] + n)
+
+            if self._data[i] == TERRAIN_COUNT_BY_GROUPS[gid]:
+                self.monopolies |= 1 << gid
+            else:
+                self.monopolies &= ~(1 << gid)
+
+            self.countLevel(space.level, n)
+        elif type == "railroad":
+            self.railroadCount += n
+        elif type == "company":
+            self.companyCount += n
 
-        space.owner = self
+        if space.mortgage:
+            self.mortgageCount += n
+
+    def countLevel(self, level: int, n: int):
+        # Called by Space_Terrain.level when the buildings of an owned terrain change
+        if level == HOTEL_LEVEL:
+            self.hotelCount += n
+        else:
+            self.houseCount += level * n
 
     def countHouses(self):
-        return sum(s.houseCount for s in self.ownedSpaces if s.type == "terrain")
+        return self.houseCount
 
     def countHotels(self):
-        return sum(s.hotelCount for s in self.ownedSpaces if s.type == "terrain")
+        return self.hotelCount
 
     def hasGroup(self, gid: int):
         if gid < 0 or gid >= len(TERRAIN_COUNT_BY_GROUPS):
             return False
 
-        terrainCount = sum(s.type == "terrain" and s.group_id ==
-                           gid for s in self.ownedSpaces)
-
-        assert terrainCount <= TERRAIN_COUNT_BY_GROUPS[gid]
-
-        return terrainCount == TERRAIN_COUNT_BY_GROUPS[gid]
+        return self.monopolies >> gid & 1 == 1
 
     def multiplyRent(self, multiplier: int):
         self.rentMultiplier = multiplier
 
+        self.emit(EVENT_MULTIPLIER, multiplier)
+
     def countSpaceType(self, spaceType: type):
+        if spaceType is Space_Railroad:
+            return self.railroadCount
+
+        if spaceType is Space_Company:
+            return self.companyCount
+
+        if spaceType is Space_Terrain:
+            return sum(self.groupCounts)
+
+        if spaceType is OwnableSpace:
+            return len(self.ownedSpaces)
+
         return sum(isinstance(s, spaceType) for s in self.ownedSpaces)
 
     def ask(self, question: str, yn: bool = True):
+        if self.policy is not None:
+            return self.policy.answer(self, question, yn)
+
         return self.renderer.askPlayerQuestion(self, question, yn)
 
     def render(self, score: Optional[int] = None, double: Optional[bool] = None):
@@ -84,20 +207,16 @@ class Player:
 
         self.render(score, double)
 
-        space = None
+        pos = None
 
-        while self.space != space:
-            space = self.space
+        while self.pos != pos and not self.dead:
+            pos = self.pos
 
             if self.do_space(score):
                 do_render = True
 
-        self.rentMultiplier = 1
-
-        if self.money < 0:
-            self.dead = True
-
-            raise NotImplementedError("Player dead")
+        if self.rentMultiplier != 1:
+            self.multiplyRent(1)
 
         return do_render
 
@@ -112,6 +231,30 @@ class Player:
 
         self.pos = pos
 
+        self.emit(EVENT_MOVE, pos)
+
+    def moveTo(self, pos: int, passGo: bool):
+        if passGo:
+            self.receiveSalary()
+
+        self.pos = pos
+
+        self.emit(EVENT_MOVE, pos)
+
+    def applyCard(self, card: "Card", moves: Optional[Tuple[Tuple[int, bool], ...]]):
+        """Apply a drawn card, `moves`: its row of the board move tables (destination and passGo by position)"""
+
+        if card.effect is not None:
+            card.effect(self)
+
+        if card.move is None:
+            return
+
+        if card.move[0] == "jail":
+            self.goJail()
+        else:
+            self.moveTo(*moves[self.pos])
+
     def gotoTerrain(self, gid: int, id: int):
         self.goto(self.map.getTerrain(gid, id).pos)
 
@@ -119,23 +262,12 @@ class Player:
         self.goto(self.map.getRailroad(id).pos)
 
     def getNearest(self, type: str):
-        pos = self.pos + 1
-
-        while pos != self.pos:
-            s = self.map.getSpace(pos)
-
-            if s.type == type:
-                return s
-
-            pos += 1
+        return self.map.getNearest(self.pos, type)
 
     def gotoNearest(self, type: str):
         if s := self.getNearest(type):
             self.goto(s.pos)
 
-    def gotoTerrain(self, gid: int, id: int):
-        self.goto(self.map.getTerrain(gid, id).pos)
-
     def advance(self, score: int):  # sourcery skip: class-extract-method
         self.pos += score
 
@@ -144,6 +276,8 @@ class Player:
 
             self.receiveSalary()
 
+        self.emit(EVENT_MOVE, self.pos)
+
     def moveBack(self, score: int):
         self.advance(-score)
 
@@ -153,107 +287,238 @@ class Player:
     def give(self, amount: int):
         self.money += amount
 
+        self.emit(EVENT_CASH, 0, amount)
+
     def pay(self, amount: int, to: Optional["Player"] = None):
+        """Pay `amount` (to the bank, or to another player), returns what the creditor actually received"""
+
+        if self.money < amount:
+            self.raiseCash(amount)
+
+        # A bankrupt player's creditor only gets the money the player had (and its properties)
+        paid = min(amount, max(self.money, 0))
+
         self.money -= amount
 
-        # TODO: check enough money
+        self.emit(EVENT_CASH, 0, -amount)
+
+        if to:
+            to.give(paid)
 
         if self.money < 0:
-            self.dead = True
+            self.bankrupt(to)
 
-            raise NotImplementedError("Player dead")
+        return paid
 
-        if to:
-            to.give(amount)
+    def raiseCash(self, amount: int):
+        """Mortgage properties (without buildings, the cheapest first) until the player has `amount` money"""
+
+        spaces = [s for s in self.ownedSpaces if self.canMortgage(s)]
+
+        for space in sorted(spaces, key=lambda s: s.mortgagePrice):
+            if self.money >= amount:
+                break
+
+            self.menuMortgage(space)
+
+    def bankrupt(self, creditor: Optional["Player"] = None):
+        if self.dead:
+            return
+
+        self.dead = True
+        self.deathRound = self.game.roundCount
+
+        self.emit(EVENT_BANKRUPT, self.deathRound)
+
+        self.message("playerBankrupt")
+
+        for space in [*self.ownedSpaces]:
+            if creditor:
+                creditor.giveSpace(space)
+            else:
+                space.setOwner(None)
+                space.mortgage = False
+
+                self.emit(EVENT_MORTGAGE, space.pos, 0)
+
+                if space.type == "terrain":
+                    space.level = 0
+
+                    self.emit(EVENT_BUILD, space.pos, 0)
 
     def giveCard(self, card: str):
-        self.cards.append(card)
+        assert card == "get_out_jail"
+
+        self.jailCards += 1
+
+        self.emit(EVENT_JAIL_CARD, self.jailCards)
 
     def menu(self, canRollDices: bool = True, do_render: bool = True, has_played: bool = True):
+        if self.policy is not None:
+            action, args = self.policy.decide(self, self.getLegalActions(canRollDices, has_played))
+
+            return action, list(args)
+
         return self.renderer.playerMenu(self, canRollDices, do_render, has_played)
 
+    def getMenuItems(self, canRollDices: bool = True, has_played: bool = True):
+        items = []
+
+        if not self.inJail:
+            if canRollDices:
+                items.append("rollDices")
+            else:
+                items.append("finish")
+
+        if self.inJail and not has_played:
+            if self.jailTurnCount < 3:
+                items.append("rollDicesJail")
+
+            items.append("payJail")
+
+            if self.jailCards:
+                items.append("jailCard")
+        elif self.inJail and has_played:
+            items.append("finish")
+
+        if has_played and isinstance(self.space, OwnableSpace) and self.space.forSale and self.money >= self.space.price:
+            items.append("buy")
+
+        if len(self.ownedSpaces) != 0:
+            if any(self.canMortgage(s) for s in self.ownedSpaces):
+                items.append("mortgage")
+
+            if self.mortgageCount and any(self.canRemoveMortgage(s) for s in self.ownedSpaces):
+                items.append("removeMortgage")
+
+            if self.monopolies:
+                items.append("buyHousesOrHotels")
+
+            if self.houseCount or self.hotelCount:
+                items.append("saleHousesOrHotels")
+
+        return items
+
+    def getLegalActions(self, canRollDices: bool = True, has_played: bool = True):
+        actions = []
+
+        for item in self.getMenuItems(canRollDices, has_played):
+            if item == "mortgage":
+                actions.extend((item, [s]) for s in self.ownedSpaces if self.canMortgage(s))
+            elif item == "removeMortgage":
+                actions.extend((item, [s]) for s in self.ownedSpaces if self.canRemoveMortgage(s))
+            elif item == "buyHousesOrHotels":
+                for gid in self.ownedGroups:
+                    for s in self.map.getGroupTerrains(gid):
+                        if s.canBuyHouse and self.money >= s.housePrice:
+                            actions.append((item, [s, False]))
+                        elif s.canBuyHotel and self.money >= s.hotelPrice:
+                            actions.append((item, [s, True]))
+            elif item == "saleHousesOrHotels":
+                continue  # Not implemented yet
+            else:
+                actions.append((item, []))
+
+        return actions
+
     def goJail(self):
         self.inJail = True
 
-        self.pos = 10  # JAIL
+        self.pos = self.map.jailPos
+
+        self.emit(EVENT_MOVE, self.pos)
+        self.emit(EVENT_JAIL, 1, self.jailTurnCount)
 
     def getOutJail(self, score: int, double: int):
         self.inJail = False
         self.jailTurnCount = 0
 
+        self.emit(EVENT_JAIL, 0, 0)
+
         return self.play(score, double)
 
+    def canMortgage(self, space: OwnableSpace):
+        """Only undeveloped properties: the houses / hotel of a terrain must be sold first"""
+
+        return not space.mortgage and not (space.type == "terrain" and space.level)
+
     def menuMortgage(self, space: Space):
         assert space.mortgage == False
 
+        if not self.canMortgage(space):
+            self.message("mortgageFail", space=space)
+
+            return
+
         space.mortgage = True
 
+        self.emit(EVENT_MORTGAGE, space.pos, 1)
+
         self.message("playerMortgageProp", space=space)
 
         self.give(space.mortgagePrice)
 
+    def canRemoveMortgage(self, space: OwnableSpace):
+        return space.mortgage and self.money >= space.removeMortgagePrice
+
     def menuRemoveMortgage(self, space: Space):
         assert space.mortgage == True
 
+        if not self.canRemoveMortgage(space):
+            self.message("removeMortgageFail", space=space)
+
+            return
+
+        self.pay(space.removeMortgagePrice)
+
         space.mortgage = False
 
+        self.emit(EVENT_MORTGAGE, space.pos, 0)
+
         self.message("playerRemoveMortgageProp", space=space)
 
-        self.give(space.removeMortgagePrice)
+    def askBuy(self, space: OwnableSpace):
+        if self.policy is not None:
+            return self.policy.buy(self, space)
+
+        return self.renderer.askPlayerBuy(self, space)
 
     def buySpace(self):
         assert isinstance(self.space, OwnableSpace)
 
-        if self.ask(self.lang("askBuy", space=self.space)):
-            self.pay(self.space.price)
+        if self.askBuy(self.space):
+            space = self.space
 
-            self.ownedSpaces.append(self.space)
+            self.pay(space.price)
 
-            self.ownedSpaces.sort(
-                key=lambda s: s.pos if s.type == "terrain" else 99 + len(s.type) + s.id)
+            if not self.dead:
+                self.emit(EVENT_BUY, space.pos, space.price)
 
-            self.space.owner: Player = self
+                space.setOwner(self)
 
     def doAction(self, action: str, args: List[Any], vars: Dict[str, Any]):
         assert action in {"mortgage", "removeMortgage", "buy", "rollDices", "rollDicesJail",
                           "payJail", "jailCard", "finish", "pass", "buyHousesOrHotels", "saleHousesOrHotels"}
 
         if action == "buy":
-            if self.ask(self.renderer.lang("askBuy", space=self.space)):
-                self.pay(self.space.price)
-
-                self.ownedSpaces.append(self.space)
-
-                self.ownedSpaces.sort(
-                    key=lambda s: s.pos if s.type == "terrain" else 99 + len(s.type) + s.id)
-
-                self.space.owner: Player = self
+            self.buySpace()
 
         elif action == "buyHousesOrHotels":
             self.menuBuyHousesOrHotels(args)
         elif action == "saleHousesOrHotels":
             self.message("notImplemented")
 
-        elif action == "jail_card":
-            assert self.inJail
-
-            score, double = self.game.rollDices(self)
-
-            self.getOutJail(score, double)
-
-            if double:
-                vars["double_count"] += 1
-
-            vars["play_again"] = double
+        elif action == "jailCard":
+            self.menuJailCard(vars)
 
         elif action == "mortgage":
-            space = self.menuArgsGetSpace(args, vars)
+            space = self.menuArgsGetSpace(args)
             self.menuMortgage(space)
 
         elif action == "payJail":
             self.menuPayJail(vars)
         elif action == "removeMortgage":
-            space = self.menuArgsGetSpace(args, vars)
+            space = self.menuArgsGetSpace(args)
             self.menuRemoveMortgage(space)
 
         elif action == "rollDices":
@@ -276,6 +541,8 @@ class Player:
         else:
             self.jailTurnCount += 1
 
+            self.emit(EVENT_JAIL, 1, self.jailTurnCount)
+
         vars["play_again"] = False
         vars["has_played"] = True
 
@@ -291,7 +558,7 @@ class Player:
 
         vars["do_render"] = self.play(score, double)
 
-        if vars["double_count"] == 3:
+        if vars["double_count"] == 3 and not self.dead:
             self.message("playerGoJailDouble")
 
             self.goJail()
@@ -311,6 +578,20 @@ class Player:
 
         self.message("hadPaidJail")
 
+        self.menuLeaveJail(vars)
+
+    def menuJailCard(self, vars: Dict[str, Any]):
+        assert self.inJail
+
+        assert self.jailCards
+
+        self.jailCards -= 1
+
+        self.emit(EVENT_JAIL_CARD, self.jailCards)
+
+        self.menuLeaveJail(vars)
+
+    def menuLeaveJail(self, vars: Dict[str, Any]):
         score, double = self.game.rollDices(self)
 
         self.getOutJail(score, double)
@@ -319,6 +600,7 @@ class Player:
             vars["double_count"] += 1
 
         vars["play_again"] = double
+        vars["has_played"] = True
 
     def menuBuyHousesOrHotels(self, args):
         assert len(args) == 2
@@ -356,4 +638,4 @@ class Player:
 
 class DebugPlayer(Player):
     def __init__(self, game: "Monopoly"):
-        super().__init__(game, -1, name="\033[3mDEBUG PLAYER\033[0m")
+        super().__init__(game, -1, name="\033[3mDEBUG PLAYER\033[0m", state=GameState(1))
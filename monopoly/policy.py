@@ -0,0 +1,174 @@
+"""
+Player policies.
+
+A policy takes the decisions of a player instead of the keyboard: `Player.menu`,
+`Player.ask` and `Player.askBuy` delegate to it when the player has one. The
+menu choices (buy, mortgage which space, build where, how to leave jail) come
+as the legal actions of `Player.getLegalActions`.
+
+Games can also be stepped (`Monopoly.steps`), which yields a `DecisionRequest`
+at each decision. `playGames` steps many games together and hands all their
+pending requests to `Policy.decideBatch` at once, so an expensive evaluator runs
+once per batch instead of once per decision.
+"""
+
+import random as _random
+
+from .headless import Action, Decision, STRATEGIES, DEFAULT_STRATEGY, MAX_ROUNDS, reserveDecision, playDecision
+from .headless import MONEY_RESERVE
+
+from typing import Optional, List, Dict, Any, Sequence, Union
+
+
+class DecisionRequest:
+    """A pending `Player.menu` call of a stepped game"""
+
+    __slots__ = ("game", "player", "canRollDices", "doRender", "hasPlayed", "vars", "_actions")
+
+    def __init__(self, game: "Monopoly", player: "Player", canRollDices: bool, doRender: bool, hasPlayed: bool,
+                 vars: Optional[Dict[str, Any]] = None, actions: Optional[List[Action]] = None):
+        self.game = game
+        self.player = player
+        self.canRollDices = canRollDices
+        self.doRender = doRender
+        self.hasPlayed = hasPlayed
+
+        # Variables of the turn in progress (read only)
+        self.vars = vars
+
+        # Legal actions, listed on first access if not given
+        self._actions: Optional[List[Action]] = actions
+
+    @property
+    def actions(self) -> List[Action]:
+        if self._actions is None:
+            self._actions = self.player.getLegalActions(self.canRollDices, self.hasPlayed)
+
+        return self._actions
+
+    def answer(self):
+        """Ask the player (its policy or the renderer menu)"""
+
+        if self.player.policy is not None:
+            action, args = self.player.policy.decideRequest(self)
+
+            return action, list(args)
+
+        return self.player.menu(self.canRollDices, self.doRender, self.hasPlayed)
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} {self.player!r} {len(self.actions)} actions>"
+
+
+class Policy:
+    def decide(self, player: "Player", actions: List[Action]) -> Action:
+        """Choose one of the legal `actions` of the player menu"""
+
+        raise NotImplementedError()
+
+    def decideRequest(self, request: DecisionRequest) -> Action:
+        """Answer a request of a stepped game, override to use the game / turn context"""
+
+        return self.decide(request.player, request.actions)
+
+    def decideBatch(self, requests: Sequence[DecisionRequest]) -> List[Action]:
+        """Answer many requests (possibly from different games) at once, override to evaluate them together"""
+
+        return [self.decideRequest(r) for r in requests]
+
+    def buy(self, player: "Player", space: "OwnableSpace"):
+        # The decision was taken when "buy" was chosen in the menu
+        return True
+
+    def answer(self, player: "Player", question: str, yn: bool = True) -> Union[bool, str]:
+        raise RuntimeError(f"{self.__class__.__name__} can't answer free questions")
+
+
+class FunctionPolicy(Policy):
+    """Policy of a headless decision function (see `monopoly.headless`)"""
+
+    def __init__(self, decision: Decision):
+        self.decision = decision
+
+    def decide(self, player: "Player", actions: List[Action]):
+        return self.decision(player, actions)
+
+
+class HeuristicPolicy(FunctionPolicy):
+    """Buy, build and lift mortgages while keeping `reserve` money"""
+
+    def __init__(self, reserve: int = MONEY_RESERVE):
+        super().__init__(reserveDecision(reserve))
+
+        self.reserve = reserve
+
+
+class PassivePolicy(FunctionPolicy):
+    """Never buy anything"""
+
+    def __init__(self):
+        super().__init__(playDecision)
+
+
+class RandomPolicy(Policy):
+    """Any legal action, at random"""
+
+    def __init__(self, seed: Optional[int] = None):
+        self.random = _random.Random(seed)
+
+    def decide(self, player: "Player", actions: List[Action]):
+        return self.random.choice(actions)
+
+
+def strategyPolicy(name: str = DEFAULT_STRATEGY):
+    """Policy of one of the named headless strategies"""
+
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {name!r} (expected one of {', '.join(STRATEGIES)})")
+
+    return FunctionPolicy(STRATEGIES[name])
+
+
+def playGames(games: Sequence["Monopoly"], policy: Optional[Policy] = None, maxRounds: int = MAX_ROUNDS):
+    """
+    Play games side by side: each step, all their pending decisions are answered with one `decideBatch`
+    call per policy (the player policy, else `policy`, else the renderer menu). Returns the GameResults.
+    """
+
+    steps = [game.steps(maxRounds) for game in games]
+
+    pending: Dict[int, DecisionRequest] = {}
+
+    for i, s in enumerate(steps):
+        request = next(s, None)
+
+        if request is not None:
+            pending[i] = request
+
+    while pending:
+        batches: Dict[int, List[int]] = {}
+        policies: Dict[int, Policy] = {}
+
+        answers: Dict[int, Any] = {}
+
+        for i, request in pending.items():
+            p = request.player.policy or policy
+
+            if p is None:  # Renderer menu (or headless decision function)
+                answers[i] = request.answer()
+                continue
+
+            batches.setdefault(id(p), []).append(i)
+            policies[id(p)] = p
+
+        for key, indexes in batches.items():
+            for i, action in zip(indexes, policies[key].decideBatch([pending[i] for i in indexes])):
+                answers[i] = action
+
+        for i, action in answers.items():
+            try:
+                pending[i] = steps[i].send(action)
+            except StopIteration:
+                del pending[i]
+
+    return [game.result() for game in games]
@@ -102,14 +102,14 @@ class DiceRenderer:
     def eraseLine(self):
         self.renderer.write(CSI + "2K")
 
-    def render(self):
+    def render(self, end: str = ""):
         self.erase()
-        self.renderer.writeFlush(f"\r{self.player!r}: {self.dices[0].value}  {self.dices[1].value}")
+        self.renderer.write(f"\r{self.player!r}: {self.dices[0].value}  {self.dices[1].value}{end}")
+
+        self.renderer.flushFrame()  # Each animation step is a frame
     
     def finish(self):
-        self.render()
-
-        self.renderer.writeFlush("\r\n\n")
+        self.render("\r\n\n")
     
     # def renderScore(self):  ## MOVED TO Renderer.renderPlayer
     #     stdout.write(f"\n\nScore: {self.dices.sum}\n")
@@ -119,12 +119,23 @@ class DiceRenderer:
 
 
 class Renderer:
+    animateDices = True  # Roll the dices with the (blocking) animation, else from the game dice tape
+
+    # Opt-in: output kept in a frame buffer, written to `sOut` with one write and flush by `flushFrame` (at the end of
+    # a turn, a dice frame, or before waiting for input), the other flushes only end the line. Unbuffered, the output is
+    # written as it comes and the flushes flush `sOut`
+    frameBuffered = False
+
     def __init__(self, game: "Monopoly", sIn = stdin, sOut = stdout, sErr = stderr):
         self.game = game
         self.lang = self.game.lang
         self.sIn = sIn
         self.sOut = sOut
-        self.sErr = stderr
+        self.sErr = sErr
+
+        self.frame: List[str] = []
+
+        self.board: Optional["BoardView"] = None
     
     @property
     def map(self):
@@ -135,7 +146,10 @@ class Renderer:
     # OUT
 
     def writeOut(self, s: str):  # sourcery skip: remove-unnecessary-cast
-        self.sOut.write(str(s))
+        if self.frameBuffered:
+            self.frame.append(str(s))
+        else:
+            self.sOut.write(str(s))
     
     write = writeOut
     
@@ -145,10 +159,24 @@ class Renderer:
     writeLn = writeLnOut
 
     def flushOut(self):
-        self.sOut.flush()
+        if not self.frameBuffered:
+            self.sOut.flush()
     
     flush = flushOut
 
+    def flushFrame(self):
+        """Write the frame buffer with a single write, and flush"""
+
+        if self.board is not None:
+            self.write(self.board.draw())
+
+        if self.frame:
+            self.sOut.write("".join(self.frame))
+
+            self.frame.clear()
+
+        self.sOut.flush()
+
     def writeFlush(self, s: str):
         self.writeOut(s)
 
@@ -216,6 +244,11 @@ class Renderer:
     def flushIn(self):
         while kbhit():
             self.getch()
+
+    def readLine(self, prompt: str = ""):
+        self.flushFrame()
+
+        return input(prompt)
         
     # -------- render --------
 
@@ -233,30 +266,66 @@ class Renderer:
         
         self.writeLnFlush()
     
-    def renderSpace(self, space: Space):  # sourcery skip: assign-if-exp, switch
+    def spaceColor(self, space: Space):  # sourcery skip: assign-if-exp, switch
+        """Render code of a space (empty if the space isn't colored)"""
+
         if space.type == "railroad":
-            return BOLD + str(space) + RESET
+            return BOLD
 
         if space.type == "company":
             assert space.id in {0, 1}
 
             if space.id == 0:
-                return COLOR_TO_CODE["native_yellow"] + str(space) + RESET
+                return COLOR_TO_CODE["native_yellow"]
             else:
-                return COLOR_TO_CODE["bright_white"] + str(space) + RESET
+                return COLOR_TO_CODE["bright_white"]
 
         if space.type == "terrain":
             assert space.color in COLOR_TO_CODE
 
-            return COLOR_TO_CODE[space.color] + str(space) + RESET
+            return COLOR_TO_CODE[space.color]
+
+        return ""
+
+    def renderSpace(self, space: Space):
+        color = self.spaceColor(space)
 
-        return str(space)
+        return color + str(space) + RESET if color else str(space)
     
     def renderGroup(self, gid: int):
         color = self.map.getGroupColor(gid)
 
         return COLOR_TO_CODE[color] + self.lang("group", color = self.lang["colors"][color]) + RESET
 
+    def showBoard(self, rows: Optional[int] = None, columns: Optional[int] = None):
+        """
+        Draw the board above the text (`rows` / `columns`: the terminal size), redrawn at each frame. Returns False
+        (and the text goes on alone) when the terminal is too small for it
+        """
+
+        from .board import BoardView
+
+        try:
+            self.board = BoardView(self, rows, columns)
+        except ValueError:
+            return False
+
+        self.write(self.board.open())
+
+        self.flushFrame()
+
+        return True
+
+    def hideBoard(self):
+        if self.board is None:
+            return
+
+        self.write(self.board.close())
+
+        self.board = None
+
+        self.flushFrame()
+
     # Messages
     
     def playerMessage(self, _player: Player, _message: str, **kwargs):
@@ -277,6 +346,16 @@ class Renderer:
     def startPlayerTurn(self, player: Player):
         self.writeLnFlush("=====================[ " + str(player) + " ]=====================")
 
+    def endPlayerTurn(self, player: Player):
+        self.writeLn()
+
+        self.flushFrame()
+
+    def playerWin(self, player: Player):
+        self.writeLn(self.lang("playerWin", player=player))
+
+        self.flushFrame()
+
     # Questions
 
     def renderPlayerQuestion(self, player: Player, question: str, yn: bool = True):
@@ -285,7 +364,7 @@ class Renderer:
         if yn:
             self.write("[yn] ")
         
-        self.flush()
+        self.flushFrame()
 
     def answerYesNo(self):
         answer = b"\x00"
@@ -305,7 +384,9 @@ class Renderer:
         
         answer = b"\x00"
 
-        self.writeFlush(f"{question} [{min}-{max}] ")
+        self.write(f"{question} [{min}-{max}] ")
+
+        self.flushFrame()
 
         while not (answer.isdigit() and int(answer) >= min and int(answer) <= max):
             self.flushIn()
@@ -327,13 +408,18 @@ class Renderer:
         answer = None
 
         while not answer:
-            answer = input().strip()
+            answer = self.readLine().strip()
         
         return answer
 
+    def askPlayerBuy(self, player: Player, space: OwnableSpace):
+        return self.askPlayerQuestion(player, self.lang("askBuy", space=space))
+
     def waitPress(self, prompt: Optional[str] = None):
         if prompt:
-            self.writeFlush(prompt)
+            self.write(prompt)
+
+        self.flushFrame()
         
         self.flushIn()
 
@@ -430,7 +516,7 @@ class Renderer:
             elif opt == "give":
                 pl = self.selectPlayerMenu(self.game.debugPlayer, "Give to")
 
-                amount = input("Amount: M").strip()
+                amount = self.readLine("Amount: M").strip()
 
                 try:
                     amount = int(amount)
@@ -444,7 +530,7 @@ class Renderer:
             elif opt == "steal":
                 pl = self.selectPlayerMenu(self.game.debugPlayer, "Steal to")
 
-                amount = input("Amount: M").strip()
+                amount = self.readLine("Amount: M").strip()
 
                 try:
                     amount = int(amount)
@@ -541,7 +627,7 @@ class Renderer:
             elif opt == "teleportPlayer":
                 player = self.selectPlayerMenu(self.game.debugPlayer, "Player")
 
-                pos = input("Pos: ").strip()
+                pos = self.readLine("Pos: ").strip()
 
                 try:
                     pos = int(pos)
@@ -564,42 +650,9 @@ class Renderer:
                 self.playerMessage(self.game.debugPlayer, "notImplemented")
 
     def playerMenu(self, player: Player, canRollDices: bool, do_render: bool, has_played: bool):
-        items = []
+        items = player.getMenuItems(canRollDices, has_played)
         args = []
 
-        if not player.inJail:
-            if canRollDices:
-                items.append("rollDices")
-            else:
-                items.append("finish")
-
-        if player.inJail and not has_played:
-            if player.jailTurnCount < 3:
-                items.append("rollDicesJail")
-
-            items.append("payJail")
-
-            if "jail_card" in player.cards:
-                items.append("jailCard")
-        elif player.inJail and has_played:
-            items.append("finish")
-
-        if has_played and isinstance(player.space, OwnableSpace) and player.space.forSale:
-            items.append("buy")
-
-        if len(player.ownedSpaces) != 0:
-            if any((not s.mortgage) for s in player.ownedSpaces):
-                items.append("mortgage")
-
-            if any(s.mortgage for s in player.ownedSpaces):
-                items.append("removeMortgage")
-
-            if player.ownedGroups:
-                items.append("buyHousesOrHotels")
-
-            if any(s.houseCount + s.hotelCount for s in player.ownedSpaces if s.type == "terrain"):
-                items.append("saleHousesOrHotels")
-
         if do_render:
             self.renderPlayer(player)
 
@@ -618,7 +671,7 @@ class Renderer:
         opt = self.renderMenu(player, self.lang["menu"]["menu"], items, zero)
 
         if opt == "mortgage":
-            items = [*(s for s in player.ownedSpaces if not s.mortgage)]
+            items = [*(s for s in player.ownedSpaces if player.canMortgage(s))]
 
             items = [*((sp, self.lang["menu"]("mortgageProp", space=sp)) for sp in items)]
 
@@ -630,7 +683,7 @@ class Renderer:
             args.append(prop)
 
         elif opt == "removeMortgage":
-            items = [*(s for s in player.ownedSpaces if s.mortgage)]
+            items = [*(s for s in player.ownedSpaces if player.canRemoveMortgage(s))]
 
             items = [*((sp, self.lang["menu"]("removeMortgageProp", space=sp)) for sp in items)]
 
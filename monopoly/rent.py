@@ -0,0 +1,108 @@
+from .space import (
+    SpaceDefinition,
+    RAILROAD_RENTS, COMPANY_RENT_MULTIPLIERS, TERRAIN_COUNT_BY_GROUPS, HOTEL_LEVEL, SPACE_COUNT
+)
+
+from typing import Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, rents are then computed with plain Python
+    np = None
+
+
+DEFAULT_SCORE = 7  # Most probable dice score, used for companies when no score is given
+
+
+class RentTable:
+    """Integer rent tables of a board, built once with the Board and shared by all the games"""
+
+    def __init__(self, definitions: Tuple[SpaceDefinition, ...]):
+        self.types: Tuple[str, ...] = tuple(d.type for d in definitions)
+
+        self.terrainRents: Tuple[Tuple[int, ...], ...] = tuple(d.rents for d in definitions)
+
+        self.groups: Tuple[int, ...] = tuple(d.group_id if d.type == "terrain" else -1 for d in definitions)
+
+        if np is not None:
+            self.rentMatrix = np.zeros((SPACE_COUNT, HOTEL_LEVEL + 1), dtype=np.int64)
+
+            for d in definitions:
+                if d.type == "terrain":
+                    self.rentMatrix[d.pos] = d.rents
+
+            self.isTerrain = np.array([t == "terrain" for t in self.types])
+            self.isRailroad = np.array([t == "railroad" for t in self.types])
+            self.isCompany = np.array([t == "company" for t in self.types])
+
+            self.prices = np.array([d.price if d.price is not NotImplemented else 0 for d in definitions])
+            self.housePrices = np.array([d.housePrice for d in definitions])
+
+            self.groupIndex = np.array([max(g, 0) for g in self.groups])
+            self.groupSizes = np.array(TERRAIN_COUNT_BY_GROUPS)
+
+            # Indexed by owned count, 0 owned gives no rent
+            self.railroadRents = np.array([0, *RAILROAD_RENTS])
+            self.companyMultipliers = np.array([0, *COMPANY_RENT_MULTIPLIERS])
+
+
+class RentEngine:
+    """Rent queries of a game, reading the live ownership counters of the players"""
+
+    def __init__(self, game: "Monopoly"):
+        self.game = game
+        self.table: RentTable = game.map.board.rentTable
+
+    def getRent(self, pos: int, score: int = DEFAULT_SCORE):
+        """Rent paid by a non-owner landing on `pos` (0 when nothing is due)"""
+
+        space = self.game.map.spaces[pos]
+
+        owner = getattr(space, "owner", None)
+
+        if owner is None or space.mortgage:
+            return 0
+
+        type = self.table.types[pos]
+
+        if type == "terrain":
+            return self.table.terrainRents[pos][space.level]
+
+        if type == "railroad":
+            return RAILROAD_RENTS[owner.railroadCount - 1]
+
+        return score * COMPANY_RENT_MULTIPLIERS[owner.companyCount - 1]
+
+    def getRents(self, score: int = DEFAULT_SCORE):
+        """Rent for every space of the board given the current state, as an array with NumPy"""
+
+        if np is None:
+            return [self.getRent(pos, score) for pos in range(SPACE_COUNT)]
+
+        table = self.table
+        state = self.game.state
+
+        data = np.frombuffer(state.data, dtype=np.int32)
+
+        def block(field: str):
+            start, count = state.block(field)
+
+            return data[start:start + count]
+
+        owners, levels, mortgages = block("owner"), block("level"), block("mortgage") != 0
+
+        playerCount = state.playerCount
+
+        # One extra (empty) count for unowned spaces
+        railroadCounts = np.append(block("railroadCount"), 0)
+        companyCounts = np.append(block("companyCount"), 0)
+
+        ownerIndex = np.where(owners >= 0, owners, playerCount)
+
+        terrain = table.rentMatrix[np.arange(SPACE_COUNT), levels]
+
+        rents = np.where(table.isTerrain, terrain, 0)
+        rents = np.where(table.isRailroad, table.railroadRents[railroadCounts[ownerIndex]], rents)
+        rents = np.where(table.isCompany, score * table.companyMultipliers[companyCounts[ownerIndex]], rents)
+
+        return np.where((owners >= 0) & ~mortgages, rents, 0)
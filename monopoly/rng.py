@@ -0,0 +1,107 @@
+import random as _random
+
+from typing import Optional, MutableSequence, List, Any
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, streams fall back to random.Random
+    np = None
+
+
+STREAMS = ("dices", "cards")
+
+
+class RandomStream:
+    def __init__(self, seed: Any = None, *, generator: Optional["np.random.Generator"] = None):
+        if generator is not None:
+            self.generator = generator
+        elif np is not None:
+            self.generator = np.random.default_rng(seed)
+        else:
+            self.generator = _random.Random(seed)
+
+        self.numpy = np is not None and isinstance(self.generator, np.random.Generator)
+
+    def randint(self, a: int, b: int):
+        if self.numpy:
+            return int(self.generator.integers(a, b + 1))
+
+        return self.generator.randint(a, b)
+
+    def random(self):
+        return self.generator.random()
+
+    def shuffle(self, seq: MutableSequence[Any]):
+        self.generator.shuffle(seq)
+
+    def integers(self, low: int, high: int, size: int):
+        """Return `size` integers in [low, high], as an array with NumPy, as a list otherwise"""
+
+        if self.numpy:
+            return self.generator.integers(low, high + 1, size)
+
+        randint = self.generator.randint
+
+        return [randint(low, high) for _ in range(size)]
+
+    def getState(self):
+        if self.numpy:
+            return self.generator.bit_generator.state
+
+        return self.generator.getstate()
+
+    def setState(self, state: Any):
+        if self.numpy:
+            self.generator.bit_generator.state = state
+        else:
+            self.generator.setstate(state)
+
+
+class GameRandom:
+    """
+    Random streams of a game, one per source of randomness (see `STREAMS`).
+
+    A game is fully identified by its `seed` and `stream`: two GameRandom with
+    the same pair produce the same values. Different `stream` values of the same
+    seed are non-overlapping substreams (PCG64 jump-ahead), so N workers can each
+    use their own index without any coordination.
+    """
+
+    def __init__(self, seed: Optional[int] = None, stream: int = 0):
+        if seed is None:
+            seed = np.random.SeedSequence().entropy if np is not None else _random.SystemRandom().getrandbits(128)
+
+        self.seed = seed
+        self.stream = stream
+
+        if np is not None:
+            children = np.random.SeedSequence(seed).spawn(len(STREAMS))
+
+            streams = [
+                RandomStream(generator=np.random.Generator(np.random.PCG64(s).jumped(stream)))
+                for s in children
+            ]
+        else:
+            streams = [RandomStream(f"{seed}/{stream}/{name}") for name in STREAMS]
+
+        self.dices, self.cards = streams
+
+    def jumped(self, jumps: int = 1):
+        return GameRandom(self.seed, self.stream + jumps)
+
+    def spawn(self, n: int) -> List["GameRandom"]:
+        """The `n` consecutive streams starting with this one (e.g. one per game of a worker chunk)"""
+
+        return [self.jumped(i) for i in range(n)]
+
+    def getState(self):
+        return self.dices.getState(), self.cards.getState()
+
+    def setState(self, state: Any):
+        dices, cards = state
+
+        self.dices.setState(dices)
+        self.cards.setState(cards)
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} seed={self.seed} stream={self.stream}>"
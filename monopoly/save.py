@@ -0,0 +1,364 @@
+"""
+Binary save format.
+
+A save is a header (format version, game settings, player names), the random
+streams state, the raw game state buffer and the turn in progress (its player
+and variables, to resume it where it stopped, or the player of the turn just
+over to resume with the next one). Checkpoints are deltas against the
+previous save or checkpoint: the changed state words, the dice tape cursor, the
+random streams state only when it changed and the turn in progress.
+"""
+
+import struct
+
+from array import array
+
+from .monopoly import Monopoly
+from .dice     import DiceTape
+from .rng      import RandomStream
+
+from typing import Optional, Any, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, deltas are then computed with plain Python
+    np = None
+
+
+MAGIC = b"MNPL"
+DELTA_MAGIC = b"MNPD"
+
+SAVE_VERSION = 4
+
+TURN_VERSION = 3  # First version with the turn in progress (older saves resume at the start of a round)
+TURN_OVER_VERSION = 4  # First version with the turn just over (older saves have none)
+
+FLAG_HEADLESS = 1
+FLAG_TAPE = 2
+
+DELTA_DICES = 1
+DELTA_CARDS = 2
+
+_header = struct.Struct("<4sBBB")
+_deltaHeader = struct.Struct("<4sIHB")
+_numpyState = struct.Struct("<16s16sBI")
+_u16 = struct.Struct("<H")
+_u32 = struct.Struct("<I")
+_i32 = struct.Struct("<i")
+_turn = struct.Struct("<b???B?")  # Player (-1 between rounds), over, play again, do render, double count, has played
+_turnV3 = struct.Struct("<b??B?")  # Without over (-1 between turns)
+
+
+class Reader:
+    def __init__(self, raw: bytes):
+        self.raw = memoryview(raw)
+        self.pos = 0
+
+    def take(self, n: int):
+        chunk = self.raw[self.pos:self.pos + n]
+
+        if len(chunk) != n:
+            raise ValueError("Truncated save")
+
+        self.pos += n
+
+        return chunk
+
+    def unpack(self, s: struct.Struct):
+        return s.unpack(self.take(s.size))
+
+    def string(self):
+        n, = self.unpack(_u16)
+
+        return None if n == 0xFFFF else bytes(self.take(n)).decode("utf8")
+
+    def integer(self):
+        n, = self.unpack(_u16)
+
+        return int.from_bytes(self.take(n), "little", signed=True)
+
+    def bytes(self):
+        n, = self.unpack(_u32)
+
+        return bytes(self.take(n))
+
+
+def _packString(s: Optional[str]):
+    if s is None:
+        return _u16.pack(0xFFFF)
+
+    raw = s.encode("utf8")
+
+    return _u16.pack(len(raw)) + raw
+
+
+def _packInteger(n: int):
+    raw = n.to_bytes((n.bit_length() + 8) // 8, "little", signed=True)
+
+    return _u16.pack(len(raw)) + raw
+
+
+def _packBytes(raw: bytes):
+    return _u32.pack(len(raw)) + raw
+
+
+def packRandomState(stream: RandomStream, state: Any):
+    if stream.numpy:
+        inner = state["state"]
+
+        return _numpyState.pack(inner["state"].to_bytes(16, "little"), inner["inc"].to_bytes(16, "little"),
+                                state["has_uint32"], state["uinteger"])
+
+    version, internal, gauss = state
+
+    return struct.pack("<B?d", version, gauss is not None, gauss or 0.) + array("I", internal).tobytes()
+
+
+def unpackRandomState(stream: RandomStream, raw: bytes):
+    if stream.numpy:
+        st, inc, hasUint32, uinteger = _numpyState.unpack(raw)
+
+        return {
+            "bit_generator": "PCG64",
+            "state": {"state": int.from_bytes(st, "little"), "inc": int.from_bytes(inc, "little")},
+            "has_uint32": hasUint32,
+            "uinteger": uinteger,
+        }
+
+    version, hasGauss, gauss = struct.unpack_from("<B?d", raw)
+
+    internal = array("I")
+    internal.frombytes(raw[struct.calcsize("<B?d"):])
+
+    return version, tuple(internal), gauss if hasGauss else None
+
+
+def _randomBlock(game: Monopoly):
+    """(tape cursor, packed dice stream state, packed card stream state)"""
+
+    dices = game.random.dices
+
+    if game.diceTape is not None:
+        diceState, cursor = game.diceTape.getState()
+    else:
+        diceState, cursor = dices.getState(), -1
+
+    return cursor, packRandomState(dices, diceState), packRandomState(game.random.cards, game.random.cards.getState())
+
+
+def _restoreRandomBlock(game: Monopoly, cursor: int, diceState: Optional[bytes], cardState: Optional[bytes]):
+    if cardState is not None:
+        game.random.cards.setState(unpackRandomState(game.random.cards, cardState))
+
+    if game.diceTape is not None:
+        if diceState is None:
+            diceState = game.diceTape.getState()[0]
+        else:
+            diceState = unpackRandomState(game.random.dices, diceState)
+
+        game.diceTape.setState((diceState, cursor))
+    elif diceState is not None:
+        game.random.dices.setState(unpackRandomState(game.random.dices, diceState))
+
+
+def dumpGame(game: Monopoly):
+    flags = (FLAG_HEADLESS if game.headless else 0) | (FLAG_TAPE if game.diceTape is not None else 0)
+
+    cursor, diceState, cardState = _randomBlock(game)
+
+    return b"".join((
+        _header.pack(MAGIC, SAVE_VERSION, flags, game.playerCount),
+        _packString(game.map.name),
+        _packString(game.lang._name),
+        *(_packString(p.name) for p in game.players),
+        _packInteger(game.random.seed),
+        _u32.pack(game.random.stream),
+        _i32.pack(cursor),
+        _packBytes(diceState),
+        _packBytes(cardState),
+        _packBytes(game.state.tobytes()),
+        _packTurn(game),
+    ))
+
+
+def _packTurn(game: Monopoly):
+    if game.turn is None:
+        return _turn.pack(-1, False, False, False, 0, False)
+
+    player, vars = game.turn
+
+    if vars is None:
+        return _turn.pack(player.id, True, False, False, 0, False)
+
+    return _turn.pack(player.id, False, vars["play_again"], vars["do_render"], vars["double_count"],
+                      vars["has_played"])
+
+
+def _unpackTurn(game: Monopoly, reader: Reader, version: int = SAVE_VERSION):
+    if version >= TURN_OVER_VERSION:
+        player, over, playAgain, doRender, doubleCount, hasPlayed = reader.unpack(_turn)
+    else:
+        over = False
+        player, playAgain, doRender, doubleCount, hasPlayed = reader.unpack(_turnV3)
+
+    if player < 0:
+        game.turn = None
+    elif over:
+        game.turn = (game.players[player], None)
+    else:
+        game.turn = (game.players[player], {
+            "play_again": playAgain, "double_count": doubleCount, "do_render": doRender, "has_played": hasPlayed
+        })
+
+
+def loadGame(raw: bytes, **kwargs: Any):
+    """
+    Rebuild a game from `dumpGame` output, `kwargs` are passed to `Monopoly` (e.g. `decision`).
+    `game.turn` is the turn in progress (or just over) when saved, to resume it: `game.run(game.turn)`.
+    """
+
+    reader = Reader(raw)
+
+    magic, version, flags, playerCount = reader.unpack(_header)
+
+    if magic != MAGIC:
+        raise ValueError("Not a Monopoly save")
+
+    if not TURN_VERSION - 1 <= version <= SAVE_VERSION:
+        raise ValueError(f"Unsupported save version {version} (expected {SAVE_VERSION})")
+
+    map, lang = reader.string(), reader.string()
+
+    names = [reader.string() for _ in range(playerCount)]
+
+    seed = reader.integer()
+    stream, = reader.unpack(_u32)
+    cursor, = reader.unpack(_i32)
+
+    diceState, cardState, state = reader.bytes(), reader.bytes(), reader.bytes()
+
+    game = Monopoly(playerCount=playerCount, lang=lang, map=map, headless=bool(flags & FLAG_HEADLESS),
+                    seed=seed, stream=stream, **kwargs)
+
+    for p, name in zip(game.players, names):
+        p.name = name
+
+    game.state.frombytes(state)
+    game.resync()
+
+    # Roll the dices like the saved game: from a tape, or straight from the stream
+    if not flags & FLAG_TAPE:
+        game.diceTape = None
+    elif game.diceTape is None:
+        game.diceTape = DiceTape(game.dices, rng=game.random.dices)
+
+    _restoreRandomBlock(game, cursor, diceState, cardState)
+
+    if version >= TURN_VERSION:
+        _unpackTurn(game, reader, version)
+
+    return game
+
+
+def saveGame(game: Monopoly, path: str):
+    with open(path, "wb") as f:
+        f.write(dumpGame(game))
+
+
+def openGame(path: str, **kwargs: Any):
+    with open(path, "rb") as f:
+        return loadGame(f.read(), **kwargs)
+
+
+class Checkpointer:
+    """Incremental checkpoints of a game: each one only holds what changed since the previous one"""
+
+    def __init__(self, game: Monopoly):
+        self.game = game
+
+        self.seq = 0
+
+        self.base = array("i", game.state.data)
+        self.lastRandom: Tuple[Any, ...] = _randomBlock(game)
+
+    def snapshot(self):
+        """Full save, later checkpoints are relative to it"""
+
+        self.seq = 0
+
+        self.base = array("i", self.game.state.data)
+        self.lastRandom = _randomBlock(self.game)
+
+        return dumpGame(self.game)
+
+    def checkpoint(self):
+        data = self.game.state.data
+
+        if np is not None:
+            indexes = np.flatnonzero(np.frombuffer(data, dtype=np.int32) != np.frombuffer(self.base, dtype=np.int32))
+
+            changed = indexes.astype(np.uint16).tobytes()
+            values = np.frombuffer(data, dtype=np.int32)[indexes].tobytes()
+            count = len(indexes)
+        else:
+            indexes = [i for i, (a, b) in enumerate(zip(data, self.base)) if a != b]
+
+            changed = array("H", indexes).tobytes()
+            values = array("i", (data[i] for i in indexes)).tobytes()
+            count = len(indexes)
+
+        self.base[:] = data
+
+        cursor, diceState, cardState = _randomBlock(self.game)
+        _, lastDices, lastCards = self.lastRandom
+
+        flags = (DELTA_DICES if diceState != lastDices else 0) | (DELTA_CARDS if cardState != lastCards else 0)
+
+        self.lastRandom = cursor, diceState, cardState
+
+        self.seq += 1
+
+        return b"".join((
+            _deltaHeader.pack(DELTA_MAGIC, self.seq, count, flags),
+            changed,
+            values,
+            _i32.pack(cursor),
+            _packBytes(diceState) if flags & DELTA_DICES else b"",
+            _packBytes(cardState) if flags & DELTA_CARDS else b"",
+            _packTurn(self.game),
+        ))
+
+
+def applyCheckpoint(game: Monopoly, delta: bytes):
+    """Apply a `Checkpointer.checkpoint` delta to a game restored from the previous save / checkpoint"""
+
+    reader = Reader(delta)
+
+    magic, seq, count, flags = reader.unpack(_deltaHeader)
+
+    if magic != DELTA_MAGIC:
+        raise ValueError("Not a Monopoly checkpoint")
+
+    indexes = array("H")
+    indexes.frombytes(reader.take(2 * count))
+
+    values = array("i")
+    values.frombytes(reader.take(4 * count))
+
+    data = game.state.data
+
+    for i, v in zip(indexes, values):
+        data[i] = v
+
+    cursor, = reader.unpack(_i32)
+
+    diceState = reader.bytes() if flags & DELTA_DICES else None
+    cardState = reader.bytes() if flags & DELTA_CARDS else None
+
+    game.resync()
+
+    _restoreRandomBlock(game, cursor, diceState, cardState)
+
+    _unpackTurn(game, reader)
+
+    return seq
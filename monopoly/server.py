@@ -0,0 +1,619 @@
+"""
+Game server: many games in one process, each player on a TCP connection.
+
+The server runs on asyncio, without a thread per connection. Each game is
+stepped (`Monopoly.steps`) in its own task. A decision of a remote player
+sends that player the menu of its legal actions and awaits the answer line,
+without blocking the other games. The game output (`Renderer` writing to a
+`TableOutput`) is sent to all the players of the game.
+
+Clients are line based (`telnet` / `nc`): a name, then the number of a menu item.
+A bot plays for the players who leave, or don't answer in time, until they come
+back with `/resume <game> <player>`.
+
+Instead of a name, `/watch [game]` follows the text of a game and `/sync [game]`
+its state with the sync protocol (see `monopoly.sync`), the last started game by
+default. The spectators of a game share the same encoded frames (`Channel`).
+
+With a `GameStore`, each game is committed at the end of every turn (and at the
+first decision of a turn that didn't start from a commit), and the unfinished
+games are resumed where they were committed when the server starts again.
+"""
+
+import asyncio
+import socket
+
+from .monopoly import Monopoly
+from .renderer import Renderer
+from .policy   import Policy, DecisionRequest, HeuristicPolicy
+from .headless import Action, MAX_ROUNDS
+from .journal  import Journal
+from .sync     import SyncSource, splitFrames, FRAME_RESYNC
+from .store    import GameStore
+from .lang     import DEFAULT_LANG
+from .map      import DEFAULT_MAP
+
+from typing import Optional, List, Set, Dict, Callable, Sequence
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7878
+
+DECISION_TIMEOUT = 120.  # Seconds before a bot plays for a silent player
+NAME_TIMEOUT = 60.
+
+MAX_LINE = 256
+MAX_PENDING_LINES = 16  # Older input lines are dropped
+MAX_WRITE_BUFFER = 1 << 20  # Connections reading slower than the game are closed
+SPECTATOR_HIGH_WATER = 1 << 16  # Spectators with more pending output skip the frames
+SPECTATOR_SEND_BUFFER = 1 << 16  # Kernel send buffer of the spectators, so the frames they can't take are skipped
+
+SKIPPED = b"...\r\n"  # Sent to a text spectator in place of the frames it skipped
+
+
+def encodeText(s: str):
+    return s.replace("\n", "\r\n").encode()
+
+
+def actionLabel(player: "Player", action: Action):
+    lang = player.game.lang
+
+    name, args = action
+
+    if name == "mortgage":
+        return lang["menu"]("mortgageProp", space=args[0])
+
+    if name == "removeMortgage":
+        return lang["menu"]("removeMortgageProp", space=args[0])
+
+    if name == "buyHousesOrHotels":
+        space, hotel = args
+
+        return f"{lang['menu']['buyHousesOrHotels']}: {space.render} ({lang['hotel' if hotel else 'house']})"
+
+    return lang["menu"](name, player=player)
+
+
+class Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+        self.lines: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+
+        self.closed = False
+
+    async def readLoop(self):
+        """Queue the input lines until the connection ends"""
+
+        try:
+            while not self.closed:
+                line = await self.reader.readline()
+
+                if not line:
+                    break
+
+                if self.lines.qsize() >= MAX_PENDING_LINES:
+                    self.lines.get_nowait()
+
+                self.lines.put_nowait(line[:MAX_LINE].decode(errors="replace").strip())
+        except (ConnectionError, ValueError):  # ValueError: line over the reader limit
+            pass
+        finally:
+            self.closed = True
+
+            self.lines.put_nowait(None)
+
+    @property
+    def buffered(self):
+        """Bytes written but not sent yet"""
+
+        return self.writer.transport.get_write_buffer_size()
+
+    def setSendBuffer(self, size: int):
+        """Limit the data buffered by the kernel (the frames that don't fit stay in the transport buffer)"""
+
+        sock = self.writer.get_extra_info("socket")
+
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, size)
+
+    def write(self, data: bytes):
+        if self.closed:
+            return
+
+        self.writer.write(data)
+
+        if self.buffered > MAX_WRITE_BUFFER:
+            self.close()
+
+    def send(self, s: str):
+        self.write(encodeText(s))
+
+    async def ask(self, prompt: str, timeout: Optional[float] = None):
+        """Send a prompt and wait for the next line (the lines typed before are dropped)"""
+
+        while not self.lines.empty():
+            if self.lines.get_nowait() is None:
+                raise ConnectionError("Connection closed")
+
+        self.send(prompt)
+
+        if not self.closed:
+            try:
+                await self.writer.drain()
+            except ConnectionError:
+                self.close()
+
+        line = await asyncio.wait_for(self.lines.get(), timeout)
+
+        if line is None:
+            raise ConnectionError("Connection closed")
+
+        return line
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+
+            self.lines.put_nowait(None)
+
+        self.writer.close()
+
+
+class TableOutput:
+    """Output stream of a game renderer, sent to all the players of the table on flush"""
+
+    def __init__(self, table: "Table"):
+        self.table = table
+
+        self.buffer: List[str] = []
+
+    def write(self, s: str):
+        self.buffer.append(s)
+
+    def flush(self):
+        if not self.buffer:
+            return
+
+        data = encodeText("".join(self.buffer))
+
+        self.buffer.clear()
+
+        for conn in self.table.connections:
+            conn.write(data)
+
+        self.table.watchers.publish(data)
+
+
+class Channel:
+    """
+    Frames sent to the spectators of a game: each frame is encoded once and the same bytes are written to all the
+    subscribers. A subscriber with more than `SPECTATOR_HIGH_WATER` bytes pending skips the frames, then gets
+    `catchUp(frame)` (computed once for all the subscribers catching up) instead of the next one.
+    """
+
+    def __init__(self, catchUp: Callable[[bytes], bytes]):
+        self.catchUp = catchUp
+
+        # Connection: skipped frames since the last one written
+        self.subscribers: Dict[Connection, bool] = {}
+
+        self.published = 0
+        self.skipped = 0
+
+    def subscribe(self, conn: Connection, first: bytes = b""):
+        conn.write(first)
+
+        self.subscribers[conn] = False
+
+    def unsubscribe(self, conn: Connection):
+        self.subscribers.pop(conn, None)
+
+    def publish(self, frame: bytes):
+        if not frame:
+            return
+
+        self.published += 1
+
+        recovery: Optional[bytes] = None
+
+        for conn, lagging in list(self.subscribers.items()):
+            if conn.closed:
+                del self.subscribers[conn]
+                continue
+
+            if conn.buffered > SPECTATOR_HIGH_WATER:
+                self.subscribers[conn] = True
+                self.skipped += 1
+                continue
+
+            if lagging:
+                if recovery is None:
+                    recovery = self.catchUp(frame)
+
+                conn.write(recovery)
+
+                self.subscribers[conn] = False
+            else:
+                conn.write(frame)
+
+    def close(self):
+        """Catch the lagging subscribers up a last time, and close"""
+
+        recovery: Optional[bytes] = None
+
+        for conn, lagging in self.subscribers.items():
+            if lagging:
+                if recovery is None:
+                    recovery = self.catchUp(b"")
+
+                conn.write(recovery)
+
+            conn.close()
+
+        self.subscribers.clear()
+
+
+class TableRenderer(Renderer):
+    animateDices = False  # The animation would block the other games
+
+    frameBuffered = True  # One message per frame to every connection of the table
+
+    def __init__(self, game: "Monopoly", table: "Table"):
+        super().__init__(game, sIn=None, sOut=table.output)
+
+        self.table = table
+
+    def endPlayerTurn(self, player: "Player"):
+        super().endPlayerTurn(player)
+
+        self.table.commit()
+
+
+class RemotePolicy(Policy):
+    """Marks a player played over a connection: its decisions are asked by the table"""
+
+    def __init__(self, connection: Optional[Connection] = None):
+        # None while the seat is free (a bot plays until a player takes it)
+        self.connection = connection
+
+    def decide(self, player: "Player", actions: List[Action]):
+        raise RuntimeError("The decisions of a remote player are asked by its table")
+
+
+class Table:
+    def __init__(self, server: "GameServer", index: int, connections: List[Connection], names: Sequence[str] = (),
+                 restore: bool = False):
+        self.server = server
+        self.index = index
+        self.key = str(index)  # In the store
+        self.connections = connections
+
+        self.output = TableOutput(self)
+
+        # Text spectators, and spectators of the state (sync protocol, a snapshot replaces the skipped events)
+        self.watchers = Channel(lambda frame: SKIPPED + frame)
+        self.syncWatchers = Channel(lambda frame: self.sync.snapshot())
+
+        seats: List[Policy] = [RemotePolicy(c) for c in connections]
+        seats.extend(RemotePolicy() for _ in range(server.seats - len(connections)))
+
+        options = dict(journal=Journal(), policy=seats + [server.bot] * server.bots,
+                       renderer=lambda game: TableRenderer(game, self))
+
+        if restore:  # Resumed from the turn in progress (or just over) when committed, see `Monopoly.turn`
+            self.game, _ = server.store.load(self.key, **options)
+        else:
+            self.game = Monopoly(playerCount=server.playerCount, lang=server.lang, map=server.map,
+                                 seed=server.seed, stream=index, **options)
+
+            for player, name in zip(self.game.players, names):
+                player.name = name or None
+
+        self.sync = SyncSource(self.game)
+
+        # Turn count of the last commit (the state at the end of a turn is the one at the start of the next one)
+        self.committedTurn: Optional[int] = None
+
+    def commit(self, player: Optional["Player"] = None):
+        """Commit the game to the store (if any), `player`: the turn in progress"""
+
+        store = self.server.store
+
+        if store is None:
+            return
+
+        self.committedTurn = self.game.turnCount
+
+        store.commit(self.key, self.game, None if player is None else player.id)
+
+    def claim(self, conn: Connection, seat: int):
+        """Give a free remote seat to a connection"""
+
+        if not 0 <= seat < self.game.playerCount:
+            return False
+
+        policy = self.game.players[seat].policy
+
+        if not isinstance(policy, RemotePolicy) or policy.connection is not None and not policy.connection.closed:
+            return False
+
+        if policy.connection in self.connections:
+            self.connections.remove(policy.connection)
+
+        policy.connection = conn
+
+        self.connections.append(conn)
+
+        return True
+
+    def watch(self, conn: Connection, sync: bool = False):
+        conn.setSendBuffer(SPECTATOR_SEND_BUFFER)
+
+        if sync:
+            self.syncWatchers.subscribe(conn, self.sync.snapshot())
+        else:
+            self.watchers.subscribe(conn)
+
+    def publishEvents(self):
+        if self.syncWatchers.subscribers:  # The events of the snapshot of a new subscriber may be sent again
+            self.syncWatchers.publish(self.sync.poll())
+
+    async def serveSync(self, conn: Connection):
+        """Answer the resync requests of a sync spectator until it leaves"""
+
+        buffer = bytearray()
+
+        while not conn.closed:
+            data = await conn.reader.read(MAX_LINE)
+
+            if not data:
+                break
+
+            buffer += data
+
+            for kind, seq, _, _ in splitFrames(buffer):
+                if kind != FRAME_RESYNC:
+                    raise ConnectionError(f"Unexpected frame kind {kind}")
+
+                conn.write(self.sync.since(seq) if 0 <= seq <= self.sync.sent else self.sync.snapshot())
+
+    async def decide(self, request: DecisionRequest):
+        player = request.player
+        policy = player.policy
+
+        self.publishEvents()
+
+        if self.game.turnCount != self.committedTurn:  # First decision of a turn not committed at its start
+            self.commit(player)
+
+        conn = policy.connection if isinstance(policy, RemotePolicy) else None
+
+        if conn is None:
+            await asyncio.sleep(0)  # Let the other games run between the bot decisions
+
+            return self.server.bot.decideRequest(request) if isinstance(policy, RemotePolicy) else request.answer()
+
+        renderer = self.game.renderer
+
+        if request.doRender:
+            renderer.renderPlayer(player)
+
+        if player.inJail:
+            renderer.playerMessage(player, "maxJailTurn" if player.jailTurnCount >= 3 else "playerInJail")
+
+        renderer.flushFrame()
+
+        actions = request.actions
+
+        menu = "".join(f"    {i + 1}.\t{actionLabel(player, a)}\n" for i, a in enumerate(actions))
+
+        prompt = f"\n{self.game.lang['menu']['menu']}:\n{menu}\n{player!r}: [1-{len(actions)}] "
+
+        try:
+            while True:
+                answer = await conn.ask(prompt, self.server.timeout)
+
+                if answer.isdigit() and 1 <= int(answer) <= len(actions):
+                    return actions[int(answer) - 1]
+        except (asyncio.TimeoutError, ConnectionError):
+            conn.close()
+
+            self.connections.remove(conn)
+
+            policy.connection = None  # Free until the player comes back
+
+            return self.server.bot.decideRequest(request)
+
+    async def play(self):
+        steps = self.game.steps(self.server.maxRounds, self.game.turn)
+
+        try:
+            request = next(steps)
+
+            while True:
+                request = steps.send(await self.decide(request))
+        except StopIteration:
+            if self.server.store is not None:
+                self.server.store.finish(self.key, self.game)
+        finally:
+            self.game.renderer.flushFrame()
+            self.publishEvents()
+
+            for conn in self.connections:
+                conn.close()
+
+            self.watchers.close()
+            self.syncWatchers.close()
+
+            del self.server.tables[self.index]
+            self.server.finished += 1
+
+        return self.game.result()
+
+
+class GameServer:
+    def __init__(self, *, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, playerCount: int = 4, bots: int = 0,
+                 lang: str = DEFAULT_LANG, map: str = DEFAULT_MAP, seed: Optional[int] = None,
+                 maxRounds: Optional[int] = MAX_ROUNDS, timeout: Optional[float] = DECISION_TIMEOUT,
+                 store: Optional[GameStore] = None):
+        if not 0 <= bots < playerCount:
+            raise ValueError(f"A game of {playerCount} players needs at least one remote player")
+
+        self.host = host
+        self.port = port
+        self.playerCount = playerCount
+        self.bots = bots
+        self.lang = lang
+        self.map = map
+        self.seed = seed
+        self.maxRounds = maxRounds
+        self.timeout = timeout
+        self.store = store
+
+        self.bot = HeuristicPolicy()
+
+        # Players waiting for their table to be full
+        self.waiting: List[Connection] = []
+        self.names: List[str] = []
+
+        self.tables: Dict[int, Table] = {}
+        self.tasks: Set[asyncio.Task] = set()
+
+        self.started = 0
+        self.finished = 0
+
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def seats(self):
+        """Remote players per table"""
+
+        return self.playerCount - self.bots
+
+    async def start(self):
+        if self.store is not None:
+            self.resumeGames()
+
+        self.server = await asyncio.start_server(self.handle, self.host, self.port, limit=MAX_LINE * 4)
+
+        self.port = self.server.sockets[0].getsockname()[1]  # When started on port 0
+
+        return self.server
+
+    async def serve(self):
+        if self.server is None:
+            await self.start()
+
+        async with self.server:
+            await self.server.serve_forever()
+
+    def close(self):
+        if self.server is not None:
+            self.server.close()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        conn = Connection(reader, writer)
+
+        try:
+            conn.send("Name: ")
+
+            line = (await asyncio.wait_for(reader.readline(), NAME_TIMEOUT))[:MAX_LINE].decode(errors="replace").strip()
+
+            command, _, arg = line.partition(" ")
+
+            if command == "/resume":
+                index, _, seat = arg.strip().partition(" ")
+
+                table = self.findTable(index) if index else None
+
+                if table is None or not seat.strip().isdigit() or not table.claim(conn, int(seat) - 1):
+                    conn.send("No free seat\n")
+                    return
+
+                await conn.readLoop()
+            elif command in ("/watch", "/sync"):
+                table = self.findTable(arg.strip())
+
+                if table is None:
+                    conn.send("No game to watch\n")
+                    return
+
+                table.watch(conn, sync=command == "/sync")
+
+                await (table.serveSync(conn) if command == "/sync" else conn.readLoop())
+            else:
+                self.join(conn, line)
+
+                await conn.readLoop()
+        except (asyncio.TimeoutError, ConnectionError, ValueError):  # ValueError: line over the reader limit
+            pass
+        finally:
+            if conn in self.waiting:
+                i = self.waiting.index(conn)
+
+                del self.waiting[i], self.names[i]
+
+            conn.close()
+
+    def resumeGames(self):
+        """Start again the unfinished games of the store (their players can come back with /resume)"""
+
+        for key in self.store.unfinished():
+            if not key.isdigit() or int(key) in self.tables:
+                continue
+
+            self.startTable(Table(self, int(key), [], restore=True))
+
+    def startTable(self, table: Table):
+        self.started = max(self.started, table.index + 1)
+        self.tables[table.index] = table
+
+        task = asyncio.create_task(table.play())
+
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    def findTable(self, index: str):
+        """Game of an index, or the last started one"""
+
+        if index:
+            return self.tables.get(int(index)) if index.isdigit() else None
+
+        return self.tables[max(self.tables)] if self.tables else None
+
+    def join(self, conn: Connection, name: str):
+        self.waiting.append(conn)
+        self.names.append(name)
+
+        if len(self.waiting) < self.seats:
+            conn.send(f"Waiting for {self.seats - len(self.waiting)} player(s)...\n")
+            return
+
+        table = Table(self, self.started, self.waiting, self.names)
+
+        self.waiting, self.names = [], []
+
+        self.startTable(table)
+
+
+def serve(**kwargs):
+    """Run a game server until interrupted (see `GameServer` for the options)"""
+
+    server = GameServer(**kwargs)
+
+    async def main():
+        await server.start()
+
+        print(f"Monopoly server on {server.host}:{server.port} ({server.seats} players per game)")
+
+        await server.serve()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if server.store is not None:
+            server.store.close()
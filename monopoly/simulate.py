@@ -0,0 +1,284 @@
+"""
+Monte Carlo simulation runner.
+
+Complete headless games are spread over a process pool in chunks of games (one
+task per chunk keeps the IPC down to a seed range in and a `Report` out). Game
+`i` is played with `Monopoly(seed=seed, stream=i)`, so a report only depends on
+its settings, not on the number of workers.
+"""
+
+import os
+import random
+import time
+
+from collections import Counter
+from multiprocessing import Pool
+
+from .monopoly import Monopoly
+from .journal  import Journal, RECORD, EVENT_RENT
+from .headless import STRATEGIES, DEFAULT_STRATEGY, MAX_ROUNDS
+from .map      import DEFAULT_MAP
+from .space    import SPACE_COUNT
+
+from typing import Optional, Dict, Any, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, journals are then read with plain Python
+    np = None
+
+
+DEFAULT_GAME_COUNT = 1000
+
+if np is not None:
+    RECORD_DTYPE = np.dtype([("type", "u1"), ("player", "i1"), ("a", "<i2"), ("b", "<i4")])
+
+
+def rentsByPosition(raw: bytes):
+    """Total rent received on each space in a journal (only what a bankrupt player could pay)"""
+
+    if np is not None:
+        records = np.frombuffer(raw, dtype=RECORD_DTYPE)
+        rents = records[records["type"] == EVENT_RENT]
+
+        return np.bincount(rents["a"], weights=rents["b"], minlength=SPACE_COUNT).astype(np.int64).tolist()
+
+    totals = [0] * SPACE_COUNT
+
+    for type, _, pos, rent in RECORD.iter_unpack(raw):
+        if type == EVENT_RENT:
+            totals[pos] += rent
+
+    return totals
+
+
+class Report:
+    """Merged statistics of simulated games"""
+
+    def __init__(self, playerCount: int, strategies: Sequence[str], map: str = DEFAULT_MAP):
+        self.playerCount = playerCount
+        self.strategies = list(strategies)
+        self.map = map
+
+        self.seed: Optional[int] = None
+
+        self.games = 0
+        self.finished = 0  # Games with a winner before the round limit
+        self.draws = 0  # Games where the last players went bankrupt together
+
+        self.wins = [0] * playerCount
+        self.bankruptcies = [0] * playerCount
+        self.bankruptcyRounds = [0] * playerCount  # Sum, for the mean
+
+        self.lengths: Counter = Counter()  # Round count of the finished games
+        self.deathRounds: Counter = Counter()
+
+        self.rents = [0] * SPACE_COUNT
+
+        self.elapsed = 0.  # Sum of the worker times
+
+    def add(self, game: Monopoly, journal: Optional[Journal] = None):
+        self.games += 1
+
+        winner = game.winner
+
+        if winner is not None:
+            self.finished += 1
+            self.wins[winner.id] += 1
+            self.lengths[game.roundCount] += 1
+        elif all(p.dead for p in game.players):
+            self.draws += 1
+
+        for p in game.players:
+            if p.deathRound is not None:
+                self.bankruptcies[p.id] += 1
+                self.bankruptcyRounds[p.id] += p.deathRound
+                self.deathRounds[p.deathRound] += 1
+
+        if journal is not None:
+            for pos, rent in enumerate(rentsByPosition(journal.tobytes())):
+                self.rents[pos] += rent
+
+    def merge(self, other: "Report"):
+        assert other.playerCount == self.playerCount
+
+        self.games += other.games
+        self.finished += other.finished
+        self.draws += other.draws
+
+        for i in range(self.playerCount):
+            self.wins[i] += other.wins[i]
+            self.bankruptcies[i] += other.bankruptcies[i]
+            self.bankruptcyRounds[i] += other.bankruptcyRounds[i]
+
+        self.lengths.update(other.lengths)
+        self.deathRounds.update(other.deathRounds)
+
+        for pos in range(SPACE_COUNT):
+            self.rents[pos] += other.rents[pos]
+
+        self.elapsed += other.elapsed
+
+        return self
+
+    def meanLength(self):
+        return sum(r * n for r, n in self.lengths.items()) / self.finished if self.finished else None
+
+    def medianLength(self):
+        if not self.finished:
+            return None
+
+        seen = 0
+
+        for rounds in sorted(self.lengths):
+            seen += self.lengths[rounds]
+
+            if 2 * seen >= self.finished:
+                return rounds
+
+    def toDict(self):
+        return {
+            "map": self.map,
+            "seed": self.seed,
+            "playerCount": self.playerCount,
+            "games": self.games,
+            "finished": self.finished,
+            "draws": self.draws,
+            "players": [
+                {
+                    "strategy": self.strategies[i],
+                    "wins": self.wins[i],
+                    "winRate": self.wins[i] / self.games if self.games else 0.,
+                    "bankruptcies": self.bankruptcies[i],
+                    "meanBankruptcyRound":
+                        self.bankruptcyRounds[i] / self.bankruptcies[i] if self.bankruptcies[i] else None,
+                }
+                for i in range(self.playerCount)
+            ],
+            "meanLength": self.meanLength(),
+            "medianLength": self.medianLength(),
+            "lengths": dict(sorted(self.lengths.items())),
+            "deathRounds": dict(sorted(self.deathRounds.items())),
+            "rents": self.rents,
+            "elapsed": self.elapsed,
+        }
+
+    def format(self, names: Optional[Sequence[str]] = None):
+        """Text report, `names` are the space names (by position) for the rent table"""
+
+        lines = [
+            f"{self.games} games on {self.map} (seed {self.seed}), {self.finished} won, "
+            f"{self.games - self.finished - self.draws} stopped at the round limit, {self.draws} without winner",
+        ]
+
+        mean, median = self.meanLength(), self.medianLength()
+
+        if mean is not None:
+            lines.append(f"Game length: {mean:.1f} rounds on average, median {median}")
+
+        lines.append("")
+        lines.append(f"{'Player':<8}{'Strategy':<12}{'Win rate':>10}{'Bankrupt':>10}{'Round':>8}")
+
+        for i, p in enumerate(self.toDict()["players"]):
+            round = p["meanBankruptcyRound"]
+
+            lines.append(f"{i:<8}{p['strategy']:<12}{p['winRate']:>10.1%}"
+                         f"{p['bankruptcies'] / self.games if self.games else 0:>10.1%}"
+                         f"{'-' if round is None else f'{round:.1f}':>8}")
+
+        total = sum(self.rents)
+
+        if total:
+            lines.append("")
+            lines.append(f"{'Rent earned per game':<32}{'':>10}{'Share':>8}")
+
+            for pos in sorted(range(SPACE_COUNT), key=lambda pos: -self.rents[pos]):
+                if not self.rents[pos]:
+                    break
+
+                name = names[pos] if names else f"#{pos}"
+
+                lines.append(f"{name[:32]:<32}{self.rents[pos] / self.games:>10.1f}{self.rents[pos] / total:>8.1%}")
+
+        return "\n".join(lines)
+
+
+def seatStrategies(strategies: Sequence[str], playerCount: int):
+    """One strategy per seat, the list is repeated if shorter than the player count"""
+
+    strategies = list(strategies) or [DEFAULT_STRATEGY]
+
+    for name in strategies:
+        if name not in STRATEGIES:
+            raise ValueError(f"Unknown strategy {name!r} (expected one of {', '.join(STRATEGIES)})")
+
+    return [strategies[i % len(strategies)] for i in range(playerCount)]
+
+
+def runChunk(task: Tuple[Dict[str, Any], int, int]):
+    """Play the games `start` to `start + count` of a simulation (run in the workers)"""
+
+    config, start, count = task
+
+    startTime = time.perf_counter()
+
+    strategies = [STRATEGIES[name] for name in config["strategies"]]
+
+    def decision(player, actions):
+        return strategies[player.id](player, actions)
+
+    report = Report(config["playerCount"], config["strategies"], config["map"])
+
+    for i in range(start, start + count):
+        journal = Journal() if config["rents"] else None
+
+        game = Monopoly(playerCount=config["playerCount"], map=config["map"], headless=True, decision=decision,
+                        seed=config["seed"], stream=i, journal=journal)
+
+        game.simulate(config["maxRounds"])
+
+        report.add(game, journal)
+
+    report.elapsed = time.perf_counter() - startTime
+
+    return report
+
+
+def simulate(games: int = DEFAULT_GAME_COUNT, *, playerCount: int = 4, map: str = DEFAULT_MAP,
+             strategies: Sequence[str] = (DEFAULT_STRATEGY,), seed: Optional[int] = None,
+             maxRounds: int = MAX_ROUNDS, jobs: Optional[int] = None, chunkSize: Optional[int] = None,
+             rents: bool = True):
+    """Play `games` headless games over `jobs` processes (all the cores by default) and merge their reports"""
+
+    if seed is None:
+        seed = random.getrandbits(63)
+
+    config = {
+        "playerCount": playerCount,
+        "map": map,
+        "strategies": seatStrategies(strategies, playerCount),
+        "seed": seed,
+        "maxRounds": maxRounds,
+        "rents": rents,
+    }
+
+    jobs = jobs or os.cpu_count() or 1
+
+    if chunkSize is None:
+        # A few chunks per worker to balance the load, not too many to keep the IPC low
+        chunkSize = max(1, min(100, games // (8 * jobs)))
+
+    tasks = [(config, start, min(chunkSize, games - start)) for start in range(0, games, chunkSize)]
+
+    report = Report(playerCount, config["strategies"], map)
+    report.seed = seed
+
+    if jobs == 1:
+        for task in tasks:
+            report.merge(runChunk(task))
+    else:
+        with Pool(jobs) as pool:
+            for partial in pool.imap_unordered(runChunk, tasks):
+                report.merge(partial)
+
+    return report
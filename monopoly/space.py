@@ -1,9 +1,12 @@
 # from .player import Player
 from .chance import CHANCE_CARDS, COMMUNITY_CHEST_CARDS
+from .bundle import loadBundle
+from .state  import SPACE_FIELDS, NONE
+from .journal import EVENT_OWNER, EVENT_RENT, EVENT_BUILD, EVENT_CARD, DECK_CHANCE, DECK_COMMUNITY_CHEST
 
 # from .map import Map
 
-from typing import Optional, Callable
+from typing import Optional, NamedTuple, Tuple
 
 
 TAXE_AMOUNTS = [200, 100]
@@ -11,41 +14,70 @@ RAILROAD_PRICE = 200
 COMPANY_PRICE = 150
 
 RAILROAD_RENTS = [25, 50, 100, 200]
+COMPANY_RENT_MULTIPLIERS = [2, 10]
 
 MAX_HOTEL_COUNT = 1
 MAX_HOUSE_COUNT = 4
 
+HOTEL_LEVEL = MAX_HOUSE_COUNT + 1  # Building level of a terrain with a hotel (0 to 4 is the house count)
+
 RAILROAD_COUNT = len(RAILROAD_RENTS)
-COMPANY_COUNT = 2
+COMPANY_COUNT = len(COMPANY_RENT_MULTIPLIERS)
 
 
 SPACE_COUNT = 40
 
 
-terrain_data = {}
-
-with open("monopoly/assets/map/terrains", "r") as f:
-    for l in f:
-        l = l.strip()
+terrain_data = loadBundle().terrains
 
-        if l.startswith("#") or not l:
-            continue
+TERRAIN_COUNT_BY_GROUPS = [2, 3, 3, 3, 3, 3, 3, 2]
 
-        id, *data = l.split()
 
-        terrain_data[id] = data
+class SpaceDefinition(NamedTuple):
+    """Static (immutable) data of a space, shared by all the games"""
 
-TERRAIN_COUNT_BY_GROUPS = [2, 3, 3, 3, 3, 3, 3, 2]
+    cls: type
+    type: str
+    pos: int
+    id: int = 0
+    group_id: int = 0
+    price: int = NotImplemented
+    color: Optional[str] = None
+    rents: Tuple[int, ...] = ()
+    housePrice: int = 0
+    amount: int = 0
 
 
 class Space:
-    def __init__(self, map: "Map", type: str, pos: int):
+    """Per-game state of a space, the static data is read from its `definition`"""
+
+    __slots__ = ("map", "definition")
+
+    TYPE: str = NotImplemented
+
+    def __init__(self, map: "Map", definition: SpaceDefinition):
         self.map: "Map" = map
-        self.type: str = type
-        self.pos: int = pos
+        self.definition: SpaceDefinition = definition
+
+    @classmethod
+    def define(cls, pos: int):
+        return SpaceDefinition(cls, cls.TYPE, pos)
+
+    @property
+    def type(self):
+        return self.definition.type
+
+    @property
+    def pos(self):
+        return self.definition.pos
+
+    @property
+    def game(self) -> "Monopoly":
+        return self.map.game
 
-        self.game: "Monopoly" = self.map.game
-        self.renderer: "Renderer" = self.game.renderer
+    @property
+    def renderer(self) -> "Renderer":
+        return self.map.game.renderer
 
     @property
     def name(self):
@@ -66,32 +98,36 @@ class Space:
 
 
 class Space_Go(Space):
-    def __init__(self, map: "Map", pos: int):
-        super().__init__(map, "go", pos)
+    __slots__ = ()
+
+    TYPE = "go"
 
     def on_pass(self, player: "Player", score: Optional[int] = None):
         return False
 
 
 class Space_Jail(Space):
-    def __init__(self, map: "Map", pos: int):
-        super().__init__(map, "jail", pos)
+    __slots__ = ()
+
+    TYPE = "jail"
 
     def on_pass(self, player: "Player", score: Optional[int] = None):
         return False
 
 
 class Space_FreeParking(Space):
-    def __init__(self, map: "Map", pos: int):
-        super().__init__(map, "free_parking", pos)
+    __slots__ = ()
+
+    TYPE = "free_parking"
 
     def on_pass(self, player: "Player", score: Optional[int] = None):
         return False
 
 
 class Space_GoJail(Space):
-    def __init__(self, map: "Map", pos: int):
-        super().__init__(map, "go_jail", pos)
+    __slots__ = ()
+
+    TYPE = "go_jail"
 
     def on_pass(self, player: "Player", score: Optional[int] = None):
         self.renderer.playerMessage(player, "goJail")
@@ -102,15 +138,24 @@ class Space_GoJail(Space):
 
 
 class Space_Tax(Space):
-    def __init__(self, map: "Map", id: int, pos: int):
-        super().__init__(map, "tax", pos)
+    __slots__ = ()
+
+    TYPE = "tax"
 
+    @classmethod
+    def define(cls, pos: int, id: int):
         if id < 0 or id >= len(TAXE_AMOUNTS):
             raise ValueError()  # TODO
 
-        self.id: int = id
+        return SpaceDefinition(cls, cls.TYPE, pos, id=id, amount=TAXE_AMOUNTS[id])
 
-        self.amount: int = TAXE_AMOUNTS[self.id]
+    @property
+    def id(self):
+        return self.definition.id
+
+    @property
+    def amount(self):
+        return self.definition.amount
 
     @property
     def name(self):
@@ -124,15 +169,56 @@ class Space_Tax(Space):
         return True
 
 
+_FIELD = {f: i for i, f in enumerate(SPACE_FIELDS)}
+
+
 class OwnableSpace(Space):
-    def __init__(self, map: "Map", type: str, pos: int):
-        super().__init__(map, type, pos)
+    __slots__ = ("_state", "_data", "_offsets", "_players")
 
-        self.price: int = NotImplemented
+    def __init__(self, map: "Map", definition: SpaceDefinition):
+        super().__init__(map, definition)
 
-        self.owner: Optional["Player"] = None
+        state = map.game.state
 
-        self.mortgage: bool = False
+        self._state = state
+        self._data = state.data
+        self._offsets = state.spaceOffsets(definition.pos)
+        self._players = map.game.players
+
+    @property
+    def owner(self) -> Optional["Player"]:
+        id = self._data[self._offsets[_FIELD["owner"]]]
+
+        return None if id == NONE else self._players[id]
+
+    @owner.setter
+    def owner(self, owner: Optional["Player"]):
+        # Use setOwner to keep the ownership counters up to date
+        self._state.write(self._offsets[_FIELD["owner"]], NONE if owner is None else owner.id)
+
+    @property
+    def mortgage(self):
+        return self._data[self._offsets[_FIELD["mortgage"]]] != 0
+
+    @mortgage.setter
+    def mortgage(self, mortgage: bool):
+        i = self._offsets[_FIELD["mortgage"]]
+
+        if (self._data[i] != 0) == mortgage:
+            return
+
+        self._state.write(i, int(mortgage))
+
+        if (owner := self.owner) is not None:
+            owner.mortgageCount += 1 if mortgage else -1
+
+    @property
+    def id(self):
+        return self.definition.id
+
+    @property
+    def price(self):
+        return self.definition.price
 
     @property
     def mortgagePrice(self):
@@ -146,6 +232,24 @@ class OwnableSpace(Space):
     def forSale(self):
         return self.owner is None
 
+    def setOwner(self, owner: Optional["Player"]):
+        if owner is not None and owner.id < 0:  # The debug player stands for the bank
+            owner = None
+
+        if self.owner is owner:
+            return
+
+        if self.owner is not None:
+            self.owner.removeSpace(self)
+
+        self.owner = owner
+
+        if owner is not None:
+            owner.addSpace(self)
+
+        if self.game.journal is not None:
+            self.game.journal.emit(EVENT_OWNER, NONE if owner is None else owner.id, self.pos)
+
     def getRent(self, player: "Player", score: Optional[int] = None):
         raise NotImplementedError()
 
@@ -158,7 +262,8 @@ class OwnableSpace(Space):
                 self.game.renderer.playerMessage(
                     player, "buyRent", space=self, rent=rent)
 
-                player.pay(rent, self.owner)
+                # What the owner received: less than the rent when it bankrupts the player
+                player.emit(EVENT_RENT, self.pos, player.pay(rent, self.owner))
 
                 return True
         else:
@@ -181,25 +286,50 @@ class OwnableSpace(Space):
 
 
 class Space_Terrain(OwnableSpace):
-    def __init__(self, map: "Map", group_id: int, id: int, pos: int):
-        super().__init__(map, "terrain", pos)
+    __slots__ = ()
+
+    TYPE = "terrain"
+
+    # 0 to MAX_HOUSE_COUNT houses, HOTEL_LEVEL for a hotel
+    @property
+    def level(self):
+        return self._data[self._offsets[_FIELD["level"]]]
+
+    @level.setter
+    def level(self, level: int):
+        i = self._offsets[_FIELD["level"]]
 
-        self.group_id, self.id = group_id, id
+        old = self._data[i]
 
-        if self.fullId not in terrain_data:
-            raise ValueError(f"Terrain data not found for {self.fullId}")
+        self._state.write(i, level)
 
-        self.price: int = int(self.data[1])
+        if (owner := self.owner) is not None:
+            owner.countLevel(old, -1)
+            owner.countLevel(level, 1)
 
-        self.color: str = self.data[0]
+    @classmethod
+    def define(cls, pos: int, group_id: int, id: int):
+        fullId = f"{group_id + 1}:{id + 1}"
 
-        self.houseCount: int = 0
+        if fullId not in terrain_data:
+            raise ValueError(f"Terrain data not found for {fullId}")
 
-        self.hotelCount: int = 0
+        data = terrain_data[fullId]
+
+        return SpaceDefinition(cls, cls.TYPE, pos, id=id, group_id=group_id,
+                               price=data[1], color=data[0], rents=data[2:8], housePrice=data[8])
+
+    @property
+    def group_id(self):
+        return self.definition.group_id
+
+    @property
+    def color(self):
+        return self.definition.color
 
     @property
     def housePrice(self):
-        return int(self.data[8])
+        return self.definition.housePrice
 
     hotelPrice = housePrice
 
@@ -215,62 +345,89 @@ class Space_Terrain(OwnableSpace):
     def name(self):
         return self.map.data[self.type][self.group_id][self.id]
 
+    @property
+    def canBuyHouse(self):
+        return self.owner is not None and self.owner.hasGroup(self.group_id) \
+            and not self.hotelCount and self.houseCount < MAX_HOUSE_COUNT
+
+    @property
+    def canBuyHotel(self):
+        return self.owner is not None and self.owner.hasGroup(self.group_id) \
+            and self.hotelCount < MAX_HOTEL_COUNT and self.houseCount == MAX_HOUSE_COUNT
+
     def buyHouse(self):
-        if not self.owner.hasGroup(self.group_id):
+        if not self.canBuyHouse:
             return False
 
-        if self.houseCount < MAX_HOUSE_COUNT:
-            self.owner.pay(self.housePrice)
+        owner = self.owner
 
-            self.houseCount += 1
+        owner.pay(self.housePrice)
 
-            return True
+        if owner.dead:  # The terrain went back to the bank
+            return False
 
-        return False
+        self.houseCount += 1
+
+        owner.emit(EVENT_BUILD, self.pos, self.level)
+
+        return True
 
     def buyHotel(self):
-        if not self.owner.hasGroup(self.group_id):
+        if not self.canBuyHotel:
             return False
 
-        if self.hotelCount < MAX_HOTEL_COUNT and self.houseCount == 4:
-            self.owner.pay(self.hotelPrice)
+        owner = self.owner
 
-            self.hotelCount += 1
+        owner.pay(self.hotelPrice)
 
-            self.houseCount = 0
+        if owner.dead:  # The terrain went back to the bank
+            return False
 
-            return True
+        self.level = HOTEL_LEVEL
 
-        return False
+        owner.emit(EVENT_BUILD, self.pos, self.level)
 
-    def getRent(self, player: "Player", score: Optional[int] = None):
-        rents = [*map(int, self.data[2:8])]
-
-        if not self.hotelCount and self.houseCount <= 4:
-            rent = rents[self.houseCount]
-        elif self.hotelCount:
-            rent = rents[5]
-        elif self.owner.hasGroup(self.group_id):
-            rent = 2 * rents[0]
-        else:
-            rent = rents[0]
+        return True
+
+    @property
+    def houseCount(self):
+        level = self.level
+
+        return level if level != HOTEL_LEVEL else 0
 
-        return rent * player.rentMultiplier
+    @houseCount.setter
+    def houseCount(self, count: int):
+        self.level = count
+
+    @property
+    def hotelCount(self):
+        return int(self.level == HOTEL_LEVEL)
+
+    @hotelCount.setter
+    def hotelCount(self, count: int):
+        if count:
+            self.level = HOTEL_LEVEL
+        elif self.level == HOTEL_LEVEL:
+            self.level = 0
+
+    def getRent(self, player: "Player", score: Optional[int] = None):
+        return self.definition.rents[self.level] * player.rentMultiplier
 
 
 class Space_Railroad(OwnableSpace):
-    def __init__(self, map: "Map", id: int, pos: int):
-        super().__init__(map, "railroad", pos)
+    __slots__ = ()
 
+    TYPE = "railroad"
+
+    @classmethod
+    def define(cls, pos: int, id: int):
         if id < 0 or id > 4:
             raise ValueError()  # TODO
 
-        self.id: int = id
-
-        self.price: int = RAILROAD_PRICE
+        return SpaceDefinition(cls, cls.TYPE, pos, id=id, price=RAILROAD_PRICE)
 
     def getRent(self, player: "Player", score: Optional[int] = None):
-        railroadCount: int = self.owner.countSpaceType(Space_Railroad)
+        railroadCount: int = self.owner.railroadCount
 
         assert railroadCount in range(1, 5)
 
@@ -282,25 +439,26 @@ class Space_Railroad(OwnableSpace):
 
 
 class Space_Company(OwnableSpace):
-    def __init__(self, map: "Map", id: int, pos: int):
-        super().__init__(map, "company", pos)
+    __slots__ = ()
+
+    TYPE = "company"
 
+    @classmethod
+    def define(cls, pos: int, id: int):
         if id < 0 or id > 1:
             raise ValueError()  # TODO
 
-        self.id: int = id
-
-        self.price: int = COMPANY_PRICE
+        return SpaceDefinition(cls, cls.TYPE, pos, id=id, price=COMPANY_PRICE)
 
     def getRent(self, player: "Player", score: int):
-        companyCount: int = self.owner.countSpaceType(Space_Company)
+        companyCount: int = self.owner.companyCount
 
         assert companyCount in {1, 2}
 
         if player.rentMultiplier != 1:
             return score * player.rentMultiplier
         else:
-            return score * 2 if companyCount == 1 else score * 10
+            return score * COMPANY_RENT_MULTIPLIERS[companyCount - 1]
 
     @property
     def name(self):
@@ -313,33 +471,35 @@ class Space_Company(OwnableSpace):
 
 
 class Space_Chance(Space):
-    def __init__(self, map: "Map", pos: int):
-        super().__init__(map, "chance", pos)
+    __slots__ = ()
+
+    TYPE = "chance"
 
     def on_pass(self, player: "Player", score: Optional[int] = None):
         card: int = self.game.drawChanceCard()
 
-        self.game.renderer.playerDrawChanceCard(player, card)
+        player.emit(EVENT_CARD, DECK_CHANCE, card)
 
-        cardFunc: Callable = CHANCE_CARDS[card]
+        self.game.renderer.playerDrawChanceCard(player, card)
 
-        cardFunc(player)
+        player.applyCard(CHANCE_CARDS[card], self.map.chanceMoves[card])
 
         return True
 
 
 class Space_CommunityChest(Space):
-    def __init__(self, map: "Map", pos: int):
-        super().__init__(map, "community_chest", pos)
+    __slots__ = ()
+
+    TYPE = "community_chest"
 
     def on_pass(self, player: "Player", score: Optional[int] = None):
         card: int = self.game.drawCommunityChestCard()
 
-        self.game.renderer.playerDrawCommunityChestCard(player, card)
+        player.emit(EVENT_CARD, DECK_COMMUNITY_CHEST, card)
 
-        cardFunc: Callable = COMMUNITY_CHEST_CARDS[card]
+        self.game.renderer.playerDrawCommunityChestCard(player, card)
 
-        cardFunc(player)
+        player.applyCard(COMMUNITY_CHEST_CARDS[card], self.map.communityChestMoves[card])
 
         return True
 
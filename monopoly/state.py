@@ -0,0 +1,191 @@
+"""
+Compact game state.
+
+All the mutable state of a game lives in a single flat `array("i")`, laid out as
+a struct of arrays: one block per field, each block holding that field for every
+player (or every space). `Player`, `Space` and `CardStack` are thin views over
+it, so a whole game state can be copied or restored with a single buffer copy.
+
+The views write through `Field` / `GameState.write`, which also log the previous
+value of every word written while `GameState.writes` is a list (see `UndoLog`).
+"""
+
+from array import array
+
+from typing import Tuple, Dict, List, Optional
+
+
+GAME_FIELDS = ("roundCount", "turnCount", "winner")
+
+PLAYER_FIELDS = (
+    "pos", "money", "dead", "inJail", "jailTurnCount", "jailCards", "rentMultiplier", "deathRound",
+    "railroadCount", "companyCount", "houseCount", "hotelCount", "mortgageCount", "monopolies",
+)
+
+GROUP_COUNT = 8
+
+SPACE_FIELDS = ("owner", "level", "mortgage")
+
+SPACE_COUNT = 40
+
+CARD_STACK_SIZE = 16
+
+NONE = -1  # Stored instead of None (no owner, no winner, no death round, ...)
+
+FIELD_DEFAULTS = {
+    "winner": NONE,
+    "rentMultiplier": 1,
+    "deathRound": NONE,
+    "owner": NONE,
+}
+
+
+class Field:
+    """Descriptor exposing a state field as an attribute of a view (`_data[_offsets[index]]` of its `_state`)"""
+
+    __slots__ = ("index",)
+
+    def __init__(self, index: int):
+        self.index = index
+
+    def __get__(self, obj, cls=None):
+        if obj is None:
+            return self
+
+        return obj._data[obj._offsets[self.index]]
+
+    def __set__(self, obj, value):
+        i = obj._offsets[self.index]
+
+        writes = obj._state.writes
+
+        if writes is not None:
+            writes += (i, obj._data[i])
+
+        obj._data[i] = value
+
+
+class BoolField(Field):
+    __slots__ = ()
+
+    def __get__(self, obj, cls=None):
+        if obj is None:
+            return self
+
+        return obj._data[obj._offsets[self.index]] != 0
+
+
+class GameState:
+    __slots__ = ("playerCount", "data", "offsets", "groupStart", "chanceStart", "communityChestStart", "size",
+                 "writes")
+
+    def __init__(self, playerCount: int, cardCounts: Tuple[int, int] = (CARD_STACK_SIZE, CARD_STACK_SIZE)):
+        self.playerCount = playerCount
+
+        # Start of every field block
+        self.offsets: Dict[str, int] = {}
+
+        pos = 0
+
+        for f in GAME_FIELDS:
+            self.offsets[f] = pos
+            pos += 1
+
+        for f in PLAYER_FIELDS:
+            self.offsets[f] = pos
+            pos += playerCount
+
+        # groupCounts[gid][player]
+        self.groupStart = pos
+        pos += GROUP_COUNT * playerCount
+
+        for f in SPACE_FIELDS:
+            self.offsets[f] = pos
+            pos += SPACE_COUNT
+
+        # [cursor, card0, card1, ...] for each card stack
+        self.chanceStart = pos
+        pos += 1 + cardCounts[0]
+
+        self.communityChestStart = pos
+        pos += 1 + cardCounts[1]
+
+        self.size = pos
+
+        self.data = array("i", bytes(pos * array("i").itemsize))
+
+        for f, value in FIELD_DEFAULTS.items():
+            start, count = self.block(f)
+
+            self.data[start:start + count] = array("i", [value]) * count
+
+        # Index and previous value of the words written since it was set to a list (None: not logged)
+        self.writes: Optional[List[int]] = None
+
+    def write(self, i: int, value: int):
+        writes = self.writes
+
+        if writes is not None:
+            writes += (i, self.data[i])
+
+        self.data[i] = value
+
+    def block(self, field: str):
+        """(start, length) of a field block"""
+
+        if field in GAME_FIELDS:
+            return self.offsets[field], 1
+
+        if field in PLAYER_FIELDS:
+            return self.offsets[field], self.playerCount
+
+        return self.offsets[field], SPACE_COUNT
+
+    def playerOffsets(self, id: int):
+        return tuple(self.offsets[f] + id for f in PLAYER_FIELDS)
+
+    def groupOffset(self, id: int):
+        """Index of the group 0 counter of a player, group `gid` is at `+ gid * playerCount`"""
+
+        return self.groupStart + id
+
+    def spaceOffsets(self, pos: int):
+        return tuple(self.offsets[f] + pos for f in SPACE_FIELDS)
+
+    def gameOffsets(self):
+        return tuple(self.offsets[f] for f in GAME_FIELDS)
+
+    def copy(self):
+        state = GameState.__new__(GameState)
+
+        for attr in GameState.__slots__:
+            setattr(state, attr, getattr(self, attr))
+
+        state.data = array("i", self.data)
+        state.writes = None
+
+        return state
+
+    def restore(self, other: "GameState"):
+        """Copy another state of the same layout in place (views stay valid, the copy isn't logged)"""
+
+        assert other.size == self.size
+
+        self.data[:] = other.data
+
+    def tobytes(self):
+        return self.data.tobytes()
+
+    def frombytes(self, raw: bytes):
+        restored = array("i")
+        restored.frombytes(raw)
+
+        assert len(restored) == self.size
+
+        self.data[:] = restored
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} {self.playerCount} players, {self.size * self.data.itemsize} bytes>"
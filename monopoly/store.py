@@ -0,0 +1,278 @@
+"""
+Persistent store of live games, on SQLite.
+
+A game is one row: its metadata and its last save (`dumpGame`), so restoring it
+is a single read by primary key. The journal events committed with it are kept
+in chunks, only the most recent ones.
+
+`GameStore.commit` doesn't touch the database: the save is queued and a
+background writer thread writes everything queued meanwhile (for all the games)
+in one transaction, keeping only the last save of each game. A commit not
+written yet is lost if the process dies; `flush` waits for the pending ones.
+Lookups use a small pool of reader connections (the database is in WAL mode,
+readers don't wait for the writer).
+"""
+
+import sqlite3
+import threading
+import time
+
+from queue import Queue, Empty
+from contextlib import contextmanager
+
+from .journal import RECORD
+from .save    import dumpGame, loadGame
+
+from typing import Optional, List, Dict, Tuple, Any
+
+
+DEFAULT_READERS = 4
+
+RECENT_EVENTS = 1024  # Journal events kept per game
+
+MAX_BATCH = 10000  # Commits written per transaction
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    key      TEXT PRIMARY KEY,
+    map      TEXT NOT NULL,
+    lang     TEXT NOT NULL,
+    players  INTEGER NOT NULL,
+    round    INTEGER NOT NULL,
+    turn     INTEGER NOT NULL,
+    player   INTEGER,              -- Player of the turn in progress (none between turns)
+    finished INTEGER NOT NULL,
+    events   INTEGER NOT NULL,     -- Journal events committed so far
+    updated  REAL NOT NULL,
+    save     BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS events (
+    game    TEXT NOT NULL,
+    seq     INTEGER NOT NULL,      -- Index of the first event of the chunk
+    count   INTEGER NOT NULL,
+    records BLOB NOT NULL,         -- Journal records
+    PRIMARY KEY (game, seq)
+) WITHOUT ROWID;
+"""
+
+_STOP = object()
+
+
+class GameStore:
+    def __init__(self, path: str, readers: int = DEFAULT_READERS, recentEvents: int = RECENT_EVENTS):
+        self.path = path
+        self.recentEvents = recentEvents
+
+        with self.connect() as db:
+            db.executescript(SCHEMA)
+
+        # Per game: (journal events already committed, committed events count)
+        self.cursors: Dict[str, Tuple[int, int]] = {}
+
+        self.queue: "Queue[Any]" = Queue()
+
+        self.readers: "Queue[sqlite3.Connection]" = Queue()
+
+        for _ in range(readers):
+            self.readers.put(self.connect())
+
+        # Stats
+        self.commits = 0
+        self.written = 0
+        self.batches = 0
+
+        self.error: Optional[BaseException] = None
+
+        self.writer = threading.Thread(target=self.writeLoop, name="GameStore writer", daemon=True)
+        self.writer.start()
+
+    def connect(self):
+        db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+
+        return db
+
+    # -------- writes --------
+
+    def commit(self, key: str, game: "Monopoly", player: Optional[int] = None, finished: bool = False):
+        """Queue the current state of a game (`player`: the turn in progress, to resume it)"""
+
+        if self.error is not None:
+            raise RuntimeError("The store writer failed") from self.error
+
+        seen, total = self.cursors.get(key, (0, 0))
+
+        records = b""
+
+        if game.journal is not None:
+            records = bytes(game.journal.buffer[seen * RECORD.size:])
+
+            seen = len(game.journal)
+
+        count = total + len(records) // RECORD.size
+
+        self.cursors[key] = seen, count
+
+        row = (key, game.map.name, game.lang._name, game.playerCount, game.roundCount, game.turnCount, player,
+               int(finished), count, time.time(), dumpGame(game))
+
+        self.commits += 1
+
+        self.queue.put((row, total, records))
+
+    def finish(self, key: str, game: "Monopoly"):
+        self.commit(key, game, finished=True)
+
+        self.cursors.pop(key, None)
+
+    def flush(self):
+        """Wait until the queued commits are written"""
+
+        done = threading.Event()
+
+        self.queue.put(done)
+
+        while not done.wait(0.1):
+            if not self.writer.is_alive():
+                raise RuntimeError("The store writer failed") from self.error
+
+    def close(self):
+        self.queue.put(_STOP)
+
+        self.writer.join()
+
+        while not self.readers.empty():
+            self.readers.get_nowait().close()
+
+    def writeLoop(self):
+        db = self.connect()
+
+        running = True
+
+        try:
+            while running:
+                batch = [self.queue.get()]
+
+                while len(batch) < MAX_BATCH:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except Empty:
+                        break
+
+                rows: Dict[str, Tuple[Any, ...]] = {}
+                events: List[Tuple[str, int, int, bytes]] = []
+                waiting: List[threading.Event] = []
+
+                for item in batch:
+                    if item is _STOP:
+                        running = False
+                    elif isinstance(item, threading.Event):
+                        waiting.append(item)
+                    else:
+                        row, seq, records = item
+
+                        rows[row[0]] = row  # The last save of a game replaces the previous ones
+
+                        if records:
+                            events.append((row[0], seq, len(records) // RECORD.size, records))
+
+                if rows:
+                    self.write(db, rows, events)
+
+                for done in waiting:
+                    done.set()
+        except BaseException as e:
+            self.error = e
+
+            raise
+        finally:
+            db.close()
+
+    def write(self, db: sqlite3.Connection, rows: Dict[str, Tuple[Any, ...]], events: List[Tuple[str, int, int, bytes]]):
+        db.execute("BEGIN")
+
+        try:
+            db.executemany("INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows.values())
+            db.executemany("INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?)", events)
+
+            # Drop the chunks older than the recent events
+            db.executemany("DELETE FROM events WHERE game = ? AND seq + count <= ?",
+                           [(key, row[8] - self.recentEvents) for key, row in rows.items() if row[8] > self.recentEvents])
+
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+
+            raise
+
+        self.written += len(rows)
+        self.batches += 1
+
+    # -------- reads --------
+
+    @contextmanager
+    def reader(self):
+        db = self.readers.get()
+
+        try:
+            yield db
+        finally:
+            self.readers.put(db)
+
+    def load(self, key: str, **kwargs: Any) -> Tuple["Monopoly", Optional[int]]:
+        """(game, player of the turn in progress) of the last written commit, `kwargs` are passed to `Monopoly`"""
+
+        with self.reader() as db:
+            row = db.execute("SELECT save, player, events FROM games WHERE key = ?", (key,)).fetchone()
+
+        if row is None:
+            raise KeyError(key)
+
+        save, player, events = row
+
+        game = loadGame(save, **kwargs)
+
+        # The events of the restored game are counted after the committed ones
+        self.cursors[key] = len(game.journal) if game.journal is not None else 0, events
+
+        return game, player
+
+    def info(self, key: str):
+        with self.reader() as db:
+            row = db.execute("SELECT map, lang, players, round, turn, player, finished, events, updated FROM games "
+                             "WHERE key = ?", (key,)).fetchone()
+
+        if row is None:
+            raise KeyError(key)
+
+        return dict(zip(("map", "lang", "players", "round", "turn", "player", "finished", "events", "updated"), row))
+
+    def unfinished(self) -> List[str]:
+        with self.reader() as db:
+            return [key for key, in db.execute("SELECT key FROM games WHERE NOT finished")]
+
+    def events(self, key: str, since: int = 0):
+        """(index of the first event, journal records) of the recent events of a game, from `since` if still kept"""
+
+        with self.reader() as db:
+            chunks = db.execute("SELECT seq, records FROM events WHERE game = ? AND seq + count > ? ORDER BY seq",
+                                (key, since)).fetchall()
+
+        if not chunks:
+            return since, b""
+
+        start = max(since, chunks[0][0])
+
+        raw = b"".join(records for _, records in chunks)
+
+        return start, raw[(start - chunks[0][0]) * RECORD.size:]
+
+    def __len__(self):
+        with self.reader() as db:
+            return db.execute("SELECT count(*) FROM games").fetchone()[0]
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} {self.path!r}>"
@@ -0,0 +1,280 @@
+"""
+State sync protocol for remote clients.
+
+Instead of the rendered text, a client gets one snapshot of the game (the
+`GameState` words) then only the events of the game journal. Every event has a
+sequence number (its index in the journal): a client receiving events that
+don't follow the last one it applied lost some, and asks for a resync (a new
+snapshot, or the missing events with `SyncSource.since`). The clients apply
+the events to their copy of the state with the `Replayer` code: every word of
+the snapshot is kept up to date by the events, the client state stays equal to
+the game state.
+
+Numbers are sent as varints (zigzag for the signed ones), so most of the events
+take 4 or 5 bytes instead of the 8 bytes of a journal record. A frame is:
+
+    kind (1 byte)   sequence number   count        payload size   payload
+
+    FRAME_SNAPSHOT  next event        state words  ...            player count, card counts, state words
+    FRAME_EVENTS    first event       events       ...            type (1 byte), player + 1, a, b
+    FRAME_RESYNC    next event        0            0              (client to server)
+"""
+
+from .journal import Journal, Replayer, RECORD
+from .state   import GameState
+
+from typing import Optional, List, Tuple, Iterator, Iterable
+
+
+FRAME_SNAPSHOT = 1
+FRAME_EVENTS = 2
+FRAME_RESYNC = 3
+
+Record = Tuple[int, int, int, int]  # type, player, a, b (as in the journal)
+Frame = Tuple[int, int, int, bytes]  # kind, sequence number, count, payload
+
+
+def packVarint(n: int, out: bytearray):
+    while n >= 0x80:
+        out.append(n & 0x7F | 0x80)
+        n >>= 7
+
+    out.append(n)
+
+
+def packSigned(n: int, out: bytearray):
+    packVarint(n << 1 if n >= 0 else (-n << 1) - 1, out)
+
+
+def unpackVarint(raw: bytes, pos: int):
+    """(value, next position), IndexError if the varint is incomplete"""
+
+    n = shift = 0
+
+    while True:
+        byte = raw[pos]
+        pos += 1
+
+        n |= (byte & 0x7F) << shift
+        shift += 7
+
+        if byte < 0x80:
+            return n, pos
+
+
+def unpackSigned(raw: bytes, pos: int):
+    n, pos = unpackVarint(raw, pos)
+
+    return (n >> 1) ^ -(n & 1), pos
+
+
+def packFrame(kind: int, seq: int, count: int, payload: bytes = b""):
+    frame = bytearray((kind,))
+
+    packVarint(seq, frame)
+    packVarint(count, frame)
+    packVarint(len(payload), frame)
+
+    frame += payload
+
+    return bytes(frame)
+
+
+def splitFrames(buffer: bytearray) -> Iterator[Frame]:
+    """Take the complete frames out of a receive buffer (the rest stays for the next data)"""
+
+    while buffer:
+        try:
+            seq, pos = unpackVarint(buffer, 1)
+            count, pos = unpackVarint(buffer, pos)
+            size, pos = unpackVarint(buffer, pos)
+        except IndexError:
+            return
+
+        if len(buffer) < pos + size:
+            return
+
+        kind = buffer[0]
+        payload = bytes(buffer[pos:pos + size])
+
+        del buffer[:pos + size]
+
+        yield kind, seq, count, payload
+
+
+def encodeEvents(records: Iterable[Record], seq: int):
+    """Frame of journal records, the first one being event `seq`"""
+
+    payload = bytearray()
+
+    count = 0
+
+    for type, player, a, b in records:
+        payload.append(type)
+
+        packVarint(player + 1, payload)
+        packSigned(a, payload)
+        packSigned(b, payload)
+
+        count += 1
+
+    return packFrame(FRAME_EVENTS, seq, count, payload)
+
+
+def decodeEvents(payload: bytes, count: int) -> List[Record]:
+    records = []
+
+    pos = 0
+
+    for _ in range(count):
+        type = payload[pos]
+
+        player, pos = unpackVarint(payload, pos + 1)
+        a, pos = unpackSigned(payload, pos)
+        b, pos = unpackSigned(payload, pos)
+
+        records.append((type, player - 1, a, b))
+
+    return records
+
+
+def encodeSnapshot(state: GameState, seq: int):
+    payload = bytearray()
+
+    packVarint(state.playerCount, payload)
+    packVarint(state.communityChestStart - state.chanceStart - 1, payload)
+    packVarint(state.size - state.communityChestStart - 1, payload)
+
+    for word in state.data:
+        packSigned(word, payload)
+
+    return packFrame(FRAME_SNAPSHOT, seq, state.size, payload)
+
+
+def decodeSnapshot(payload: bytes, count: int, state: Optional[GameState] = None):
+    """State of a snapshot, decoded in `state` when it has the same layout"""
+
+    playerCount, pos = unpackVarint(payload, 0)
+    chanceCount, pos = unpackVarint(payload, pos)
+    communityChestCount, pos = unpackVarint(payload, pos)
+
+    if state is None or state.playerCount != playerCount or state.size != count:
+        state = GameState(playerCount, (chanceCount, communityChestCount))
+
+    data = state.data
+
+    for i in range(count):
+        data[i], pos = unpackSigned(payload, pos)
+
+    return state
+
+
+def resyncRequest(seq: int):
+    return packFrame(FRAME_RESYNC, seq, 0)
+
+
+class SyncSource:
+    """Server side of a game: snapshots and the frames of the new events"""
+
+    def __init__(self, game: "Monopoly"):
+        if game.journal is None:
+            raise ValueError("State sync requires a game with a journal")
+
+        if game.journal.file is not None:
+            raise ValueError("State sync reads the journal buffer, the journal can't be written to a file")
+
+        self.game = game
+        self.journal: Journal = game.journal
+
+        # Events already framed by `poll`
+        self.sent = len(self.journal)
+
+    @property
+    def seq(self):
+        """Sequence number of the next event"""
+
+        return len(self.journal)
+
+    def records(self, start: int, end: int):
+        return RECORD.iter_unpack(self.journal.buffer[start * RECORD.size:end * RECORD.size])
+
+    def snapshot(self):
+        """Snapshot frame of the current state (a client starts or resyncs from it)"""
+
+        return encodeSnapshot(self.game.state, self.seq)
+
+    def poll(self):
+        """Frame of the events since the last poll (empty if none)"""
+
+        start, end = self.sent, self.seq
+
+        if start >= end:
+            return b""
+
+        self.sent = end
+
+        return encodeEvents(self.records(start, end), start)
+
+    def since(self, seq: int):
+        """Frame of the events from `seq` up to the last poll (to answer a resync without a snapshot)"""
+
+        if not 0 <= seq <= self.sent:
+            raise ValueError(f"Event {seq} not sent yet")
+
+        return encodeEvents(self.records(seq, self.sent), seq)
+
+
+class SyncClient:
+    """Client side: a copy of the game state kept up to date from the received frames"""
+
+    def __init__(self):
+        self.state: Optional[GameState] = None
+
+        self.seq = 0  # Next expected event
+        self.synced = False
+
+        self.buffer = bytearray()
+
+        self.replayer = Replayer()
+
+    @property
+    def needsResync(self):
+        return not self.synced
+
+    def resyncRequest(self):
+        return resyncRequest(self.seq)
+
+    def feed(self, data: bytes):
+        """Apply the frames of received data, returns the applied events (journal records)"""
+
+        self.buffer += data
+
+        events: List[Record] = []
+
+        for kind, seq, count, payload in splitFrames(self.buffer):
+            if kind == FRAME_SNAPSHOT:
+                self.state = decodeSnapshot(payload, count, self.state)
+
+                self.seq = seq
+                self.synced = True
+
+            elif kind == FRAME_EVENTS:
+                if self.state is None or seq > self.seq:  # Lost events, wait for a snapshot (or the missing events)
+                    self.synced = False
+                    continue
+
+                if seq + count > self.seq:  # Not applied yet
+                    records = decodeEvents(payload, count)[self.seq - seq:]
+
+                    self.replayer.apply(records, self.state)
+
+                    events.extend(records)
+
+                    self.seq = seq + count
+
+                self.synced = True
+
+            else:
+                raise ValueError(f"Unexpected frame kind {kind}")
+
+        return events
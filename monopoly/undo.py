@@ -0,0 +1,143 @@
+"""
+Make / unmake of game actions.
+
+`UndoLog.apply` runs a player action (or `call` any effect: `Space.on_pass`, a
+card, ...) in place and records what it changed: the state words it wrote
+(index, previous value), logged by the state views as they write (see
+`GameState.writes`), the dice position, the journal length and the turn in
+progress. `undo` writes them back, so a search can step forward and back through
+a game without copying it: both cost the few words the action wrote.
+"""
+
+from typing import Optional, Any, Dict, List, Callable
+
+
+class Delta:
+    """What an action changed, enough to undo it"""
+
+    __slots__ = ("writes", "dices", "journalLength", "running", "turn", "turnVars", "vars", "savedVars", "ownership")
+
+    def __init__(self, writes: List[int], dices: Any, journalLength: int, running: bool, turn: Optional["Resume"],
+                 turnVars: Optional[Dict[str, Any]], vars: Optional[Dict[str, Any]],
+                 savedVars: Optional[Dict[str, Any]], ownership: bool):
+        self.writes = writes  # Index and previous value of each write, in order
+        self.dices = dices
+        self.journalLength = journalLength
+        self.running = running
+        self.turn = turn
+        self.turnVars = turnVars
+        self.vars = vars
+        self.savedVars = savedVars
+        self.ownership = ownership
+
+    def __len__(self):
+        return len(self.writes) // 2
+
+
+class UndoLog:
+    def __init__(self, game: "Monopoly"):
+        self.game = game
+
+        self.stack: List[Delta] = []
+
+        self._ownerStart, self._ownerCount = game.state.block("owner")
+
+    def _diceState(self):
+        game = self.game
+
+        if game.diceTape is not None:
+            return game.diceTape.getState()
+
+        return game.random.dices.getState()
+
+    def _restoreDices(self, state: Any):
+        game = self.game
+
+        if game.diceTape is not None:
+            game.diceTape.setState(state)
+        else:
+            game.random.dices.setState(state)
+
+    def call(self, func: Callable[..., Any], *args: Any, vars: Optional[Dict[str, Any]] = None):
+        """Run `func(*args)` and record its changes, `vars` (the turn variables) is restored on undo too"""
+
+        game = self.game
+        state = game.state
+
+        dices = self._diceState()
+        journalLength = len(game.journal.buffer) if game.journal is not None else 0
+        running = game.running
+        turn = game.turn
+        turnVars = dict(turn[1]) if turn is not None and turn[1] is not None else None
+        savedVars = dict(vars) if vars is not None else None
+
+        depth = len(self.stack)
+
+        outer = state.writes
+        writes = state.writes = []
+
+        try:
+            result = func(*args)
+        finally:
+            state.writes = outer
+
+            if outer is not None:  # Called within another recorded call, undone with it
+                outer += writes
+
+        del self.stack[depth:]  # The calls recorded within this one are part of it
+
+        ownerStart, ownerEnd = self._ownerStart, self._ownerStart + self._ownerCount
+
+        ownership = any(ownerStart <= i < ownerEnd for i in writes[::2])
+
+        self.stack.append(Delta(writes, dices, journalLength, running, turn, turnVars, vars, savedVars, ownership))
+
+        return result
+
+    def apply(self, player: "Player", action: str, args: List[Any], vars: Dict[str, Any]):
+        """`player.doAction` that can be undone"""
+
+        return self.call(player.doAction, action, args, vars, vars=vars)
+
+    def undo(self):
+        delta = self.stack.pop()
+
+        game = self.game
+        data = game.state.data
+
+        writes = delta.writes
+
+        # Latest first, so a word written twice gets its value from before the first write
+        for k in range(len(writes) - 2, -1, -2):
+            data[writes[k]] = writes[k + 1]
+
+        if delta.ownership:
+            game.resync()
+
+        self._restoreDices(delta.dices)
+
+        if game.journal is not None:
+            del game.journal.buffer[delta.journalLength:]
+
+        game.running = delta.running
+
+        game.turn = delta.turn
+
+        if delta.turnVars is not None:
+            delta.turn[1].clear()
+            delta.turn[1].update(delta.turnVars)
+
+        if delta.vars is not None:
+            delta.vars.clear()
+            delta.vars.update(delta.savedVars)
+
+        return delta
+
+    def rollback(self, depth: int = 0):
+        """Undo everything applied after the log was `depth` deep"""
+
+        while len(self.stack) > depth:
+            self.undo()
+
+    def __len__(self):
+        return len(self.stack)
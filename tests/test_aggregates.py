@@ -0,0 +1,88 @@
+"""
+The ownership aggregates of the players, maintained incrementally, must match a recount of their spaces.
+"""
+
+import pytest
+
+from monopoly import Monopoly, HeuristicPolicy, RandomPolicy
+from monopoly.space import OwnableSpace, TERRAIN_COUNT_BY_GROUPS, HOTEL_LEVEL
+
+
+def recount(game: Monopoly, player):
+    owned = [s for s in game.map.spaces if isinstance(s, OwnableSpace) and s.owner is player]
+    terrains = [s for s in owned if s.type == "terrain"]
+
+    groups = [sum(s.group_id == gid for s in terrains) for gid in range(len(TERRAIN_COUNT_BY_GROUPS))]
+
+    return {
+        "ownedSpaces": sorted(s.pos for s in owned),
+        "railroadCount": sum(s.type == "railroad" for s in owned),
+        "companyCount": sum(s.type == "company" for s in owned),
+        "houseCount": sum(s.level for s in terrains if s.level != HOTEL_LEVEL),
+        "hotelCount": sum(s.level == HOTEL_LEVEL for s in terrains),
+        "mortgageCount": sum(s.mortgage for s in owned),
+        "groupCounts": groups,
+        "ownedGroups": [gid for gid, n in enumerate(groups) if n == TERRAIN_COUNT_BY_GROUPS[gid]],
+    }
+
+
+def aggregates(player):
+    return {
+        "ownedSpaces": sorted(s.pos for s in player.ownedSpaces),
+        "railroadCount": player.railroadCount,
+        "companyCount": player.companyCount,
+        "houseCount": player.houseCount,
+        "hotelCount": player.hotelCount,
+        "mortgageCount": player.mortgageCount,
+        "groupCounts": player.groupCounts,
+        "ownedGroups": player.ownedGroups,
+    }
+
+
+@pytest.mark.parametrize("policy", [HeuristicPolicy(0), RandomPolicy(7)], ids=["heuristic", "random"])
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_aggregates_match_a_recount(seed: int, policy):
+    game = Monopoly(seed=seed, headless=True, policy=policy)
+
+    steps = game.steps(200)
+
+    try:
+        request = next(steps)
+
+        while True:
+            for p in game.players:
+                assert aggregates(p) == recount(game, p)
+
+            request = steps.send(request.answer())
+    except StopIteration:
+        pass
+
+    for p in game.players:
+        assert aggregates(p) == recount(game, p)
+
+
+def test_buildings_and_transfers():
+    game = Monopoly(seed=1, headless=True)
+    owner, creditor = game.players[:2]
+
+    for space in game.map.getGroupTerrains(1):
+        owner.giveSpace(space)
+
+    first, second, third = game.map.getGroupTerrains(1)
+
+    assert owner.ownedGroups == [1]
+
+    first.buyHouse()
+    first.buyHouse()
+    second.level = HOTEL_LEVEL
+    third.mortgage = True
+
+    assert (owner.houseCount, owner.hotelCount, owner.mortgageCount) == (2, 1, 1)
+
+    owner.money = 0
+    owner.pay(1, creditor)  # Bankrupt, the creditor gets the spaces with their buildings
+
+    assert owner.dead
+    assert aggregates(owner) == recount(game, owner)
+    assert aggregates(creditor) == recount(game, creditor)
+    assert (creditor.houseCount, creditor.hotelCount, creditor.ownedGroups) == (2, 1, [1])
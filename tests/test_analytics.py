@@ -0,0 +1,71 @@
+"""
+The property analytics against the rents of the engine.
+"""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from monopoly import Monopoly
+from monopoly.analytics import propertyAnalytics, GROUP_STAGE
+from monopoly.space import HOTEL_LEVEL
+
+
+@pytest.fixture
+def game():
+    return Monopoly(seed=1, headless=True)
+
+
+def test_terrain_rents(game):
+    analytics = propertyAnalytics(game.playerCount, game.map.board)
+    owner, player = game.players[:2]
+
+    for gid in range(2):
+        terrains = game.map.getGroupTerrains(gid)
+        first = terrains[0]
+
+        owner.giveSpace(first)
+
+        assert analytics.rents[first.pos, 0] == first.getRent(player)
+
+        for s in terrains[1:]:
+            owner.giveSpace(s)
+
+        assert analytics.rents[first.pos, GROUP_STAGE] == first.getRent(player)
+
+        for level in range(1, HOTEL_LEVEL + 1):
+            first.level = level
+
+            assert analytics.rents[first.pos, GROUP_STAGE + level] == first.getRent(player)
+            assert analytics.costs[first.pos, GROUP_STAGE + level] == first.price + level * first.housePrice
+
+
+def test_railroad_and_company_rents(game):
+    analytics = propertyAnalytics(game.playerCount, game.map.board)
+    owner, player = game.players[:2]
+
+    for type in ("railroad", "company"):
+        spaces = [s for s in game.map.spaces if s.type == type]
+
+        for n, s in enumerate(spaces):
+            owner.giveSpace(s)
+
+            # The rent of a company is for the mean score of the dices, 7
+            assert analytics.rents[spaces[0].pos, n] == pytest.approx(s.getRent(player, 7))
+
+        assert not analytics.valid[spaces[0].pos, len(spaces)]
+
+
+def test_payback(game):
+    analytics = propertyAnalytics(game.playerCount, game.map.board)
+
+    pos = analytics.positions
+
+    assert analytics.rentPerRound[pos] == pytest.approx(analytics.rentPerTurn[pos] * (game.playerCount - 1), nan_ok=True)
+    assert analytics.payback[pos] == pytest.approx(analytics.costs[pos] / analytics.rentPerRound[pos], nan_ok=True)
+
+    best = analytics.bestBuildings()
+    rois = [analytics.marginalRoi[pos, stage] for pos, stage in best]
+
+    assert all(stage > GROUP_STAGE for _, stage in best)
+    assert rois == sorted(rois, reverse=True)
@@ -0,0 +1,169 @@
+"""
+The incremental board redraws, fed through a minimal terminal emulator, must
+always show the same board as a full draw of the current state.
+"""
+
+import io
+import re
+
+import pytest
+
+from monopoly import Monopoly, HeuristicPolicy, Renderer, BoardView
+from monopoly.board import BOARD_HEIGHT, BOARD_WIDTH
+
+
+ROWS = 50
+
+_TOKEN = re.compile(r"\x1b\[([0-9;]*)([A-Za-z])|\x1b([78])|(.)", re.S)
+
+
+class Terminal:
+    """Just what the renderer uses: cursor moves, scroll region, save / restore cursor, line erase, text"""
+
+    def __init__(self, rows: int, cols: int = BOARD_WIDTH + 3):
+        self.rows, self.cols = rows, cols
+        self.screen = [[" "] * cols for _ in range(rows)]
+
+        self.y = self.x = 0
+        self.top, self.bottom = 0, rows - 1
+        self.saved = (0, 0)
+
+    def newLine(self):
+        self.x = 0  # A tty turns LF into CRLF
+
+        if self.y == self.bottom:
+            del self.screen[self.top]
+            self.screen.insert(self.bottom, [" "] * self.cols)
+        else:
+            self.y = min(self.y + 1, self.rows - 1)
+
+    def feed(self, data: str):
+        for m in _TOKEN.finditer(data):
+            command, save, char = m.group(2), m.group(3), m.group(4)
+
+            if command:
+                args = [int(a) if a else 0 for a in m.group(1).split(";")] if m.group(1) else []
+
+                if command == "H":
+                    self.y, self.x = (args[0] or 1) - 1, (args[1] or 1) - 1
+                elif command == "J":
+                    self.screen = [[" "] * self.cols for _ in range(self.rows)]
+                elif command == "r":
+                    self.top, self.bottom = (args[0] - 1, args[1] - 1) if args else (0, self.rows - 1)
+                    self.y = self.x = 0
+                elif command == "K":
+                    end = self.cols if args and args[0] == 2 else min(self.x + 1, self.cols)
+
+                    self.screen[self.y][:end] = [" "] * end
+                elif command != "m":
+                    raise ValueError(f"Unexpected escape sequence {m.group(0)!r}")
+            elif save:
+                if save == "7":
+                    self.saved = (self.y, self.x)
+                else:
+                    self.y, self.x = self.saved
+            elif char == "\r":
+                self.x = 0
+            elif char == "\n":
+                self.newLine()
+            else:
+                if self.x >= self.cols:
+                    self.newLine()
+
+                self.screen[self.y][self.x] = char
+                self.x += 1
+
+    def lines(self, start: int, end: int):
+        return ["".join(line) for line in self.screen[start:end]]
+
+
+class Output(io.StringIO):
+    def __init__(self):
+        super().__init__()
+
+        self.frames = []
+
+    def write(self, s: str):
+        self.frames.append(s)
+
+        return len(s)
+
+    def flush(self):
+        pass
+
+
+def makeGame(seed: int):
+    output = Output()
+
+    class TestRenderer(Renderer):
+        animateDices = False
+
+        def __init__(self, game: Monopoly):
+            super().__init__(game, sOut=output)
+
+    return Monopoly(seed=seed, policy=HeuristicPolicy(), renderer=TestRenderer), output
+
+
+def fullDraw(game: Monopoly):
+    board = BoardView(game.renderer, ROWS, BOARD_WIDTH)
+
+    terminal = Terminal(ROWS)
+    terminal.feed(board.open() + board.draw())
+
+    return terminal.lines(0, BOARD_HEIGHT)
+
+
+@pytest.mark.parametrize("seed", [3, 7])
+def test_incremental_redraw_matches_full_draw(seed: int):
+    game, output = makeGame(seed)
+
+    assert game.renderer.showBoard(ROWS, BOARD_WIDTH)
+
+    terminal = Terminal(ROWS)
+
+    steps = game.steps(60)
+
+    try:
+        request = next(steps)
+
+        while True:
+            game.renderer.flushFrame()
+
+            for frame in output.frames:
+                terminal.feed(frame)
+
+            output.frames.clear()
+
+            assert terminal.lines(0, BOARD_HEIGHT) == fullDraw(game)
+
+            request = steps.send(request.answer())
+    except StopIteration:
+        pass
+
+
+def test_unchanged_board_draws_nothing():
+    game, _ = makeGame(1)
+
+    board = BoardView(game.renderer, ROWS, BOARD_WIDTH)
+
+    assert board.draw()
+    assert board.draw() == ""
+
+
+def test_small_terminal():
+    game, _ = makeGame(1)
+
+    with pytest.raises(ValueError):
+        BoardView(game.renderer, BOARD_HEIGHT, BOARD_WIDTH)
+
+
+def test_narrow_terminal():
+    game, output = makeGame(1)
+
+    with pytest.raises(ValueError):
+        BoardView(game.renderer, ROWS, BOARD_WIDTH - 1)
+
+    # The game goes on in text only
+    assert not game.renderer.showBoard(ROWS, BOARD_WIDTH - 1)
+    assert game.renderer.board is None
+    assert output.frames == []
@@ -0,0 +1,106 @@
+"""
+Journal records and their replay: the replayed state must be the state of the game.
+"""
+
+import io
+
+import pytest
+
+from monopoly import Monopoly, Journal, Replayer, HeuristicPolicy, describe
+from monopoly.journal import RECORD, EVENT_START, EVENT_TURN
+
+
+class File(io.BytesIO):
+    def __init__(self):
+        super().__init__()
+
+        self.writes = 0
+
+    def write(self, data: bytes):
+        self.writes += 1
+
+        return super().write(data)
+
+    def close(self):
+        pass  # Keep the content readable
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_replay_rebuilds_the_state(seed: int):
+    journal = Journal()
+    game = Monopoly(seed=seed, headless=True, journal=journal, policy=HeuristicPolicy(0))
+
+    game.simulate(300)
+
+    assert Replayer(journal.tobytes()).replay().data == game.state.data
+
+
+def test_file_is_appended_every_turn():
+    file = File()
+
+    journal = Journal(file)
+    game = Monopoly(seed=2, headless=True, journal=journal)
+
+    steps = game.steps(20)
+    request = next(steps)
+
+    while game.turnCount < 10:
+        request = steps.send(request.answer())
+
+    # Everything before the turn in progress is on file already
+    written = file.getvalue()
+
+    assert written
+    assert file.writes >= 10
+    assert [type for type, *_ in RECORD.iter_unpack(written)].count(EVENT_TURN) == 10
+    assert len(journal) < len(written) // RECORD.size
+
+    try:
+        while True:
+            request = steps.send(request.answer())
+    except StopIteration:
+        pass
+
+    journal.close()
+
+    memory = Journal()
+    Monopoly(seed=2, headless=True, journal=memory).simulate(20)
+
+    assert file.getvalue() == memory.tobytes()
+
+
+def test_flush_size():
+    file = File()
+
+    journal = Journal(file, flushSize=10 * RECORD.size)
+
+    for i in range(95):
+        journal.emit(EVENT_TURN, 0, i, i)
+
+        assert len(journal) < 10
+
+    assert len(file.getvalue()) == 90 * RECORD.size
+
+
+def test_describe():
+    journal = Journal()
+
+    Monopoly(seed=1, headless=True, journal=journal)
+
+    assert next(describe(journal.tobytes())) == ("start", 4, 16, 16)
+
+
+def test_invalid_journals():
+    journal = Journal()
+
+    Monopoly(seed=1, headless=True, journal=journal).simulate(5)
+
+    raw = journal.tobytes()
+
+    with pytest.raises(ValueError):
+        Replayer(raw[:-1])
+
+    with pytest.raises(ValueError):
+        Replayer(raw[RECORD.size:]).replay()
+
+    assert raw[0] == EVENT_START
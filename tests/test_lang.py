@@ -0,0 +1,104 @@
+"""
+Compiled lang templates must format every message as `str.format` does, and nested sections are built once.
+"""
+
+import pytest
+
+from monopoly import Monopoly, HeuristicPolicy
+from monopoly.lang import Template, loadLang, LANG_LIST
+from monopoly.bundle import loadBundle
+from monopoly.renderer import RENDER, CSI
+from monopoly.space import OwnableSpace
+
+
+def reference(source: str, kwargs):
+    """The formatting the templates replace"""
+
+    res = source.format(**{**kwargs, "render": RENDER})
+
+    if CSI in res:
+        res += RENDER.reset
+
+    return res
+
+
+def messages(data, path=()):
+    for key, value in data.items():
+        if isinstance(value, dict):
+            yield from messages(value, path + (key,))
+        elif isinstance(value, str):
+            yield path, key, value
+
+
+def formatted(func, *args):
+    try:
+        return func(*args)
+    except Exception as e:  # Both must fail the same way on a missing field
+        return type(e)
+
+
+@pytest.fixture(scope="module")
+def kwargs():
+    game = Monopoly(seed=5, headless=True, policy=HeuristicPolicy())
+    game.simulate(30)
+
+    player = game.players[0]
+    space = next(s for s in game.map.spaces if isinstance(s, OwnableSpace) and s.owner is not None)
+
+    return {"player": player, "space": space, "id": 2, "rent": 36, "card": 3, "page": 1, "maxPage": 4,
+            "color": "red"}
+
+
+@pytest.mark.parametrize("name", LANG_LIST)
+def test_messages_match_str_format(name: str, kwargs):
+    lang = loadLang(name)
+
+    for path, key, source in messages(loadBundle().langs[name]):
+        catalog = lang
+
+        for section in path:
+            catalog = catalog[section]
+
+        assert formatted(lambda: catalog(key, **kwargs)) == formatted(reference, source, kwargs), (path, key)
+
+
+@pytest.mark.parametrize("source", [
+    "plain text",
+    "{render.italic}italic{render.reset} text",
+    "{render.italic}{player}",
+    "{id:>4} {id!r} {{escaped}} {render.bold!s:>8}",
+    "{player} owes M{rent}",
+    "{render.color.nope}",
+    "{render.nope}",
+    "{missing}",
+])
+def test_synthetic_templates(source: str, kwargs):
+    template = Template(source)
+
+    assert formatted(template, kwargs) == formatted(reference, source, kwargs)
+
+
+def test_dynamic_render_codes_are_reset():
+    template = Template("{color}text")
+
+    assert template({"color": RENDER.bold}) == RENDER.bold + "text" + RENDER.reset
+    assert template({"color": ""}) == "text"
+
+
+def test_sections_are_cached():
+    lang = loadLang("english")
+
+    assert loadLang("english") is lang
+    assert lang["menu"] is lang["menu"]
+    assert lang("menu") is lang["menu"]
+    assert lang["colors"] is not lang["menu"]
+
+
+def test_unknown_messages():
+    lang = loadLang("english")
+
+    assert lang("noSuchMessage", id=1) == f"{lang!r}.'noSuchMessage'{{'id': 1}}"
+    assert lang["noSuchMessage"] == f"{lang!r}.'noSuchMessage'"
+
+    with pytest.raises(FileNotFoundError):
+        loadLang("klingon")
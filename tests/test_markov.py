@@ -0,0 +1,61 @@
+"""
+The landing model of `monopoly.markov` against the engine it models.
+"""
+
+import pytest
+
+from monopoly import Monopoly, Journal
+from monopoly.cardStack import CardStack
+from monopoly.headless import playDecision
+from monopoly.journal import EVENT_MOVE
+from monopoly.markov import diceOutcomes, landingModel, landingProbabilities
+from monopoly.space import SPACE_COUNT
+
+
+def test_dice_outcomes():
+    outcomes = diceOutcomes()
+
+    assert sum(outcomes.values()) == pytest.approx(1)
+    assert outcomes[(7, False)] == pytest.approx(6 / 36)
+    assert outcomes[(2, True)] == pytest.approx(1 / 36)
+    assert (3, True) not in outcomes
+
+
+def test_every_card_is_drawn():
+    # The model draws each card of a deck with the same probability
+    stack = CardStack(range(16))
+
+    assert sorted(stack.draw() for _ in range(16)) == list(range(16))
+    assert [stack.draw() for _ in range(16)] == stack.cards
+
+
+def test_landings_are_a_distribution():
+    model = landingModel()
+    landings = landingProbabilities()
+
+    assert len(landings) == SPACE_COUNT
+    assert sum(landings) == pytest.approx(1)
+    assert sum(model.stationary) == pytest.approx(1)
+    assert model.ranking()[0] == model.board.jailPos
+
+
+def test_landings_match_simulated_games():
+    counts = [0] * SPACE_COUNT
+
+    for seed in range(2):
+        journal = Journal()
+
+        # Nobody buys anything, so nobody goes bankrupt and every roll is played
+        Monopoly(seed=seed, headless=True, decision=playDecision, journal=journal).simulate(1500)
+
+        for type, _, pos, _ in journal:
+            if type == EVENT_MOVE:
+                counts[pos] += 1
+
+    total = sum(counts)
+    landings = landingProbabilities()
+
+    errors = [abs(c / total - p) for c, p in zip(counts, landings)]
+
+    assert max(errors) < 0.01
+    assert sum(errors) / 2 < 0.03
@@ -0,0 +1,45 @@
+"""
+Strength of the tree search against the heuristic it plays its rollouts with.
+"""
+
+from monopoly import Monopoly, HeuristicPolicy, MCTSPolicy
+from monopoly.mcts import Node, evaluate
+
+
+def share(policy, seed: int, rounds: int = 20):
+    """Net worth share of the first player after `rounds` rounds against heuristic players"""
+
+    game = Monopoly(seed=seed, headless=True, policy=[policy, *(HeuristicPolicy() for _ in range(3))])
+    game.simulate(rounds)
+
+    return evaluate(game, game.players[0])
+
+
+def test_matches_or_beats_the_heuristic():
+    seeds = range(6)
+
+    baseline = [share(HeuristicPolicy(), seed) for seed in seeds]
+    search = [share(MCTSPolicy(None, playouts=10, horizon=5, seed=0), seed) for seed in seeds]
+
+    assert sum(search) >= sum(baseline)
+
+
+def test_best_keeps_the_default_without_a_better_action():
+    root = Node()
+
+    for key, values in ((("finish",), [0.3, 0.2]), (("buy",), [0.3, 0.2, 0.1]), (("mortgage", 1), [])):
+        child = root.child(key)
+
+        child.values = values
+        child.visits = len(values)
+        child.value = sum(values)
+
+    keys = [("finish",), ("buy",), ("mortgage", 1)]
+
+    assert root.best(keys) == ("buy",)
+    assert root.best(keys, ("finish",)) == ("finish",)  # Same value on the same scenarios
+    assert root.best(keys, ("mortgage", 1)) == ("mortgage", 1)  # Not played
+
+    root.children[("buy",)].values = [0.3, 0.25, 0.1]
+
+    assert root.best(keys, ("finish",)) == ("buy",)
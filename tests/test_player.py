@@ -0,0 +1,143 @@
+"""
+Money rules of the headless engine: mortgages, purchases and bankruptcies.
+"""
+
+from monopoly import Monopoly, Journal
+from monopoly.journal import EVENT_BUY, EVENT_CASH
+
+
+def makeGame(**kwargs):
+    return Monopoly(seed=1, headless=True, **kwargs)
+
+
+def test_remove_mortgage_costs_money():
+    game = makeGame()
+    player = game.players[0]
+    space = game.map.spaces[1]
+
+    player.giveSpace(space)
+    player.menuMortgage(space)
+
+    assert player.money == 1500 + space.mortgagePrice
+
+    player.menuRemoveMortgage(space)
+
+    assert not space.mortgage
+    assert player.money == 1500 + space.mortgagePrice - space.removeMortgagePrice
+
+
+def test_mortgage_cycle_loses_money():
+    game = makeGame()
+    player = game.players[0]
+    space = game.map.spaces[1]
+
+    player.giveSpace(space)
+
+    for _ in range(10):
+        player.menuMortgage(space)
+        player.menuRemoveMortgage(space)
+
+    assert player.money < 1500
+
+
+def test_remove_mortgage_refused_without_money():
+    game = makeGame()
+    player = game.players[0]
+    space = game.map.spaces[1]
+
+    player.giveSpace(space)
+    player.menuMortgage(space)
+
+    player.money = space.removeMortgagePrice - 1
+
+    assert "removeMortgage" not in player.getMenuItems()
+    assert not any(name == "removeMortgage" for name, _ in player.getLegalActions())
+
+    player.menuRemoveMortgage(space)
+
+    assert space.mortgage
+    assert player.money == space.removeMortgagePrice - 1
+
+
+def test_bankruptcy_conserves_money():
+    game = makeGame()
+    debtor, creditor = game.players[:2]
+
+    debtor.money = 100
+
+    debtor.pay(300, creditor)
+
+    assert debtor.dead
+    assert creditor.money == 1600
+
+
+def test_bankruptcy_raises_cash_first():
+    game = makeGame()
+    debtor, creditor = game.players[:2]
+    space = game.map.spaces[5]
+
+    debtor.giveSpace(space)
+    debtor.money = 50
+
+    debtor.pay(120, creditor)
+
+    assert not debtor.dead
+    assert space.mortgage
+    assert debtor.money == 50 + space.mortgagePrice - 120
+    assert creditor.money == 1620
+
+
+def test_buy_is_journaled_after_the_payment():
+    journal = Journal()
+    game = makeGame(journal=journal)
+    player = game.players[0]
+
+    player.pos = 1
+    start = len(journal)
+
+    player.buySpace()
+
+    events = [type for type, *_ in list(journal)[start:]]
+
+    assert events.index(EVENT_CASH) < events.index(EVENT_BUY)
+    assert game.map.spaces[1].owner is player
+
+
+def test_no_jail_after_bankruptcy_on_third_double():
+    game = makeGame()
+    player = game.players[0]
+
+    player.money = 0
+    game.rollDices = lambda p: (4, True)  # Double to the income tax
+
+    vars = {"play_again": True, "double_count": 2, "do_render": True, "has_played": False}
+
+    player.menuRollDices(vars)
+
+    assert player.dead
+    assert not player.inJail
+    assert player.pos == 4
+
+
+def test_mortgage_only_undeveloped_properties():
+    game = makeGame()
+    player = game.players[0]
+
+    first, second = game.map.getGroupTerrains(0)
+
+    player.giveSpace(first)
+    player.giveSpace(second)
+
+    first.buyHouse()
+
+    assert [args[0] for name, args in player.getLegalActions() if name == "mortgage"] == [second]
+
+    player.menuMortgage(first)
+
+    assert not first.mortgage
+    assert player.money == 1500 - first.housePrice
+
+    second.buyHouse()
+
+    assert "mortgage" not in player.getMenuItems()
+    assert not any(name == "mortgage" for name, _ in player.getLegalActions())
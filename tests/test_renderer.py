@@ -0,0 +1,73 @@
+"""
+Renderer output: written as it comes by default, one write per frame when frame buffered.
+"""
+
+from monopoly import Monopoly, Renderer, HeuristicPolicy
+from monopoly.server import TableRenderer
+
+
+class Output:
+    def __init__(self):
+        self.writes = []
+        self.flushes = 0
+
+    def write(self, s: str):
+        self.writes.append(s)
+
+        return len(s)
+
+    def flush(self):
+        self.flushes += 1
+
+    @property
+    def text(self):
+        return "".join(self.writes)
+
+
+def makeGame(buffered: bool, seed: int = 5):
+    output = Output()
+
+    class TestRenderer(Renderer):
+        animateDices = False
+        frameBuffered = buffered
+
+        def __init__(self, game: Monopoly):
+            super().__init__(game, sOut=output)
+
+    return Monopoly(seed=seed, policy=HeuristicPolicy(), renderer=TestRenderer), output
+
+
+def test_unbuffered_by_default():
+    assert not Renderer.frameBuffered
+    assert TableRenderer.frameBuffered
+
+    game, output = makeGame(False)
+
+    game.renderer.writeLnFlush("hello")
+
+    assert output.text == "hello\n"
+    assert output.flushes == 1
+
+
+def test_frame_buffered():
+    game, output = makeGame(True)
+
+    game.renderer.writeLn("hello")
+    game.renderer.writeLnFlush("world")
+
+    assert output.writes == []
+
+    game.renderer.flushFrame()
+
+    assert output.writes == ["hello\nworld\n"]
+
+
+def test_same_text_either_way():
+    game, unbuffered = makeGame(False)
+    game.drive(game.steps(30))
+
+    game, buffered = makeGame(True)
+    game.drive(game.steps(30))
+
+    assert buffered.text == unbuffered.text
+    assert len(buffered.writes) < len(unbuffered.writes)
@@ -0,0 +1,61 @@
+"""
+The rent engine (scalar and vectorized) must agree with the rents the spaces charge.
+"""
+
+import pytest
+
+from monopoly import Monopoly, HeuristicPolicy
+from monopoly.space import OwnableSpace
+
+
+def ownerRents(game: Monopoly, score: int):
+    """Rent charged to a player who doesn't own the space, by position (0 when nothing is due)"""
+
+    rents = []
+
+    for space in game.map.spaces:
+        if not isinstance(space, OwnableSpace) or space.owner is None or space.mortgage:
+            rents.append(0)
+            continue
+
+        payer = next(p for p in game.players if p is not space.owner)
+
+        rents.append(space.getRent(payer, score))
+
+    return rents
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_engine_matches_spaces(seed: int):
+    game = Monopoly(seed=seed, headless=True, policy=HeuristicPolicy())
+
+    steps = game.steps(150)
+
+    try:
+        request = next(steps)
+
+        while True:
+            expected = ownerRents(game, 8)
+
+            assert [game.rentEngine.getRent(pos, 8) for pos in range(40)] == expected
+            assert list(game.rentEngine.getRents(8)) == expected
+
+            request = steps.send(request.answer())
+    except StopIteration:
+        pass
+
+
+def test_whole_group_keeps_the_base_rent():
+    game = Monopoly(seed=1, headless=True)
+    owner, payer = game.players[:2]
+
+    brown = game.map.getGroupTerrains(0)
+
+    for space in brown:
+        owner.giveSpace(space)
+
+    assert owner.hasGroup(0)
+
+    for space in brown:
+        assert space.getRent(payer) == space.definition.rents[0]
+        assert game.rentEngine.getRent(space.pos) == space.definition.rents[0]
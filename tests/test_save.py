@@ -0,0 +1,226 @@
+"""
+Binary saves and checkpoints: a restored game must play on exactly like the original.
+"""
+
+import io
+
+import pytest
+
+from monopoly import Monopoly, Renderer, HeuristicPolicy, dumpGame, loadGame, Checkpointer, applyCheckpoint
+from monopoly.dice import DicePair, DiceTape
+from monopoly.headless import HeadlessRenderer
+from monopoly.save import _turn, _turnV3
+from monopoly.rng import GameRandom
+
+
+def playUntil(game: Monopoly, condition, maxRounds: int = 1000):
+    """Steps of a game, paused at the first decision where `condition()` holds"""
+
+    steps = game.steps(maxRounds)
+
+    request = next(steps)
+
+    while not condition():
+        request = steps.send(request.answer())
+
+    return steps, request
+
+
+def finish(steps, request):
+    try:
+        while True:
+            request = steps.send(request.answer())
+    except StopIteration as e:
+        return e.value
+
+
+def playOn(game: Monopoly, rounds: int):
+    return game.drive(game.steps(game.roundCount + rounds, game.turn))
+
+
+def test_dice_tape_state_at_block_end():
+    random = GameRandom(5)
+
+    tape = DiceTape(DicePair(rng=random.dices), size=16, rng=random.dices)
+
+    for _ in range(16):
+        tape.roll()
+
+    state = tape.getState()
+
+    expected = [tape.roll() for _ in range(40)]
+
+    other = GameRandom(5)
+    restored = DiceTape(DicePair(rng=other.dices), size=16, rng=other.dices)
+    restored.setState(state)
+
+    assert [restored.roll() for _ in range(40)] == expected
+
+
+@pytest.mark.parametrize("boundary", [True, False])
+def test_save_round_trip_across_dice_blocks(boundary: bool):
+    game = Monopoly(seed=11, headless=True)
+    tape = game.diceTape
+
+    def condition():
+        if tape.refillState is None:
+            return False
+
+        return tape.cursor == tape.size if boundary else tape.cursor == 10
+
+    steps, request = playUntil(game, condition)
+
+    restored = loadGame(dumpGame(game))
+
+    assert restored.state.data == game.state.data
+
+    # The original finishes the decision it was paused on, the restored game resumes the same turn
+    original = finish(steps, request)
+
+    result = restored.drive(restored.steps(1000, restored.turn))
+
+    assert result.money == original.money
+    assert restored.state.data == game.state.data
+
+
+def test_checkpoints_replay_the_game():
+    game = Monopoly(seed=3, headless=True)
+
+    checkpointer = Checkpointer(game)
+
+    base = checkpointer.snapshot()
+
+    deltas = []
+
+    for _ in range(30):
+        playOn(game, 1)
+
+        deltas.append(checkpointer.checkpoint())
+
+    restored = loadGame(base)
+
+    for delta in deltas:
+        applyCheckpoint(restored, delta)
+
+    assert restored.state.data == game.state.data
+
+    playOn(game, 20)
+    playOn(restored, 20)
+
+    assert restored.state.data == game.state.data
+
+
+def test_checkpoint_restores_the_turn_in_progress():
+    game = Monopoly(seed=8, headless=True)
+
+    checkpointer = Checkpointer(game)
+    base = checkpointer.snapshot()
+
+    steps, request = playUntil(game, lambda: game.turnCount == 13 and game.turn[1]["has_played"])
+
+    delta = checkpointer.checkpoint()
+
+    restored = loadGame(base)
+    applyCheckpoint(restored, delta)
+
+    player, vars = restored.turn
+
+    assert player.id == game.turn[0].id
+    assert vars == game.turn[1]
+
+    original = finish(steps, request)
+    result = restored.drive(restored.steps(1000, restored.turn))
+
+    assert result.money == original.money
+
+
+def test_load_rolls_like_the_saved_game():
+    game = Monopoly(seed=4, headless=True)
+
+    playOn(game, 10)
+
+    # A save with a dice tape keeps it, even under a renderer animating the dices
+    restored = loadGame(dumpGame(game), policy=HeuristicPolicy(),
+                        renderer=lambda g: Renderer(g, sOut=io.StringIO()))
+
+    assert restored.diceTape is not None
+
+    playOn(game, 10)
+
+    playOn(restored, 10)
+
+    assert restored.state.data == game.state.data
+
+    # A save rolling straight from the stream (animated dices) doesn't get one
+    game.diceTape = None
+
+    restored = loadGame(dumpGame(game))
+
+    assert restored.diceTape is None
+    assert restored.random.dices.getState() == game.random.dices.getState()
+
+
+def test_unsupported_save():
+    raw = bytearray(dumpGame(Monopoly(seed=1, headless=True)))
+
+    raw[4] = 99
+
+    with pytest.raises(ValueError):
+        loadGame(bytes(raw))
+
+    with pytest.raises(ValueError):
+        loadGame(b"NOPE" + bytes(raw[4:]))
+
+
+class SavingRenderer(HeadlessRenderer):
+    """Saves the game at the end of every turn"""
+
+    def __init__(self, game: Monopoly):
+        super().__init__(game)
+
+        self.saves = []
+
+    def endPlayerTurn(self, player):
+        self.saves.append((self.game.turnCount, dumpGame(self.game)))
+
+
+@pytest.mark.parametrize("turn", [13, 16])  # Within a round, and its last turn
+def test_save_at_the_end_of_a_turn(turn: int):
+    game = Monopoly(seed=6, headless=True, renderer=SavingRenderer)
+
+    original = game.simulate(30)
+
+    save = dict(game.renderer.saves)[turn]
+
+    restored = loadGame(save)
+
+    player, vars = restored.turn
+
+    assert vars is None
+    assert player.id == (turn - 1) % game.playerCount
+
+    result = restored.drive(restored.steps(30, restored.turn))
+
+    assert restored.turnCount == game.turnCount
+    assert result.money == original.money
+
+
+def test_load_version_3_save():
+    game = Monopoly(seed=2, headless=True)
+
+    steps, request = playUntil(game, lambda: game.turnCount == 5)
+
+    raw = dumpGame(game)
+
+    player, vars = game.turn
+
+    # Same save in version 3: the turn in progress without the turn over flag
+    old = bytearray(raw[:-_turn.size]) + _turnV3.pack(player.id, vars["play_again"], vars["do_render"],
+                                                        vars["double_count"], vars["has_played"])
+    old[4] = 3
+
+    restored = loadGame(bytes(old))
+
+    assert restored.turn[0].id == player.id
+    assert restored.turn[1] == vars
+    assert restored.state.data == game.state.data
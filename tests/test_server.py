@@ -0,0 +1,81 @@
+"""
+Tables committed to a store: a table restored after a crash plays on like the game that wasn't interrupted.
+"""
+
+import asyncio
+
+import pytest
+
+from monopoly import HeuristicPolicy
+from monopoly.server import GameServer, Table
+from monopoly.store import GameStore
+
+
+class Crash(Exception):
+    pass
+
+
+class CrashingBot(HeuristicPolicy):
+    """Heuristic bot crashing the server at the first decision of turn `turn` (`played`: after the dices were rolled)"""
+
+    def __init__(self, turn: int, played: bool):
+        super().__init__()
+
+        self.turn = turn
+        self.played = played
+
+    def decideRequest(self, request):
+        if request.game.turnCount == self.turn and request.hasPlayed == self.played:
+            raise Crash()
+
+        return super().decideRequest(request)
+
+
+def playTable(server: GameServer, restore: bool = False):
+    table = Table(server, 0, [], restore=restore)
+
+    server.tables[0] = table
+
+    return table, asyncio.run(table.play())
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = GameStore(str(tmp_path / "games.db"))
+
+    yield store
+
+    store.close()
+
+
+@pytest.mark.parametrize("played", [False, True])
+def test_restored_table_plays_on(store: GameStore, played: bool):
+    options = dict(playerCount=3, bots=2, seed=9, maxRounds=15, timeout=None)
+
+    _, expected = playTable(GameServer(**options))
+
+    server = GameServer(store=store, **options)
+    server.bot = CrashingBot(20, played)
+
+    with pytest.raises(Crash):
+        playTable(server)
+
+    store.flush()
+
+    assert store.unfinished() == ["0"]
+
+    info = store.info("0")
+
+    assert info["turn"] == 20
+    assert info["player"] is None  # Committed at the end of the previous turn
+
+    server = GameServer(store=store, **options)
+
+    table, result = playTable(server, restore=True)
+
+    assert table.game.turnCount == expected.turns
+    assert result.money == expected.money
+
+    store.flush()
+
+    assert store.unfinished() == []
@@ -0,0 +1,57 @@
+"""
+Statistics of the simulation runner.
+"""
+
+import pytest
+
+from monopoly import Monopoly, Journal, simulate
+from monopoly.journal import EVENT_RENT
+from monopoly.simulate import rentsByPosition
+
+
+@pytest.fixture(params=["numpy", "python"])
+def numpy(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(simulate, "np", None)
+    elif simulate.np is None:
+        pytest.skip("NumPy isn't installed")
+
+
+def test_rent_received_by_the_owner(numpy):
+    game = Monopoly(seed=1, headless=True, journal=Journal())
+    debtor, owner = game.players[:2]
+    space = game.map.spaces[39]
+
+    owner.giveSpace(space)
+
+    space.on_pass(debtor)
+    space.on_pass(debtor)
+
+    debtor.money = 10
+    space.on_pass(debtor)  # Bankrupt, the owner only gets what is left
+
+    rent = space.getRent(debtor)
+
+    assert debtor.dead
+    assert [b for type, _, pos, b in game.journal if type == EVENT_RENT and pos == space.pos] == [rent, rent, 10]
+    assert owner.money == 1500 + 2 * rent + 10
+
+    rents = rentsByPosition(game.journal.tobytes())
+
+    assert rents[space.pos] == 2 * rent + 10
+    assert sum(rents) == rents[space.pos]
+
+
+def test_rents_of_a_game(numpy):
+    journal = Journal()
+
+    Monopoly(seed=3, headless=True, journal=journal).simulate(200)
+
+    expected = [0] * len(rentsByPosition(b""))
+
+    for type, _, pos, paid in journal:
+        if type == EVENT_RENT:
+            expected[pos] += paid
+
+    assert rentsByPosition(journal.tobytes()) == expected
+    assert sum(expected) > 0
@@ -0,0 +1,125 @@
+"""
+Game store: queued commits, restores and the recent events of the games.
+"""
+
+import pytest
+
+from monopoly import Monopoly, Journal
+from monopoly.journal import RECORD
+from monopoly.store import GameStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = GameStore(str(tmp_path / "games.db"), recentEvents=64)
+
+    yield store
+
+    store.close()
+
+
+def play(game: Monopoly, rounds: int):
+    return game.drive(game.steps(game.roundCount + rounds, game.turn))
+
+
+def test_commit_and_load(store: GameStore):
+    game = Monopoly(seed=1, headless=True, journal=Journal())
+
+    play(game, 5)
+
+    store.commit("a", game)
+    store.flush()
+
+    restored, player = store.load("a", journal=Journal())
+
+    assert player is None
+    assert restored.state.data == game.state.data
+
+    play(game, 5)
+    play(restored, 5)
+
+    assert restored.state.data == game.state.data
+
+    with pytest.raises(KeyError):
+        store.load("b")
+
+
+def test_last_commit_wins(store: GameStore):
+    games = {key: Monopoly(seed=seed, headless=True, journal=Journal()) for seed, key in enumerate("abc")}
+
+    for _ in range(5):
+        for key, game in games.items():
+            play(game, 1)
+
+            store.commit(key, game)
+
+    store.finish("c", games["c"])
+    store.flush()
+
+    assert len(store) == 3
+    assert sorted(store.unfinished()) == ["a", "b"]
+
+    for key, game in games.items():
+        info = store.info(key)
+
+        assert (info["round"], info["turn"], info["events"]) == (game.roundCount, game.turnCount, len(game.journal))
+        assert info["finished"] == (key == "c")
+
+    assert store.commits == 16
+    assert store.written <= store.commits
+
+
+def test_recent_events(store: GameStore):
+    game = Monopoly(seed=2, headless=True, journal=Journal())
+
+    for _ in range(10):
+        play(game, 1)
+
+        store.commit("a", game)
+
+    store.flush()
+
+    raw = game.journal.tobytes()
+    count = len(game.journal)
+
+    # Only the chunks with the recent events are kept
+    start, records = store.events("a")
+
+    assert 0 < start <= count - 64
+    assert records == raw[start * RECORD.size:]
+
+    start, records = store.events("a", count - 10)
+
+    assert start == count - 10
+    assert records == raw[start * RECORD.size:]
+
+    assert store.events("a", count) == (count, b"")
+
+
+def test_events_of_a_restored_game(store: GameStore):
+    game = Monopoly(seed=3, headless=True, journal=Journal())
+
+    play(game, 3)
+
+    store.commit("a", game)
+    store.flush()
+
+    committed = store.info("a")["events"]
+
+    restored, _ = store.load("a", journal=Journal())
+
+    # The records of the new game the restored one was built from aren't part of the game
+    new = len(restored.journal)
+
+    play(restored, 1)
+
+    store.commit("a", restored)
+    store.flush()
+
+    # The events of the restored game follow the committed ones
+    assert store.info("a")["events"] == committed + len(restored.journal) - new
+
+    start, records = store.events("a", committed)
+
+    assert start == committed
+    assert records == restored.journal.tobytes()[new * RECORD.size:]
@@ -0,0 +1,119 @@
+"""
+State sync protocol: a client fed the frames of a game keeps a copy of its state.
+"""
+
+import pytest
+
+from monopoly import Monopoly, Journal
+from monopoly.sync import (
+    SyncSource, SyncClient, packVarint, packSigned, unpackVarint, unpackSigned, splitFrames,
+    FRAME_RESYNC,
+)
+
+
+def syncedGame(seed: int):
+    game = Monopoly(seed=seed, headless=True, journal=Journal())
+
+    return game, SyncSource(game)
+
+
+@pytest.mark.parametrize("n", [0, 1, 127, 128, 300, 1 << 40])
+def test_varints(n: int):
+    for pack, unpack, value in ((packVarint, unpackVarint, n), (packSigned, unpackSigned, n),
+                                (packSigned, unpackSigned, -n)):
+        raw = bytearray()
+
+        pack(value, raw)
+
+        assert unpack(bytes(raw), 0) == (value, len(raw))
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_client_follows_the_game(seed: int):
+    game, source = syncedGame(seed)
+    client = SyncClient()
+
+    client.feed(source.snapshot())
+
+    steps = game.steps(100)
+
+    try:
+        request = next(steps)
+
+        while True:
+            client.feed(source.poll())
+
+            assert client.seq == source.seq
+            assert client.state.data == game.state.data
+
+            request = steps.send(request.answer())
+    except StopIteration:
+        pass
+
+    client.feed(source.poll())
+
+    assert client.state.data == game.state.data
+
+
+def test_rent_multiplier_is_synced():
+    game, source = syncedGame(3)
+    client = SyncClient()
+
+    client.feed(source.snapshot())
+
+    player = game.players[0]
+
+    player.multiplyRent(2)
+
+    client.feed(source.poll())
+
+    assert client.state.data == game.state.data
+
+    # Reset at the end of the move
+    player.play(3, False)
+
+    client.feed(source.poll())
+
+    assert player.rentMultiplier == 1
+    assert client.state.data == game.state.data
+
+
+def test_lost_events_resync():
+    game, source = syncedGame(4)
+    client = SyncClient()
+
+    client.feed(source.snapshot())
+
+    game.drive(game.steps(2))
+    lost = source.poll()
+
+    game.drive(game.steps(4))
+    client.feed(source.poll())
+
+    assert client.needsResync
+
+    kind, seq, _, _ = next(splitFrames(bytearray(client.resyncRequest())))
+
+    assert (kind, seq) == (FRAME_RESYNC, client.seq)
+
+    client.feed(source.since(seq))
+
+    assert not client.needsResync
+    assert client.state.data == game.state.data
+
+    # Frames already applied are ignored, a partial frame waits for the rest of its data
+    frame = lost + source.snapshot()
+
+    client.feed(frame[:len(frame) - 3])
+    client.feed(frame[len(frame) - 3:])
+
+    assert client.state.data == game.state.data
+
+
+def test_source_requires_a_buffered_journal(tmp_path):
+    with pytest.raises(ValueError):
+        SyncSource(Monopoly(seed=1, headless=True))
+
+    with open(tmp_path / "journal", "wb") as f:
+        with pytest.raises(ValueError):
+            SyncSource(Monopoly(seed=1, headless=True, journal=Journal(f)))
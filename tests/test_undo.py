@@ -0,0 +1,110 @@
+"""
+Make / unmake: an undone action must leave no trace, and cost only the words it wrote.
+"""
+
+import pytest
+
+from monopoly import Monopoly, Journal, UndoLog
+
+
+def snapshot(game: Monopoly):
+    turn = None if game.turn is None else (game.turn[0].id, dict(game.turn[1]))
+
+    return (game.state.tobytes(), game.journal.tobytes(), game.diceTape.getState(), turn,
+            [[s.pos for s in p.ownedSpaces] for p in game.players])
+
+
+def makeGame(seed: int):
+    return Monopoly(seed=seed, headless=True, journal=Journal())
+
+
+def advance(steps, action):
+    try:
+        return steps.send(action)
+    except StopIteration:
+        return None
+
+
+@pytest.mark.parametrize("seed", [1, 5])
+def test_undone_actions_leave_no_trace(seed: int):
+    game, twin = makeGame(seed), makeGame(seed)
+
+    log = UndoLog(game)
+
+    steps, twinSteps = game.steps(60), twin.steps(60)
+    request, twinRequest = next(steps), next(twinSteps)
+
+    while request is not None:
+        before = snapshot(game)
+
+        action = request.answer()
+
+        log.apply(request.player, action[0], list(action[1]), request.vars)
+
+        assert len(log.stack[-1]) < game.state.size // 4
+
+        log.undo()
+
+        assert snapshot(game) == before
+
+        request, twinRequest = advance(steps, action), advance(twinSteps, twinRequest.answer())
+
+    assert twinRequest is None
+    assert game.state.data == twin.state.data
+    assert game.journal.tobytes() == twin.journal.tobytes()
+
+
+def test_undo_the_end_of_a_round():
+    game, twin = makeGame(3), makeGame(3)
+
+    steps, twinSteps = game.steps(50), twin.steps(50)
+    request, twinRequest = next(steps), next(twinSteps)
+
+    for _ in range(25):
+        request, twinRequest = advance(steps, request.answer()), advance(twinSteps, twinRequest.answer())
+
+    before = snapshot(game)
+
+    log = UndoLog(game)
+
+    # Play the rest of the round in place: the turns end, the round count changes
+    log.call(game.drive, game.roundSteps(game.turn))
+
+    assert snapshot(game) != before
+
+    log.rollback()
+
+    assert snapshot(game) == before
+    assert len(log) == 0
+
+    while request is not None:
+        request, twinRequest = advance(steps, request.answer()), advance(twinSteps, twinRequest.answer())
+
+    assert game.state.data == twin.state.data
+
+
+def test_nested_calls_are_undone_with_the_outer_one():
+    game = makeGame(2)
+    player, other = game.players[:2]
+
+    before = game.state.tobytes()
+
+    log = UndoLog(game)
+
+    def outer():
+        player.pay(100, other)
+
+        log.call(player.giveSpace, game.map.spaces[1])
+
+        player.money += 1
+
+    log.call(outer)
+
+    assert len(log) == 1  # The inner call is part of the outer one
+    assert game.map.spaces[1].owner is player
+
+    log.undo()
+
+    assert game.state.tobytes() == before
+    assert game.map.spaces[1].owner is None
+    assert player.ownedSpaces == []